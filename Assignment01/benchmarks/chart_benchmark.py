@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark vẽ bổ sung biểu đồ hàng ngày: tuần tự so với nhóm tiến trình của ChartGenerator
+
+Ví dụ:
+    python benchmarks/chart_benchmark.py --days 90 --workers 1 2 4
+"""
+
+import os
+import logging
+import argparse
+import tempfile
+import time
+from datetime import date, timedelta
+
+from common import setup_import_paths, write_results
+
+setup_import_paths()
+
+from generators import ChartGenerator
+
+
+def parse_arguments():
+    """
+    Phân tích các đối số dòng lệnh
+    """
+    parser = argparse.ArgumentParser(description='Benchmark vẽ biểu đồ hàng ngày song song')
+    parser.add_argument('--days', type=int, default=90, help='Số biểu đồ hàng ngày cần vẽ')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, os.cpu_count() or 1],
+                        help='Số tiến trình cho mỗi lượt chạy (1 = tuần tự)')
+    parser.add_argument('--output', help='Đường dẫn file JSON kết quả')
+    return parser.parse_args()
+
+
+def build_daily_stats(days):
+    """
+    Sinh thống kê hàng ngày giả lập
+
+    Args:
+        days (int): Số ngày
+
+    Returns:
+        list: Danh sách thống kê hàng ngày
+    """
+    start = date(2025, 4, 1)
+    return [
+        {'date': start + timedelta(days=offset), 'success_count': 50 + offset % 17, 'failure_count': offset % 7}
+        for offset in range(days)
+    ]
+
+
+def main():
+    """
+    Hàm chính của benchmark
+    """
+    args = parse_arguments()
+    logging.disable(logging.INFO)
+
+    daily_stats = build_daily_stats(args.days)
+
+    results = []
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory(prefix='chart_bench_') as work_dir:
+            chart_generator = ChartGenerator(work_dir)
+
+            start_time = time.perf_counter()
+            chart_paths = chart_generator.generate_daily_charts(daily_stats, max_workers=workers)
+            elapsed = time.perf_counter() - start_time
+
+        rendered = sum(1 for path in chart_paths if path)
+        results.append({
+            'workers': workers,
+            'charts': rendered,
+            'elapsed_seconds': elapsed,
+            'charts_per_second': rendered / elapsed if elapsed > 0 else None
+        })
+        print(f"{workers:>3} tiến trình: {rendered} biểu đồ trong {elapsed:.2f}s "
+              f"({rendered / elapsed:.1f} biểu đồ/s)")
+
+    output_path = write_results('chart', {'days': args.days, 'workers': args.workers}, results, args.output)
+    print(f"Đã ghi kết quả benchmark: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tiện ích dùng chung cho các benchmark: đường dẫn import, tóm tắt histogram và ghi kết quả JSON
+"""
+
+import os
+import sys
+import json
+import platform
+from datetime import datetime
+
+# Thư mục gốc Assignment01 và thư mục mã nguồn
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(ROOT_DIR, 'src')
+
+# Thư mục mặc định lưu kết quả benchmark
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+# Mốc histogram chi tiết (10µs đến ~7 phút) để phân vị không bị làm tròn quá thô
+BENCHMARK_BUCKETS = tuple(1e-5 * (1.25 ** k) for k in range(80))
+
+
+def setup_import_paths():
+    """
+    Thêm thư mục gốc và thư mục src vào sys.path, giống cách main.py được chạy
+    """
+    for path in (ROOT_DIR, SRC_DIR):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+def summarize_histogram(histogram):
+    """
+    Tóm tắt từng chuỗi của histogram thành số lượng, trung bình và các phân vị
+
+    Args:
+        histogram (Histogram): Histogram cần tóm tắt
+
+    Returns:
+        dict: Ánh xạ tên chuỗi (ví dụ: db_write{status=success}) -> thống kê
+    """
+    summary = {}
+
+    for label_key, series in sorted(histogram.series.items()):
+        labels = dict(label_key)
+        stage = labels.pop('stage', histogram.name)
+        series_name = stage
+        if labels:
+            series_name += "{" + ",".join(f"{name}={value}" for name, value in sorted(labels.items())) + "}"
+
+        full_labels = dict(label_key)
+        summary[series_name] = {
+            'count': series['count'],
+            'total_seconds': series['sum'],
+            'mean_seconds': series['sum'] / series['count'] if series['count'] else None,
+            'p50_seconds': histogram.quantile(0.50, **full_labels),
+            'p95_seconds': histogram.quantile(0.95, **full_labels),
+            'p99_seconds': histogram.quantile(0.99, **full_labels)
+        }
+
+    return summary
+
+
+def environment_info():
+    """
+    Thu thập thông tin môi trường chạy để so sánh kết quả giữa các phiên bản
+
+    Returns:
+        dict: Thông tin môi trường
+    """
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def write_results(benchmark_name, parameters, results, output_path=None):
+    """
+    Ghi kết quả benchmark ra file JSON
+
+    Args:
+        benchmark_name (str): Tên benchmark
+        parameters (dict): Tham số đã dùng khi chạy
+        results (list): Danh sách kết quả
+        output_path (str, optional): Đường dẫn file đầu ra. Mặc định lưu trong benchmarks/results.
+
+    Returns:
+        str: Đường dẫn file đã ghi
+    """
+    timestamp = datetime.now()
+
+    if not output_path:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output_path = os.path.join(RESULTS_DIR, f"{benchmark_name}_{timestamp.strftime('%Y%m%d_%H%M%S')}.json")
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+
+    payload = {
+        'benchmark': benchmark_name,
+        'timestamp': timestamp.isoformat(),
+        'environment': environment_info(),
+        'parameters': parameters,
+        'results': results
+    }
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+
+    return output_path
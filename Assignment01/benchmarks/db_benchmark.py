@@ -0,0 +1,303 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Micro-benchmark cho các truy vấn của DatabaseManager và ReportGenerator trên bảng logs lớn
+
+Ví dụ:
+    python benchmarks/db_benchmark.py --sizes 10000 100000 1000000 --days 90
+    python benchmarks/db_benchmark.py --baseline benchmarks/results/db_old.json --max-regression 0.2
+"""
+
+import os
+import sys
+import json
+import logging
+import argparse
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from common import setup_import_paths, write_results
+
+setup_import_paths()
+
+from persistence import DatabaseManager
+from generators import ReportGenerator
+
+# Số hàng chèn trong mỗi lô khi tạo dữ liệu
+SEED_BATCH_SIZE = 50000
+
+# Tỷ lệ bản ghi thất bại trong dữ liệu giả lập
+FAILURE_RATIO = 0.1
+
+# Ngày cuối cùng của dữ liệu giả lập (cố định để kết quả có thể so sánh giữa các lần chạy)
+SEED_END_DATE = datetime(2025, 6, 30)
+
+
+def parse_arguments():
+    """
+    Phân tích các đối số dòng lệnh
+    """
+    parser = argparse.ArgumentParser(description='Micro-benchmark truy vấn bảng logs')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000],
+                        help='Số hàng trong bảng logs (10^4 đến 10^7)')
+    parser.add_argument('--days', type=int, default=90, help='Số ngày mà dữ liệu được trải đều')
+    parser.add_argument('--repeat', type=int, default=5, help='Số lần lặp cho mỗi truy vấn')
+    parser.add_argument('--db-dir', help='Thư mục giữ lại cơ sở dữ liệu đã tạo để dùng lại giữa các lần chạy')
+    parser.add_argument('--output', help='Đường dẫn file JSON kết quả')
+    parser.add_argument('--baseline', help='File JSON kết quả trước đó để phát hiện hồi quy')
+    parser.add_argument('--max-regression', type=float, default=0.2,
+                        help='Mức chậm hơn tối đa cho phép so với baseline (0.2 = 20%%)')
+    return parser.parse_args()
+
+
+def _synthetic_rows(row_count, days):
+    """
+    Sinh các hàng log giả lập trải đều trên nhiều ngày
+
+    Args:
+        row_count (int): Số hàng cần sinh
+        days (int): Số ngày
+
+    Yields:
+        tuple: Một hàng của bảng logs
+    """
+    formats = ['png', 'jpg', 'gif', 'mp3']
+    models = ['openai', 'claude']
+    start = SEED_END_DATE - timedelta(days=days - 1)
+    seconds_per_row = days * 86400 / row_count
+    failure_every = int(1 / FAILURE_RATIO)
+
+    for index in range(row_count):
+        timestamp = start + timedelta(seconds=index * seconds_per_row)
+        is_failure = index % failure_every == 0
+        yield (
+            f"item-{index}",
+            f"Tài sản giả lập {index}",
+            formats[index % len(formats)],
+            models[index % len(models)],
+            'failure' if is_failure else 'success',
+            None if is_failure else f"https://drive.google.com/file/d/{index}/view",
+            f"Timeout after {index % 60} seconds for request {index}" if is_failure else None,
+            timestamp.strftime('%Y-%m-%d %H:%M:%S.%f'),
+            (index * 37) % 30000
+        )
+
+
+def seed_database(db_path, row_count, days):
+    """
+    Tạo cơ sở dữ liệu và chèn dữ liệu giả lập theo lô
+
+    Args:
+        db_path (str): Đường dẫn cơ sở dữ liệu
+        row_count (int): Số hàng cần chèn
+        days (int): Số ngày
+
+    Returns:
+        float: Thời gian tạo dữ liệu (giây)
+    """
+    start_time = time.perf_counter()
+
+    # Dùng DatabaseManager để tạo schema giống hệt môi trường thật
+    DatabaseManager(db_path)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute('PRAGMA journal_mode = OFF')
+    conn.execute('PRAGMA synchronous = OFF')
+
+    batch = []
+    for row in _synthetic_rows(row_count, days):
+        batch.append(row)
+        if len(batch) >= SEED_BATCH_SIZE:
+            conn.executemany('''
+            INSERT INTO logs (item_id, description, output_format, model, status, drive_url, error_message, timestamp,
+                              duration_ms)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', batch)
+            batch = []
+
+    if batch:
+        conn.executemany('''
+        INSERT INTO logs (item_id, description, output_format, model, status, drive_url, error_message, timestamp,
+                          duration_ms)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', batch)
+
+    conn.commit()
+    conn.close()
+
+    return time.perf_counter() - start_time
+
+
+def time_operation(operation, repeat):
+    """
+    Đo thời gian thực thi một thao tác nhiều lần
+
+    Args:
+        operation (callable): Thao tác cần đo
+        repeat (int): Số lần lặp
+
+    Returns:
+        dict: Thời gian nhỏ nhất, trung vị và trung bình (giây)
+    """
+    durations = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        operation()
+        durations.append(time.perf_counter() - start_time)
+
+    return {
+        'min_seconds': min(durations),
+        'median_seconds': statistics.median(durations),
+        'mean_seconds': statistics.mean(durations)
+    }
+
+
+def run_size(db_path, row_count, days, repeat, work_dir):
+    """
+    Chạy toàn bộ các phép đo cho một kích thước bảng
+
+    Args:
+        db_path (str): Đường dẫn cơ sở dữ liệu đã tạo dữ liệu
+        row_count (int): Số hàng
+        days (int): Số ngày
+        repeat (int): Số lần lặp
+        work_dir (str): Thư mục tạm cho báo cáo
+
+    Returns:
+        dict: Kết quả đo
+    """
+    db_manager = DatabaseManager(db_path)
+    report_generator = ReportGenerator(db_path, os.path.join(work_dir, 'reports'))
+
+    middle_date = (SEED_END_DATE - timedelta(days=days // 2)).date()
+    week_start = middle_date - timedelta(days=6)
+    range_start = (SEED_END_DATE - timedelta(days=days - 1)).date()
+    range_end = SEED_END_DATE.date()
+
+    operations = {
+        'get_logs_by_date': lambda: db_manager.get_logs_by_date(middle_date),
+        'get_success_failure_count_by_date_range': lambda: db_manager.get_success_failure_count_by_date_range(
+            range_start, range_end),
+        '_fetch_daily_stats': lambda: report_generator._fetch_daily_stats(middle_date),
+        '_fetch_date_range_stats': lambda: report_generator._fetch_date_range_stats(week_start, middle_date),
+        '_fetch_failure_clusters': lambda: report_generator._fetch_failure_clusters(middle_date),
+        '_fetch_top_failures': lambda: report_generator._fetch_top_failures(middle_date, 'duration')
+    }
+
+    timings = {name: time_operation(operation, repeat) for name, operation in operations.items()}
+
+    # Đo ghi cuối cùng để các hàng mới không ảnh hưởng tới các truy vấn phía trên
+    timings['log_success'] = time_operation(
+        lambda: db_manager.log_success(
+            item_id="bench-write",
+            description="Ghi log benchmark",
+            output_format="png",
+            model="openai",
+            drive_url="https://drive.google.com/bench"
+        ),
+        repeat
+    )
+
+    return {
+        'rows': row_count,
+        'days': days,
+        'rows_per_day': row_count / days,
+        'timings': timings
+    }
+
+
+def check_regressions(results, baseline_path, max_regression):
+    """
+    So sánh kết quả với baseline và liệt kê các thao tác chậm hơn ngưỡng cho phép
+
+    Args:
+        results (list): Kết quả hiện tại
+        baseline_path (str): Đường dẫn file JSON baseline
+        max_regression (float): Mức chậm hơn tối đa cho phép
+
+    Returns:
+        list: Danh sách mô tả các hồi quy
+    """
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    baseline_timings = {
+        (result['rows'], result['days'], name): timing['median_seconds']
+        for result in baseline['results']
+        for name, timing in result['timings'].items()
+    }
+
+    regressions = []
+    for result in results:
+        for name, timing in result['timings'].items():
+            previous = baseline_timings.get((result['rows'], result['days'], name))
+            if previous is None or previous <= 0:
+                continue
+
+            ratio = timing['median_seconds'] / previous
+            if ratio > 1 + max_regression:
+                regressions.append(
+                    f"{name} ({result['rows']} hàng): {previous * 1000:.2f}ms -> "
+                    f"{timing['median_seconds'] * 1000:.2f}ms (x{ratio:.2f})"
+                )
+
+    return regressions
+
+
+def main():
+    """
+    Hàm chính của benchmark
+    """
+    args = parse_arguments()
+    logging.disable(logging.INFO)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix='db_bench_') as work_dir:
+        db_dir = args.db_dir or work_dir
+        os.makedirs(db_dir, exist_ok=True)
+
+        for row_count in args.sizes:
+            db_path = os.path.join(db_dir, f"logs_{row_count}_{args.days}d.db")
+            seed_seconds = None
+
+            if not os.path.exists(db_path):
+                seed_seconds = seed_database(db_path, row_count, args.days)
+
+            # Làm việc trên bản sao để các lần ghi không làm thay đổi cơ sở dữ liệu được giữ lại
+            run_path = os.path.join(work_dir, f"run_{row_count}.db")
+            with sqlite3.connect(db_path) as source, sqlite3.connect(run_path) as target:
+                source.backup(target)
+
+            result = run_size(run_path, row_count, args.days, args.repeat, work_dir)
+            result['seed_seconds'] = seed_seconds
+            results.append(result)
+            os.remove(run_path)
+
+            summary = ", ".join(f"{name}={timing['median_seconds'] * 1000:.2f}ms"
+                                for name, timing in result['timings'].items())
+            print(f"{row_count:>9} hàng: {summary}")
+
+    parameters = {
+        'sizes': args.sizes,
+        'days': args.days,
+        'repeat': args.repeat
+    }
+    output_path = write_results('db', parameters, results, args.output)
+    print(f"Đã ghi kết quả benchmark: {output_path}")
+
+    if args.baseline:
+        regressions = check_regressions(results, args.baseline, args.max_regression)
+        if regressions:
+            print("Phát hiện hồi quy hiệu năng:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print("Không phát hiện hồi quy so với baseline")
+
+
+if __name__ == "__main__":
+    main()
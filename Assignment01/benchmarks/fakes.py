@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Các thành phần giả lập cục bộ (OpenAI, Drive, Sheets, SMTP, Slack) có độ trễ cấu hình được,
+dùng cho benchmark quy trình tự động hóa
+"""
+
+import os
+import random
+import time
+
+
+class InjectedLatency:
+    """
+    Độ trễ giả lập cho một dịch vụ bên ngoài
+    """
+
+    def __init__(self, mean_ms=0.0, jitter=0.0, seed=None):
+        """
+        Khởi tạo đối tượng InjectedLatency
+
+        Args:
+            mean_ms (float): Độ trễ trung bình (mili giây)
+            jitter (float): Biên độ dao động tương đối (0.0 đến 1.0)
+            seed (int, optional): Seed cho bộ sinh số ngẫu nhiên
+        """
+        self.mean_ms = mean_ms
+        self.jitter = jitter
+        self.random = random.Random(seed)
+
+    def wait(self):
+        """
+        Chờ theo độ trễ cấu hình
+        """
+        if self.mean_ms <= 0:
+            return
+
+        delay_ms = self.mean_ms
+        if self.jitter > 0:
+            delay_ms *= 1 + self.random.uniform(-self.jitter, self.jitter)
+        time.sleep(max(delay_ms, 0) / 1000.0)
+
+
+def build_sheet_items(row_count):
+    """
+    Tạo dữ liệu giả lập giống các hàng trong Google Sheet
+
+    Args:
+        row_count (int): Số hàng cần tạo
+
+    Returns:
+        list: Danh sách các mục dữ liệu
+    """
+    formats = ['PNG', 'JPG', 'GIF', 'MP3']
+    models = ['openai', 'claude']
+
+    return [
+        {
+            'id': f"bench-{index:06d}",
+            'description': f"Tài sản benchmark số {index}",
+            'example_asset_url': f"https://example.com/reference/{index}.png",
+            'output_format': formats[index % len(formats)],
+            'model': models[index % len(models)]
+        }
+        for index in range(row_count)
+    ]
+
+
+class FakeSheetsReader:
+    """
+    Giả lập GoogleSheetsReader trả về dữ liệu có sẵn
+    """
+
+    def __init__(self, items, latency):
+        """
+        Khởi tạo đối tượng FakeSheetsReader
+
+        Args:
+            items (list): Dữ liệu trả về
+            latency (InjectedLatency): Độ trễ giả lập
+        """
+        self.items = items
+        self.latency = latency
+
+    def read_sheet(self, sheet_id, range_name="Sheet1!A1:Z1000"):
+        self.latency.wait()
+        return list(self.items)
+
+
+class FakeAIGenerator:
+    """
+    Giả lập AIGenerator, trả về tệp đầu ra đã tạo sẵn cho từng định dạng
+    """
+
+    # Độ trễ và thư mục đầu ra được gán bởi harness trước khi chạy
+    latency = InjectedLatency()
+    output_dir = None
+
+    def __init__(self, api_key, service=None):
+        self.api_key = api_key
+        self.service = service or 'openai'
+
+    def generate(self, description, reference_url=None, output_format="png", model="openai"):
+        self.latency.wait()
+
+        output_path = os.path.join(self.output_dir, f"fake_output.{output_format.lower()}")
+        if not os.path.exists(output_path):
+            with open(output_path, 'wb') as f:
+                f.write(b"benchmark")
+        return output_path
+
+
+class FakeDriveUploader:
+    """
+    Giả lập GoogleDriveUploader
+    """
+
+    def __init__(self, latency):
+        """
+        Khởi tạo đối tượng FakeDriveUploader
+
+        Args:
+            latency (InjectedLatency): Độ trễ giả lập
+        """
+        self.latency = latency
+        self.upload_count = 0
+
+    def upload(self, file_path, description):
+        self.latency.wait()
+        self.upload_count += 1
+        return f"https://drive.google.com/file/d/bench-{self.upload_count}/view"
+
+
+class FakeSMTP:
+    """
+    Giả lập smtplib.SMTP, bỏ qua email nhưng vẫn đếm số lượng đã gửi
+    """
+
+    latency = InjectedLatency()
+    sent_count = 0
+
+    def __init__(self, host=None, port=None):
+        self.latency.wait()
+
+    def starttls(self):
+        pass
+
+    def login(self, user, password):
+        pass
+
+    def send_message(self, msg):
+        FakeSMTP.sent_count += 1
+
+    def quit(self):
+        pass
+
+
+class FakeSlackResponse:
+    """
+    Phản hồi HTTP giả lập của webhook Slack
+    """
+
+    status_code = 200
+    text = "ok"
+
+
+class FakeSlackWebhook:
+    """
+    Giả lập requests.post cho webhook Slack
+    """
+
+    def __init__(self, latency):
+        """
+        Khởi tạo đối tượng FakeSlackWebhook
+
+        Args:
+            latency (InjectedLatency): Độ trễ giả lập
+        """
+        self.latency = latency
+        self.post_count = 0
+
+    def __call__(self, url, json=None, **kwargs):
+        self.latency.wait()
+        self.post_count += 1
+        return FakeSlackResponse()
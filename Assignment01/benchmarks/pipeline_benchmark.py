@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark đầu-cuối cho quy trình tự động hóa, chạy main()/process_item với các dịch vụ giả lập cục bộ
+
+Ví dụ:
+    python benchmarks/pipeline_benchmark.py --sizes 100 1000 --latency openai=200 --latency drive=50
+"""
+
+import os
+import sys
+import logging
+import argparse
+import tempfile
+import time
+from contextlib import ExitStack
+from unittest import mock
+
+from common import BENCHMARK_BUCKETS, setup_import_paths, summarize_histogram, write_results
+from fakes import (InjectedLatency, build_sheet_items, FakeSheetsReader, FakeAIGenerator,
+                   FakeDriveUploader, FakeSMTP, FakeSlackWebhook)
+
+setup_import_paths()
+
+import main as pipeline
+from monitoring import MetricsRegistry
+from monitoring.metrics import STAGE_DURATION_METRIC
+from notifications import EmailNotifier, SlackNotifier
+from persistence import DatabaseManager
+
+# Các dịch vụ có thể cấu hình độ trễ
+SERVICES = ('openai', 'drive', 'sheets', 'smtp', 'slack')
+
+
+def parse_arguments():
+    """
+    Phân tích các đối số dòng lệnh
+    """
+    parser = argparse.ArgumentParser(description='Benchmark quy trình tự động hóa với dịch vụ giả lập')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000],
+                        help='Số hàng Google Sheet cho mỗi lượt chạy')
+    parser.add_argument('--mode', choices=['main', 'items'], default='main',
+                        help="'main' chạy toàn bộ main() kể cả báo cáo, 'items' chỉ gọi process_item")
+    parser.add_argument('--latency', action='append', default=[], metavar='SERVICE=MS',
+                        help=f"Độ trễ giả lập (mili giây) cho dịch vụ: {', '.join(SERVICES)}")
+    parser.add_argument('--jitter', type=float, default=0.0, help='Biên độ dao động tương đối của độ trễ (0.0 đến 1.0)')
+    parser.add_argument('--seed', type=int, default=42, help='Seed cho độ trễ ngẫu nhiên')
+    parser.add_argument('--output', help='Đường dẫn file JSON kết quả')
+    parser.add_argument('--verbose', action='store_true', help='Giữ log INFO của quy trình (làm chậm benchmark)')
+    return parser.parse_args()
+
+
+def parse_latencies(latency_args, jitter, seed):
+    """
+    Chuyển các đối số SERVICE=MS thành đối tượng độ trễ
+
+    Args:
+        latency_args (list): Danh sách chuỗi SERVICE=MS
+        jitter (float): Biên độ dao động tương đối
+        seed (int): Seed cho bộ sinh số ngẫu nhiên
+
+    Returns:
+        dict: Ánh xạ tên dịch vụ -> InjectedLatency
+    """
+    latency_ms = {service: 0.0 for service in SERVICES}
+
+    for arg in latency_args:
+        service, _, value = arg.partition('=')
+        if service not in latency_ms:
+            raise ValueError(f"Dịch vụ không hợp lệ: {service}. Hỗ trợ: {', '.join(SERVICES)}")
+        latency_ms[service] = float(value)
+
+    return {
+        service: InjectedLatency(mean_ms, jitter, seed=seed + index)
+        for index, (service, mean_ms) in enumerate(latency_ms.items())
+    }
+
+
+def run_once(row_count, mode, latencies, work_dir):
+    """
+    Chạy quy trình một lần với số hàng cho trước
+
+    Args:
+        row_count (int): Số hàng Google Sheet
+        mode (str): 'main' hoặc 'items'
+        latencies (dict): Độ trễ giả lập theo dịch vụ
+        work_dir (str): Thư mục tạm cho cơ sở dữ liệu, log và báo cáo
+
+    Returns:
+        dict: Kết quả đo của lượt chạy
+    """
+    items = build_sheet_items(row_count)
+
+    registry = MetricsRegistry()
+    registry.histogram(STAGE_DURATION_METRIC, "Thời gian thực thi của từng bước xử lý", buckets=BENCHMARK_BUCKETS)
+
+    drive_uploader = FakeDriveUploader(latencies['drive'])
+    slack_webhook = FakeSlackWebhook(latencies['slack'])
+
+    FakeAIGenerator.latency = latencies['openai']
+    FakeAIGenerator.output_dir = work_dir
+    FakeSMTP.latency = latencies['smtp']
+    FakeSMTP.sent_count = 0
+
+    settings = pipeline.config.Settings(
+        data_dir=os.path.join(work_dir, 'data'),
+        log_dir=os.path.join(work_dir, 'logs'),
+        report_output_dir=os.path.join(work_dir, 'reports'),
+        google_sheet_id='bench-sheet',
+        drive_folder_id='bench-folder',
+        openai_api_key='bench-key',
+        email=pipeline.config.EmailSettings(
+            smtp_server="smtp.benchmark.local",
+            sender_email="bench@example.com",
+            sender_password="bench",
+            admin_email="admin@example.com"
+        ),
+        slack_webhook_url='https://hooks.slack.local/benchmark'
+    )
+    settings.ensure_directories()
+
+    # File credential giả nằm ở vị trí Settings mong đợi để main() không dừng sớm
+    with open(settings.google_credentials_file, 'w') as f:
+        f.write('{}')
+
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch.object(pipeline.config, 'DEFAULT_LOG_DIR', settings.log_dir))
+        stack.enter_context(mock.patch.object(
+            pipeline.config, 'load_settings', lambda env_file=None, environ=None: settings))
+        stack.enter_context(mock.patch.object(
+            pipeline.integrations, 'GoogleSheetsReader',
+            lambda credentials_file: FakeSheetsReader(items, latencies['sheets'])))
+        stack.enter_context(mock.patch.object(
+            pipeline.integrations, 'GoogleDriveUploader', lambda credentials_file, folder_id: drive_uploader))
+        stack.enter_context(mock.patch.object(pipeline.generators, 'AIGenerator', FakeAIGenerator))
+        stack.enter_context(mock.patch.object(pipeline, 'MetricsRegistry', lambda: registry))
+        stack.enter_context(mock.patch('smtplib.SMTP', FakeSMTP))
+        stack.enter_context(mock.patch('requests.post', slack_webhook))
+
+        start_time = time.perf_counter()
+
+        if mode == 'main':
+            metrics_file = os.path.join(work_dir, 'automation.prom')
+            stack.enter_context(mock.patch.object(
+                sys, 'argv', ['main.py', '--sheet-id', 'bench-sheet', '--metrics-file', metrics_file]))
+            pipeline.main()
+        else:
+            logger = logging.getLogger('benchmark')
+            db_manager = DatabaseManager(settings.database_path)
+            email_notifier = EmailNotifier(settings.email.as_dict())
+            slack_notifier = SlackNotifier(settings.slack_webhook_url)
+            for item in items:
+                pipeline.process_item(item, settings, db_manager, drive_uploader, email_notifier, slack_notifier,
+                                      logger, metrics=registry)
+
+        elapsed = time.perf_counter() - start_time
+
+    stages = summarize_histogram(registry.histogram(STAGE_DURATION_METRIC))
+    items_counter = registry.counter("pipeline_items_total")
+    db_write_count = sum(stats['count'] for name, stats in stages.items() if name.startswith('db_write'))
+    db_write_seconds = sum(stats['total_seconds'] for name, stats in stages.items() if name.startswith('db_write'))
+
+    return {
+        'rows': row_count,
+        'mode': mode,
+        'elapsed_seconds': elapsed,
+        'items_per_second': row_count / elapsed if elapsed > 0 else None,
+        'success_count': items_counter.get(status='success'),
+        'failure_count': items_counter.get(status='failure'),
+        'db_writes': db_write_count,
+        'db_writes_per_second': db_write_count / db_write_seconds if db_write_seconds > 0 else None,
+        'emails_sent': FakeSMTP.sent_count,
+        'slack_posts': slack_webhook.post_count,
+        'stages': stages
+    }
+
+
+def main():
+    """
+    Hàm chính của benchmark
+    """
+    args = parse_arguments()
+    latencies = parse_latencies(args.latency, args.jitter, args.seed)
+
+    if not args.verbose:
+        # Log từng mục chiếm phần lớn thời gian ở kích thước lớn và làm sai lệch kết quả
+        logging.disable(logging.INFO)
+
+    results = []
+    for row_count in args.sizes:
+        with tempfile.TemporaryDirectory(prefix='pipeline_bench_') as work_dir:
+            result = run_once(row_count, args.mode, latencies, work_dir)
+
+        results.append(result)
+        print(f"{row_count:>7} hàng: {result['elapsed_seconds']:.2f}s, "
+              f"{result['items_per_second']:.1f} mục/s, "
+              f"{result['db_writes_per_second'] or 0:.1f} lần ghi DB/s")
+
+    parameters = {
+        'sizes': args.sizes,
+        'mode': args.mode,
+        'latency_ms': {service: latency.mean_ms for service, latency in latencies.items()},
+        'jitter': args.jitter,
+        'seed': args.seed
+    }
+    output_path = write_results('pipeline', parameters, results, args.output)
+    print(f"Đã ghi kết quả benchmark: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,104 +3,225 @@
 
 """
 File cấu hình cho quy trình tự động hóa
+
+Việc import module này không đọc file, không đọc biến môi trường và không tạo thư mục.
+Cấu hình được dựng một lần bằng load_settings(), kiểm tra một lần bằng Settings.validate()
+và được truyền tường minh cho các thành phần.
 """
 
 import os
 import logging
-import sys
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from dotenv import load_dotenv
-
-# Cấu hình logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
-)
-logger = logging.getLogger("config")
+from typing import Dict, List, Mapping, Optional
 
-# Tải biến môi trường từ .env.local
-# .env.example chỉ là mẫu và không nên được tải
-env_local_path = Path(__file__).parent / ".env.local"
-
-if env_local_path.exists():
-    logger.info(f"Đang tải biến môi trường từ {env_local_path}")
-    load_dotenv(env_local_path)
-else:
-    logger.warning("Không tìm thấy file .env.local. Sử dụng biến môi trường hệ thống.")
-    logger.info("Lưu ý: .env.example có sẵn như một mẫu nhưng sẽ không được tải tự động.")
+logger = logging.getLogger("config")
 
 # Thư mục gốc của dự án
 BASE_DIR = Path(__file__).parent.absolute()
 
-# Thư mục lưu trữ dữ liệu
-DATA_DIR = os.path.join(BASE_DIR, "data")
-
-# Thư mục lưu trữ logs
-LOG_DIR = os.path.join(BASE_DIR, "logs")
-
-# Thư mục lưu trữ báo cáo
-REPORT_OUTPUT_DIR = os.path.join(BASE_DIR, "reports")
-
-# Đường dẫn đến file cơ sở dữ liệu
-DATABASE_PATH = os.path.join(DATA_DIR, "automation.db")
-
-# Đường dẫn đến file credential Google API
-GOOGLE_CREDENTIALS_FILE = os.path.join(DATA_DIR, "google_credentials.json")
-
-# ID Google Sheet chứa dữ liệu đầu vào
-GOOGLE_SHEET_ID = os.getenv("GOOGLE_SHEET_ID")
-if not GOOGLE_SHEET_ID:
-    logger.warning("GOOGLE_SHEET_ID không được đặt trong biến môi trường")
-
-# ID thư mục Google Drive để lưu trữ tài sản đã tạo
-DRIVE_FOLDER_ID = os.getenv("GOOGLE_DRIVE_FOLDER_ID")
-if not DRIVE_FOLDER_ID:
-    logger.warning("GOOGLE_DRIVE_FOLDER_ID không được đặt trong biến môi trường")
-
-# API key cho các dịch vụ AI (ưu tiên OpenAI, dự phòng Anthropic)
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
-
-# Sử dụng API key phù hợp dựa trên tính khả dụng
-if OPENAI_API_KEY:
-    AI_API_KEY = OPENAI_API_KEY
-    AI_SERVICE = "openai"
-elif ANTHROPIC_API_KEY:
-    AI_API_KEY = ANTHROPIC_API_KEY
-    AI_SERVICE = "anthropic"
-else:
-    logger.warning("Không tìm thấy API key AI trong biến môi trường")
-    AI_API_KEY = None
-    AI_SERVICE = None
-
-# Cấu hình email
-EMAIL_CONFIG = {
-    "smtp_server": os.getenv("EMAIL_SMTP_SERVER", "smtp.gmail.com"),
-    "smtp_port": int(os.getenv("EMAIL_SMTP_PORT", "587")),
-    "sender_email": os.getenv("EMAIL_SENDER"),
-    "sender_password": os.getenv("EMAIL_PASSWORD"),
-    "admin_email": os.getenv("ADMIN_EMAIL")
-}
-
-# Xác thực cấu hình email
-if not all([
-    EMAIL_CONFIG["sender_email"],
-    EMAIL_CONFIG["sender_password"],
-    EMAIL_CONFIG["admin_email"]
-]):
-    logger.warning("Cấu hình email không đầy đủ trong biến môi trường")
-
-# URL webhook Slack
-SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL")
-if not SLACK_WEBHOOK_URL:
-    logger.warning("SLACK_WEBHOOK_URL không được đặt trong biến môi trường")
-
-# Đảm bảo các thư mục tồn tại
-for dir_path in [DATA_DIR, LOG_DIR, REPORT_OUTPUT_DIR]:
-    os.makedirs(dir_path, exist_ok=True)
-
-# Ghi log trạng thái cấu hình
-logger.info("Đã tải cấu hình xong")
\ No newline at end of file
+# File môi trường mặc định (.env.example chỉ là mẫu và không bao giờ được tải)
+DEFAULT_ENV_FILE = BASE_DIR / ".env.local"
+
+# Thư mục lưu trữ logs (không phụ thuộc biến môi trường nên có thể dùng trước khi dựng Settings)
+DEFAULT_LOG_DIR = os.path.join(BASE_DIR, "logs")
+
+
+@dataclass(frozen=True)
+class EmailSettings:
+    """
+    Cấu hình gửi email
+    """
+
+    smtp_server: str = "smtp.gmail.com"
+    smtp_port: int = 587
+    sender_email: Optional[str] = None
+    sender_password: Optional[str] = None
+    admin_email: Optional[str] = None
+
+    @property
+    def is_complete(self) -> bool:
+        """
+        Kiểm tra cấu hình email có đủ thông tin để gửi hay không
+        """
+        return all([self.sender_email, self.sender_password, self.admin_email])
+
+    def as_dict(self) -> Dict:
+        """
+        Chuyển cấu hình thành dict theo định dạng EmailNotifier sử dụng
+
+        Returns:
+            dict: Cấu hình email
+        """
+        return {
+            "smtp_server": self.smtp_server,
+            "smtp_port": self.smtp_port,
+            "sender_email": self.sender_email,
+            "sender_password": self.sender_password,
+            "admin_email": self.admin_email
+        }
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Cấu hình bất biến của một phiên bản quy trình tự động hóa
+    """
+
+    # Thư mục lưu trữ dữ liệu, logs và báo cáo
+    data_dir: str = os.path.join(BASE_DIR, "data")
+    log_dir: str = DEFAULT_LOG_DIR
+    report_output_dir: str = os.path.join(BASE_DIR, "reports")
+
+    # ID Google Sheet chứa dữ liệu đầu vào và thư mục Google Drive lưu tài sản đã tạo
+    google_sheet_id: Optional[str] = None
+    drive_folder_id: Optional[str] = None
+
+    # API key cho các dịch vụ AI (ưu tiên OpenAI, dự phòng Anthropic)
+    openai_api_key: Optional[str] = None
+    anthropic_api_key: Optional[str] = None
+    preferred_ai_service: Optional[str] = None
+
+    email: EmailSettings = field(default_factory=EmailSettings)
+    slack_webhook_url: Optional[str] = None
+
+    # Backend biểu đồ của báo cáo HTML: "png" (matplotlib) hoặc "svg" (nội tuyến, không cần matplotlib)
+    report_chart_backend: str = "png"
+
+    # Thư mục lưu bytecode template Jinja2; None dùng thư mục tạm riêng của người dùng do Jinja2 chọn
+    template_cache_dir: Optional[str] = None
+
+    @property
+    def database_path(self) -> str:
+        """
+        Đường dẫn đến file cơ sở dữ liệu
+        """
+        return os.path.join(self.data_dir, "automation.db")
+
+    @property
+    def google_credentials_file(self) -> str:
+        """
+        Đường dẫn đến file credential Google API
+        """
+        return os.path.join(self.data_dir, "google_credentials.json")
+
+    @property
+    def ai_service(self) -> Optional[str]:
+        """
+        Dịch vụ AI sẽ sử dụng dựa trên tính khả dụng của API key
+        """
+        keys = {"openai": self.openai_api_key, "anthropic": self.anthropic_api_key}
+
+        if self.preferred_ai_service and keys.get(self.preferred_ai_service):
+            return self.preferred_ai_service
+        if self.openai_api_key:
+            return "openai"
+        if self.anthropic_api_key:
+            return "anthropic"
+        return None
+
+    @property
+    def ai_api_key(self) -> Optional[str]:
+        """
+        API key của dịch vụ AI đang được sử dụng
+        """
+        if self.ai_service == "openai":
+            return self.openai_api_key
+        if self.ai_service == "anthropic":
+            return self.anthropic_api_key
+        return None
+
+    def with_overrides(self, **changes) -> "Settings":
+        """
+        Tạo bản sao cấu hình với một số giá trị được ghi đè (bỏ qua các giá trị None)
+
+        Args:
+            **changes: Các trường cần ghi đè
+
+        Returns:
+            Settings: Cấu hình mới
+        """
+        return replace(self, **{name: value for name, value in changes.items() if value is not None})
+
+    def validate(self) -> List[str]:
+        """
+        Kiểm tra cấu hình và trả về danh sách cảnh báo
+
+        Returns:
+            list: Danh sách thông báo cảnh báo, rỗng nếu cấu hình đầy đủ
+        """
+        warnings = []
+
+        if not self.google_sheet_id:
+            warnings.append("GOOGLE_SHEET_ID không được đặt trong biến môi trường")
+        if not self.drive_folder_id:
+            warnings.append("GOOGLE_DRIVE_FOLDER_ID không được đặt trong biến môi trường")
+        if not self.ai_api_key:
+            warnings.append("Không tìm thấy API key AI trong biến môi trường")
+        if not self.email.is_complete:
+            warnings.append("Cấu hình email không đầy đủ. Thông báo email sẽ không hoạt động đúng.")
+        if not self.slack_webhook_url:
+            warnings.append("URL webhook Slack không được cung cấp. Thông báo Slack sẽ không hoạt động.")
+
+        return warnings
+
+    def ensure_directories(self) -> None:
+        """
+        Đảm bảo các thư mục dữ liệu, logs và báo cáo tồn tại
+        """
+        for dir_path in [self.data_dir, self.log_dir, self.report_output_dir]:
+            os.makedirs(dir_path, exist_ok=True)
+
+
+def load_settings(env_file: Optional[str] = None, environ: Optional[Mapping[str, str]] = None) -> Settings:
+    """
+    Dựng cấu hình từ biến môi trường và file .env mà không thay đổi os.environ
+
+    Thứ tự ưu tiên (cao đến thấp): env_file được chỉ định, biến môi trường, .env.local
+
+    Args:
+        env_file (str, optional): File .env tùy chỉnh, giá trị trong file ghi đè biến môi trường
+        environ (Mapping, optional): Nguồn biến môi trường. Mặc định là os.environ.
+
+    Returns:
+        Settings: Cấu hình đã dựng
+
+    Raises:
+        FileNotFoundError: Nếu env_file được chỉ định nhưng không tồn tại
+    """
+    from dotenv import dotenv_values
+
+    values = {}
+
+    if DEFAULT_ENV_FILE.exists():
+        logger.info(f"Đang tải biến môi trường từ {DEFAULT_ENV_FILE}")
+        values.update({key: value for key, value in dotenv_values(DEFAULT_ENV_FILE).items() if value is not None})
+    else:
+        logger.info("Không tìm thấy file .env.local. Sử dụng biến môi trường hệ thống.")
+
+    values.update(os.environ if environ is None else environ)
+
+    if env_file:
+        if not os.path.exists(env_file):
+            raise FileNotFoundError(f"Không tìm thấy tệp môi trường: {env_file}")
+        logger.info(f"Đang tải môi trường từ {env_file}")
+        values.update({key: value for key, value in dotenv_values(env_file).items() if value is not None})
+
+    email = EmailSettings(
+        smtp_server=values.get("EMAIL_SMTP_SERVER", "smtp.gmail.com"),
+        smtp_port=int(values.get("EMAIL_SMTP_PORT", "587")),
+        sender_email=values.get("EMAIL_SENDER"),
+        sender_password=values.get("EMAIL_PASSWORD"),
+        admin_email=values.get("ADMIN_EMAIL")
+    )
+
+    return Settings(
+        google_sheet_id=values.get("GOOGLE_SHEET_ID"),
+        drive_folder_id=values.get("GOOGLE_DRIVE_FOLDER_ID"),
+        openai_api_key=values.get("OPENAI_API_KEY"),
+        anthropic_api_key=values.get("ANTHROPIC_API_KEY"),
+        email=email,
+        slack_webhook_url=values.get("SLACK_WEBHOOK_URL"),
+        report_chart_backend=values.get("REPORT_CHART_BACKEND", "png"),
+        template_cache_dir=values.get("REPORT_TEMPLATE_CACHE_DIR")
+    )
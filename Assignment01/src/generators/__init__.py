@@ -3,9 +3,33 @@
 
 """
 Package initialization for generators
+
+Các lớp được import lười: module con (cùng matplotlib, reportlab, openai, anthropic)
+chỉ được tải khi lớp được truy cập lần đầu.
 """
 
-from .report_generator import ReportGenerator
-from .chart_generator import ChartGenerator
-from .pdf_report_generator import PDFReportGenerator
-from .ai_generator import AIGenerator
+import importlib
+
+# Ánh xạ tên lớp -> module con chứa lớp đó
+_LAZY_EXPORTS = {
+    'ReportGenerator': 'report_generator',
+    'ChartGenerator': 'chart_generator',
+    'SVGChartGenerator': 'svg_chart_generator',
+    'HTMLReportGenerator': 'html_report_generator',
+    'PDFReportGenerator': 'pdf_report_generator',
+    'DailyReportData': 'report_data',
+    'WeeklyReportData': 'report_data',
+    'AIGenerator': 'ai_generator',
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
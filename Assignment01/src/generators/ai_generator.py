@@ -10,8 +10,6 @@ import logging
 import time
 import requests
 import tempfile
-import anthropic
-import openai
 
 class AIGenerator:
     """
@@ -31,16 +29,19 @@ class AIGenerator:
         self.service = service or 'openai'  # Mặc định là OpenAI nếu không chỉ định
 
         # Initialize clients based on available API keys
+        # SDK chỉ được import khi dịch vụ tương ứng thực sự được dùng để giảm thời gian khởi động
         if self.service == 'openai':
             if not api_key:
                 self.logger.error("Không có khóa API OpenAI nào được cung cấp")
                 raise ValueError("Khóa API OpenAI là bắt buộc")
+            import openai
             self.openai_client = openai.OpenAI(api_key=api_key)
             self.anthropic_client = None  # Không khởi tạo Anthropic nếu sử dụng OpenAI
         elif self.service == 'anthropic':
             if not api_key:
                 self.logger.error("Không có khóa API Anthropic nào được cung cấp")
                 raise ValueError("Khóa API Anthropic là bắt buộc")
+            import anthropic
             self.anthropic_client = anthropic.Anthropic(api_key=api_key)
             self.openai_client = None  # Không khởi tạo OpenAI nếu sử dụng Anthropic
         else:
@@ -48,6 +49,8 @@ class AIGenerator:
             if not api_key:
                 self.logger.error("Không có khóa API nào được cung cấp")
                 raise ValueError("Cần có khóa API")
+            import openai
+            import anthropic
             self.openai_client = openai.OpenAI(api_key=api_key)
             self.anthropic_client = anthropic.Anthropic(api_key=api_key)
 
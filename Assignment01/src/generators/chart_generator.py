@@ -3,32 +3,314 @@
 
 """
 Module tạo biểu đồ cho báo cáo
+
+Biểu đồ được vẽ bằng API hướng đối tượng (Figure + FigureCanvasAgg) thay vì pyplot,
+nên không phụ thuộc trạng thái toàn cục và có thể vẽ song song trong nhiều tiến trình.
+
+Tên file biểu đồ chứa mã băm của dữ liệu đầu vào: khi dữ liệu không đổi, file đã có được
+dùng lại và matplotlib không được import.
 """
 
 import os
+import re
+import json
+import hashlib
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-import matplotlib
-matplotlib.use('Agg')  # Đảm bảo không cần GUI
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from matplotlib.ticker import MaxNLocator
-import numpy as np
+
+# Style áp dụng cho mọi biểu đồ
+CHART_STYLE = 'ggplot'
+
+# Độ phân giải khi lưu biểu đồ
+CHART_DPI = 100
+
+# Phiên bản cách vẽ biểu đồ, tăng lên khi thay đổi giao diện để bộ đệm cũ không còn hợp lệ
+CHART_CACHE_VERSION = 1
+
+# Số ký tự của mã băm trong tên file biểu đồ
+CHART_HASH_LENGTH = 12
+
+# Màu sắc theo định dạng
+FORMAT_COLORS = {
+    'png': '#3498db',   # Xanh dương
+    'jpg': '#2ecc71',   # Xanh lá
+    'gif': '#e67e22',   # Cam
+    'mp3': '#9b59b6',   # Tím
+}
+
+
+def _chart_style():
+    """
+    Context manager áp dụng style biểu đồ (matplotlib chỉ được import khi thực sự vẽ)
+    """
+    import matplotlib.style
+    return matplotlib.style.context(CHART_STYLE)
+
+
+def _new_figure(figsize):
+    """
+    Tạo Figure gắn với canvas Agg, không đăng ký vào pyplot
+
+    Args:
+        figsize (tuple): Kích thước biểu đồ (inch)
+
+    Returns:
+        Figure: Đối tượng Figure
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def _chart_prefix(chart_type, kwargs):
+    """
+    Xác định tiền tố tên file (không gồm mã băm) của một biểu đồ
+
+    Args:
+        chart_type (str): Loại biểu đồ
+        kwargs (dict): Tham số của biểu đồ
+
+    Returns:
+        str: Tiền tố tên file
+    """
+    if chart_type == 'daily':
+        return f"daily_chart_{kwargs['date'].strftime('%Y%m%d')}"
+    if chart_type == 'weekly':
+        return f"weekly_chart_{kwargs['start_date'].strftime('%Y%m%d')}_{kwargs['end_date'].strftime('%Y%m%d')}"
+    if chart_type == 'format_distribution':
+        return f"format_distribution_{datetime.now().strftime('%Y%m%d')}"
+    raise ValueError(f"Loại biểu đồ không hợp lệ: {chart_type}")
+
+
+def chart_cache_key(chart_type, kwargs):
+    """
+    Tính mã băm của dữ liệu đầu vào biểu đồ
+
+    Args:
+        chart_type (str): Loại biểu đồ
+        kwargs (dict): Tham số của biểu đồ
+
+    Returns:
+        str: Mã băm hex gồm CHART_HASH_LENGTH ký tự
+    """
+    payload = json.dumps(
+        [CHART_CACHE_VERSION, CHART_STYLE, CHART_DPI, chart_type, kwargs],
+        sort_keys=True, default=str, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:CHART_HASH_LENGTH]
+
+
+def render_daily_chart(chart_path, date, success_count, failure_count):
+    """
+    Vẽ biểu đồ thống kê hàng ngày và lưu ra file
+
+    Args:
+        chart_path (str): Đường dẫn file biểu đồ
+        date (datetime.date): Ngày tạo biểu đồ
+        success_count (int): Số lượng thành công
+        failure_count (int): Số lượng thất bại
+
+    Returns:
+        str: Đường dẫn đến file biểu đồ
+    """
+    # Tạo dữ liệu
+    categories = ['Thành công / Success', 'Thất bại / Failure']
+    counts = [success_count, failure_count]
+    colors = ['#2ecc71', '#e74c3c']
+
+    with _chart_style():
+        # Tạo biểu đồ
+        # Create chart
+        fig = _new_figure((14, 7))
+        ax1, ax2 = fig.subplots(1, 2)
+
+        # Biểu đồ cột
+        ax1.bar(categories, counts, color=colors)
+        ax1.set_title(f'Thống kê ngày: {date.strftime("%Y-%m-%d")}', fontsize=14)
+        ax1.set_ylabel('Số lượng', fontsize=12)
+
+        # Thêm số liệu lên biểu đồ cột
+        for i, v in enumerate(counts):
+            ax1.text(i, v + 0.1, str(v), ha='center', fontsize=12, fontweight='bold')
+
+        # Biểu đồ tròn
+        if sum(counts) > 0:  # Tránh chia cho 0
+            ax2.pie(counts, labels=categories, autopct='%1.1f%%', startangle=90, colors=colors, shadow=True)
+            ax2.set_title(f'Tỷ lệ %: {date.strftime("%Y-%m-%d")}', fontsize=14)
+        else:
+            ax2.text(0.5, 0.5, "Không có dữ liệu", ha='center', va='center', fontsize=14)
+            ax2.axis('off')
+
+        fig.tight_layout()
+
+        # Lưu biểu đồ
+        # Save chart
+        fig.savefig(chart_path, dpi=CHART_DPI)
+
+    return chart_path
+
+
+def render_weekly_chart(chart_path, start_date, end_date, stats_data):
+    """
+    Vẽ biểu đồ thống kê hàng tuần và lưu ra file
+
+    Args:
+        chart_path (str): Đường dẫn file biểu đồ
+        start_date (datetime.date): Ngày bắt đầu
+        end_date (datetime.date): Ngày kết thúc
+        stats_data (list): Dữ liệu thống kê hàng ngày
+
+    Returns:
+        str: Đường dẫn đến file biểu đồ
+    """
+    import matplotlib.dates as mdates
+    from matplotlib.artist import setp
+
+    # Chuẩn bị dữ liệu
+    dates = []
+    success_counts = []
+    failure_counts = []
+
+    for stat in stats_data:
+        dates.append(datetime.strptime(stat['date'], '%Y-%m-%d').date())
+        success_counts.append(stat['success_count'])
+        failure_counts.append(stat['failure_count'])
+
+    with _chart_style():
+        # Tạo biểu đồ
+        fig = _new_figure((12, 10))
+        ax1, ax2 = fig.subplots(2, 1)
+
+        # Biểu đồ cột chồng lên nhau
+        width = 0.35
+        ax1.bar(dates, success_counts, width, label='Thành công', color='#2ecc71')
+        ax1.bar(dates, failure_counts, width, bottom=success_counts, label='Thất bại', color='#e74c3c')
+
+        # Định dạng trục x
+        ax1.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
+        setp(ax1.xaxis.get_majorticklabels(), rotation=45, ha="right")
+
+        # Đặt tiêu đề và nhãn
+        title_period = f"{start_date.strftime('%Y-%m-%d')} - {end_date.strftime('%Y-%m-%d')}"
+        ax1.set_title(f'Số lượng theo ngày: {title_period}', fontsize=14)
+        ax1.set_ylabel('Số lượng', fontsize=12)
+        ax1.legend()
+
+        # Biểu đồ đường cho tỷ lệ thành công
+        success_rates = [stat['success_rate'] for stat in stats_data]
+        ax2.plot(dates, success_rates, marker='o', linestyle='-', color='#3498db', linewidth=2, markersize=8)
+
+        # Định dạng trục x
+        ax2.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
+        setp(ax2.xaxis.get_majorticklabels(), rotation=45, ha="right")
+
+        # Đặt tiêu đề và nhãn
+        ax2.set_title(f'Tỷ lệ thành công theo ngày: {title_period}', fontsize=14)
+        ax2.set_ylabel('Tỷ lệ %', fontsize=12)
+        ax2.set_ylim(0, 100)
+
+        # Thêm grid
+        ax1.grid(True, linestyle='--', alpha=0.7)
+        ax2.grid(True, linestyle='--', alpha=0.7)
+
+        fig.tight_layout()
+
+        # Lưu biểu đồ
+        fig.savefig(chart_path, dpi=CHART_DPI)
+
+    return chart_path
+
+
+def render_format_distribution_chart(chart_path, format_stats):
+    """
+    Vẽ biểu đồ phân phối theo định dạng đầu ra và lưu ra file
+
+    Args:
+        chart_path (str): Đường dẫn file biểu đồ
+        format_stats (dict): Số lượng theo định dạng
+
+    Returns:
+        str: Đường dẫn đến file biểu đồ
+    """
+    # Chuẩn bị dữ liệu
+    formats = list(format_stats.keys())
+    counts = list(format_stats.values())
+    colors = [FORMAT_COLORS.get(fmt, '#95a5a6') for fmt in formats]
+
+    with _chart_style():
+        # Tạo biểu đồ
+        # Create chart
+        fig = _new_figure((10, 7))
+        ax = fig.subplots()
+
+        ax.pie(counts, labels=formats, autopct='%1.1f%%', startangle=90, colors=colors, shadow=True)
+        ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
+
+        ax.set_title('Phân phối định dạng đầu ra', fontsize=14)
+
+        # Lưu biểu đồ
+        # Save chart
+        fig.savefig(chart_path, dpi=CHART_DPI)
+
+    return chart_path
+
+
+# Ánh xạ loại biểu đồ -> hàm vẽ, dùng cho render_batch (phải ở cấp module để pickle được)
+_RENDERERS = {
+    'daily': render_daily_chart,
+    'weekly': render_weekly_chart,
+    'format_distribution': render_format_distribution_chart,
+}
+
+
+def _render_job(chart_type, chart_path, kwargs):
+    """
+    Hàm worker chạy trong tiến trình con
+
+    Biểu đồ được ghi ra file tạm rồi đổi tên, để một file dở dang không bao giờ bị coi là bộ đệm hợp lệ.
+
+    Args:
+        chart_type (str): Loại biểu đồ
+        chart_path (str): Đường dẫn file biểu đồ
+        kwargs (dict): Tham số của hàm vẽ
+
+    Returns:
+        str: Đường dẫn đến file biểu đồ
+    """
+    base, extension = os.path.splitext(chart_path)
+    temp_path = f"{base}.{os.getpid()}.tmp{extension}"
+
+    try:
+        _RENDERERS[chart_type](temp_path, **kwargs)
+        os.replace(temp_path, chart_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    return chart_path
+
 
 class ChartGenerator:
     """
     Lớp tạo biểu đồ cho báo cáo
     """
 
-    def __init__(self, output_dir):
+    def __init__(self, output_dir, use_cache=True):
         """
         Khởi tạo đối tượng ChartGenerator
 
         Args:
             output_dir (str): Thư mục lưu biểu đồ đầu ra
+            use_cache (bool, optional): Dùng lại file biểu đồ đã có khi dữ liệu đầu vào không đổi.
+                Mặc định là True.
         """
         self.logger = logging.getLogger(__name__)
         self.output_dir = output_dir
+        self.use_cache = use_cache
 
         # Đảm bảo thư mục đầu ra tồn tại
         os.makedirs(output_dir, exist_ok=True)
@@ -37,9 +319,6 @@ class ChartGenerator:
         self.charts_dir = os.path.join(output_dir, "charts")
         os.makedirs(self.charts_dir, exist_ok=True)
 
-        # Thiết lập style cho biểu đồ
-        plt.style.use('ggplot')
-
     def generate_daily_chart(self, date, success_count, failure_count):
         """
         Tạo biểu đồ thống kê hàng ngày
@@ -53,40 +332,11 @@ class ChartGenerator:
             str: Đường dẫn đến file biểu đồ
         """
         try:
-            # Tạo dữ liệu
-            categories = ['Thành công / Success', 'Thất bại / Failure']
-            counts = [success_count, failure_count]
-            colors = ['#2ecc71', '#e74c3c']
-
-            # Tạo biểu đồ
-            # Create chart
-            fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 7))
-
-            # Biểu đồ cột
-            ax1.bar(categories, counts, color=colors)
-            ax1.set_title(f'Thống kê ngày: {date.strftime("%Y-%m-%d")}', fontsize=14)
-            ax1.set_ylabel('Số lượng', fontsize=12)
-
-            # Thêm số liệu lên biểu đồ cột
-            for i, v in enumerate(counts):
-                ax1.text(i, v + 0.1, str(v), ha='center', fontsize=12, fontweight='bold')
-
-            # Biểu đồ tròn
-            if sum(counts) > 0:  # Tránh chia cho 0
-                ax2.pie(counts, labels=categories, autopct='%1.1f%%', startangle=90, colors=colors, shadow=True)
-                ax2.set_title(f'Tỷ lệ %: {date.strftime("%Y-%m-%d")}', fontsize=14)
-            else:
-                ax2.text(0.5, 0.5, "Không có dữ liệu", ha='center', va='center', fontsize=14)
-                ax2.axis('off')
-
-            plt.tight_layout()
-
-            # Lưu biểu đồ
-            # Save chart
-            chart_filename = f"daily_chart_{date.strftime('%Y%m%d')}.png"
-            chart_path = os.path.join(self.charts_dir, chart_filename)
-            plt.savefig(chart_path, dpi=100)
-            plt.close(fig)
+            chart_path = self._render_cached('daily', {
+                'date': date,
+                'success_count': success_count,
+                'failure_count': failure_count
+            })
 
             self.logger.info(f"Đã tạo biểu đồ hàng ngày: {chart_path}")
 
@@ -113,58 +363,11 @@ class ChartGenerator:
                 self.logger.warning(f"Không có dữ liệu để tạo biểu đồ từ {start_date} đến {end_date}")
                 return None
 
-            # Chuẩn bị dữ liệu
-            dates = []
-            success_counts = []
-            failure_counts = []
-
-            for stat in stats_data:
-                dates.append(datetime.strptime(stat['date'], '%Y-%m-%d').date())
-                success_counts.append(stat['success_count'])
-                failure_counts.append(stat['failure_count'])
-
-            # Tạo biểu đồ
-            fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
-
-            # Biểu đồ cột chồng lên nhau
-            width = 0.35
-            ax1.bar(dates, success_counts, width, label='Thành công', color='#2ecc71')
-            ax1.bar(dates, failure_counts, width, bottom=success_counts, label='Thất bại', color='#e74c3c')
-
-            # Định dạng trục x
-            ax1.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-            plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45, ha="right")
-
-            # Đặt tiêu đề và nhãn
-            title_period = f"{start_date.strftime('%Y-%m-%d')} - {end_date.strftime('%Y-%m-%d')}"
-            ax1.set_title(f'Số lượng theo ngày: {title_period}', fontsize=14)
-            ax1.set_ylabel('Số lượng', fontsize=12)
-            ax1.legend()
-
-            # Biểu đồ đường cho tỷ lệ thành công
-            success_rates = [stat['success_rate'] for stat in stats_data]
-            ax2.plot(dates, success_rates, marker='o', linestyle='-', color='#3498db', linewidth=2, markersize=8)
-
-            # Định dạng trục x
-            ax2.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-            plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45, ha="right")
-
-            # Đặt tiêu đề và nhãn
-            ax2.set_title(f'Tỷ lệ thành công theo ngày: {title_period}', fontsize=14)
-            ax2.set_ylabel('Tỷ lệ %', fontsize=12)
-            ax2.set_ylim(0, 100)
-
-            # Thêm grid
-            ax1.grid(True, linestyle='--', alpha=0.7)
-            ax2.grid(True, linestyle='--', alpha=0.7)
-
-            plt.tight_layout()
-
-            # Lưu biểu đồ
-            chart_filename = f"weekly_chart_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.png"
-            chart_path = os.path.join(self.charts_dir, chart_filename)
-            plt.savefig(chart_path, dpi=100)
-            plt.close(fig)
+            chart_path = self._render_cached('weekly', {
+                'start_date': start_date,
+                'end_date': end_date,
+                'stats_data': stats_data
+            })
 
             self.logger.info(f"Đã tạo biểu đồ hàng tuần: {chart_path}")
 
@@ -189,43 +392,168 @@ class ChartGenerator:
                 self.logger.warning("Không có dữ liệu định dạng để tạo biểu đồ")
                 return None
 
-            format_stats = stats_data['format_stats']
+            chart_path = self._render_cached('format_distribution', {'format_stats': stats_data['format_stats']})
 
-            # Chuẩn bị dữ liệu
-            formats = list(format_stats.keys())
-            counts = list(format_stats.values())
+            self.logger.info(f"Đã tạo biểu đồ phân phối định dạng: {chart_path}")
 
-            # Màu sắc theo định dạng
-            format_colors = {
-                'png': '#3498db',   # Xanh dương
-                'jpg': '#2ecc71',   # Xanh lá
-                'gif': '#e67e22',   # Cam
-                'mp3': '#9b59b6',   # Tím
-            }
+            return chart_path
 
-            colors = [format_colors.get(fmt, '#95a5a6') for fmt in formats]
+        except Exception as e:
+            self.logger.error(f"Lỗi khi tạo biểu đồ phân phối định dạng: {e}")
+            return None
 
-            # Tạo biểu đồ
-            # Create chart
-            fig, ax = plt.subplots(figsize=(10, 7))
+    def _chart_path(self, chart_type, kwargs):
+        """
+        Xác định đường dẫn file cho một yêu cầu vẽ biểu đồ
 
-            ax.pie(counts, labels=formats, autopct='%1.1f%%', startangle=90, colors=colors, shadow=True)
-            ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
+        Args:
+            chart_type (str): Loại biểu đồ
+            kwargs (dict): Tham số của biểu đồ
 
-            plt.title('Phân phối định dạng đầu ra', fontsize=14)
+        Returns:
+            str: Đường dẫn file biểu đồ, tên file gồm tiền tố và mã băm dữ liệu đầu vào
+        """
+        filename = f"{_chart_prefix(chart_type, kwargs)}_{chart_cache_key(chart_type, kwargs)}.png"
+        return os.path.join(self.charts_dir, filename)
 
-            # Lưu biểu đồ
-            # Save chart
-            date_str = datetime.now().strftime('%Y%m%d')
-            chart_filename = f"format_distribution_{date_str}.png"
-            chart_path = os.path.join(self.charts_dir, chart_filename)
-            plt.savefig(chart_path, dpi=100)
-            plt.close(fig)
+    def _is_cached(self, chart_path):
+        """
+        Kiểm tra biểu đồ với cùng dữ liệu đầu vào đã được vẽ trước đó hay chưa
 
-            self.logger.info(f"Đã tạo biểu đồ phân phối định dạng: {chart_path}")
+        Args:
+            chart_path (str): Đường dẫn file biểu đồ
 
+        Returns:
+            bool: True nếu có thể dùng lại file đã có
+        """
+        return self.use_cache and os.path.exists(chart_path)
+
+    def _remove_stale_charts(self, chart_path):
+        """
+        Xóa các phiên bản cũ (dữ liệu đầu vào khác hoặc tên file không có mã băm) của cùng một biểu đồ
+
+        Args:
+            chart_path (str): Đường dẫn file biểu đồ hiện tại
+        """
+        current_name = os.path.basename(chart_path)
+        prefix = current_name[:-(CHART_HASH_LENGTH + len("_.png"))]
+        pattern = re.compile(rf"^{re.escape(prefix)}(_[0-9a-f]{{{CHART_HASH_LENGTH}}})?\.png$")
+
+        for filename in os.listdir(self.charts_dir):
+            if filename == current_name or not pattern.match(filename):
+                continue
+
+            try:
+                os.remove(os.path.join(self.charts_dir, filename))
+                self.logger.debug(f"Đã xóa biểu đồ cũ: {filename}")
+            except OSError as e:
+                self.logger.warning(f"Không thể xóa biểu đồ cũ {filename}: {e}")
+
+    def _render_cached(self, chart_type, kwargs):
+        """
+        Vẽ một biểu đồ, hoặc dùng lại file đã có nếu dữ liệu đầu vào không đổi
+
+        Args:
+            chart_type (str): Loại biểu đồ
+            kwargs (dict): Tham số của hàm vẽ
+
+        Returns:
+            str: Đường dẫn đến file biểu đồ
+        """
+        chart_path = self._chart_path(chart_type, kwargs)
+
+        if self._is_cached(chart_path):
+            self.logger.debug(f"Dùng lại biểu đồ đã có: {chart_path}")
             return chart_path
 
-        except Exception as e:
-            self.logger.error(f"Lỗi khi tạo biểu đồ phân phối định dạng: {e}")
-            return None
+        _render_job(chart_type, chart_path, kwargs)
+        self._remove_stale_charts(chart_path)
+
+        return chart_path
+
+    def render_batch(self, jobs, max_workers=None):
+        """
+        Vẽ nhiều biểu đồ song song trong một nhóm tiến trình
+
+        Biểu đồ có dữ liệu đầu vào không đổi được dùng lại mà không gửi sang tiến trình con.
+
+        Args:
+            jobs (list): Danh sách (chart_type, kwargs) với chart_type là 'daily', 'weekly'
+                hoặc 'format_distribution' và kwargs là tham số của hàm render_* tương ứng
+                (không gồm chart_path)
+            max_workers (int, optional): Số tiến trình tối đa. Mặc định là số CPU.
+
+        Returns:
+            list: Đường dẫn file biểu đồ theo đúng thứ tự của jobs, None với biểu đồ bị lỗi
+        """
+        chart_paths = [None] * len(jobs)
+        pending = []
+        cached_count = 0
+
+        for index, (chart_type, kwargs) in enumerate(jobs):
+            try:
+                chart_path = self._chart_path(chart_type, kwargs)
+            except Exception as e:
+                self.logger.error(f"Lỗi khi chuẩn bị biểu đồ {chart_type}: {e}")
+                continue
+
+            if self._is_cached(chart_path):
+                chart_paths[index] = chart_path
+                cached_count += 1
+            else:
+                pending.append((index, chart_type, chart_path, kwargs))
+
+        # Một biểu đồ hoặc một worker: vẽ trực tiếp để tránh chi phí khởi tạo tiến trình
+        if len(pending) <= 1 or max_workers == 1:
+            for index, chart_type, chart_path, kwargs in pending:
+                try:
+                    chart_paths[index] = _render_job(chart_type, chart_path, kwargs)
+                except Exception as e:
+                    self.logger.error(f"Lỗi khi tạo biểu đồ {chart_type}: {e}")
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    (index, chart_type, executor.submit(_render_job, chart_type, chart_path, kwargs))
+                    for index, chart_type, chart_path, kwargs in pending
+                ]
+
+                for index, chart_type, future in futures:
+                    try:
+                        chart_paths[index] = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Lỗi khi tạo biểu đồ {chart_type}: {e}")
+
+        for index, _, _, _ in pending:
+            if chart_paths[index]:
+                self._remove_stale_charts(chart_paths[index])
+
+        self.logger.info(f"Đã tạo {sum(1 for path in chart_paths if path)}/{len(jobs)} biểu đồ "
+                         f"({cached_count} dùng lại từ bộ đệm)")
+
+        return chart_paths
+
+    def generate_daily_charts(self, daily_stats, max_workers=None):
+        """
+        Tạo biểu đồ hàng ngày cho nhiều ngày song song (ví dụ: bổ sung biểu đồ cho cả quý)
+
+        Args:
+            daily_stats (list): Danh sách dict gồm 'date' (datetime.date hoặc chuỗi YYYY-MM-DD),
+                'success_count' và 'failure_count'
+            max_workers (int, optional): Số tiến trình tối đa. Mặc định là số CPU.
+
+        Returns:
+            list: Đường dẫn file biểu đồ theo thứ tự đầu vào, None với biểu đồ bị lỗi
+        """
+        jobs = []
+        for stat in daily_stats:
+            date = stat['date']
+            if isinstance(date, str):
+                date = datetime.strptime(date, '%Y-%m-%d').date()
+
+            jobs.append(('daily', {
+                'date': date,
+                'success_count': stat['success_count'],
+                'failure_count': stat['failure_count']
+            }))
+
+        return self.render_batch(jobs, max_workers=max_workers)
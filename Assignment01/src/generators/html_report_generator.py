@@ -9,25 +9,37 @@ import os
 import logging
 import shutil
 from datetime import datetime
-import jinja2
+
+from .svg_chart_generator import SVGChartGenerator
+from .template_registry import get_template_environment
+
+# Các backend biểu đồ được hỗ trợ: 'png' nhúng ảnh do ChartGenerator tạo, 'svg' nhúng SVG trực tiếp
+CHART_BACKENDS = ('png', 'svg')
 
 class HTMLReportGenerator:
     """
     Lớp tạo báo cáo HTML từ dữ liệu
     """
 
-    def __init__(self):
+    def __init__(self, chart_backend='png', template_cache_dir=None):
         """
         Khởi tạo đối tượng HTMLReportGenerator
+
+        Args:
+            chart_backend (str, optional): 'png' dùng file biểu đồ được truyền vào qua chart_path,
+                'svg' dựng biểu đồ SVG nội tuyến từ dữ liệu báo cáo (không cần matplotlib). Mặc định là 'png'.
+            template_cache_dir (str, optional): Thư mục lưu bytecode của template (Settings.template_cache_dir)
         """
         self.logger = logging.getLogger(__name__)
 
-        # Tạo môi trường Jinja2 sử dụng thư mục templates
-        template_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
-        self.template_env = jinja2.Environment(
-            loader=jinja2.FileSystemLoader(searchpath=template_dir),
-            autoescape=jinja2.select_autoescape(['html', 'xml'])
-        )
+        if chart_backend not in CHART_BACKENDS:
+            raise ValueError(f"Backend biểu đồ không hợp lệ: {chart_backend}. Hỗ trợ: {', '.join(CHART_BACKENDS)}")
+        self.chart_backend = chart_backend
+        self.svg_chart_generator = SVGChartGenerator() if chart_backend == 'svg' else None
+
+        # Môi trường Jinja2 dùng chung trong tiến trình (template chỉ được biên dịch một lần)
+        self.template_env = get_template_environment(template_cache_dir)
+
     def generate_custom_report(self, title, sections, output_path, chart_path=None):
         """
         Tạo báo cáo HTML tùy chỉnh với các phần được cung cấp
@@ -74,133 +86,8 @@ class HTMLReportGenerator:
                 
                 data['chart_path'] = f"charts/{chart_filename}"
             
-            # Tạo template tùy chỉnh cho báo cáo
-            custom_template = """
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="UTF-8">
-                <title>{{ title }}</title>
-                <style>
-                    body {
-                        font-family: Arial, sans-serif;
-                        line-height: 1.6;
-                        margin: 20px;
-                        color: #333;
-                    }
-                    h1, h2, h3 {
-                        color: #2c3e50;
-                    }
-                    .container {
-                        max-width: 1200px;
-                        margin: 0 auto;
-                        padding: 20px;
-                        background: #f9f9f9;
-                        border-radius: 8px;
-                        box-shadow: 0 0 10px rgba(0,0,0,0.1);
-                    }
-                    .header {
-                        text-align: center;
-                        margin-bottom: 30px;
-                        padding-bottom: 20px;
-                        border-bottom: 1px solid #ddd;
-                    }
-                    .section {
-                        margin-bottom: 30px;
-                        padding: 15px;
-                        background: #fff;
-                        border-radius: 5px;
-                        box-shadow: 0 0 5px rgba(0,0,0,0.05);
-                    }
-                    .chart-container {
-                        margin: 30px 0;
-                        text-align: center;
-                    }
-                    .chart-container img {
-                        max-width: 100%;
-                        height: auto;
-                        border-radius: 5px;
-                        box-shadow: 0 0 10px rgba(0,0,0,0.1);
-                    }
-                    table {
-                        width: 100%;
-                        border-collapse: collapse;
-                        margin: 20px 0;
-                    }
-                    th, td {
-                        padding: 12px 15px;
-                        text-align: left;
-                        border-bottom: 1px solid #ddd;
-                    }
-                    th {
-                        background-color: #f2f2f2;
-                    }
-                    tr:hover {
-                        background-color: #f9f9f9;
-                    }
-                    footer {
-                        text-align: center;
-                        margin-top: 30px;
-                        color: #7f8c8d;
-                        font-size: 0.9em;
-                    }
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="header">
-                        <h1>{{ title }}</h1>
-                    </div>
-                    
-                    {% if chart_path is defined %}
-                    <div class="chart-container">
-                        <h2>Biểu đồ phân tích / Analytics Chart</h2>
-                        <img src="{{ chart_path }}" alt="Biểu đồ phân tích">
-                    </div>
-                    {% endif %}
-                    
-                    {% for section in sections %}
-                    <div class="section">
-                        <h2>{{ section.title }}</h2>
-                        
-                        {% if section.content %}
-                        <div class="content">
-                            {{ section.content|safe }}
-                        </div>
-                        {% endif %}
-                        
-                        {% if section.data_table %}
-                        <table>
-                            <thead>
-                                <tr>
-                                {% for header in section.data_table.headers %}
-                                    <th>{{ header }}</th>
-                                {% endfor %}
-                                </tr>
-                            </thead>
-                            <tbody>
-                                {% for row in section.data_table.rows %}
-                                <tr>
-                                    {% for cell in row %}
-                                    <td>{{ cell }}</td>
-                                    {% endfor %}
-                                </tr>
-                                {% endfor %}
-                            </tbody>
-                        </table>
-                        {% endif %}
-                    </div>
-                    {% endfor %}
-                    
-                    <footer>
-                        <p>Báo cáo được tạo tự động vào {{ timestamp }}</p>
-                    </footer>
-                </div>
-            </body>
-            </html>
-            """
-            
-            template = jinja2.Template(custom_template)
+            # Render template
+            template = self.template_env.get_template('custom_report.html')
             html_content = template.render(**data)
             
             # Ghi file HTML
@@ -221,7 +108,7 @@ class HTMLReportGenerator:
         Args:
             data (dict): Dữ liệu cho báo cáo
             output_path (str): Đường dẫn đến file đầu ra (HTML)
-            chart_path (str, optional): Đường dẫn đến biểu đồ
+            chart_path (str, optional): Đường dẫn đến biểu đồ (bỏ qua khi dùng backend 'svg')
 
         Returns:
             str: Đường dẫn đến file báo cáo HTML
@@ -241,7 +128,13 @@ class HTMLReportGenerator:
                 data['timestamp'] = datetime.now().strftime('%H:%M:%S %d/%m/%Y')
             
             # Xử lý biểu đồ nếu có
-            if chart_path:
+            if self.chart_backend == 'svg':
+                data['chart_svg'] = self.svg_chart_generator.generate_daily_chart(
+                    data['date'],
+                    data.get('success_count', 0),
+                    data.get('failure_count', 0)
+                )
+            elif chart_path:
                 # Copy biểu đồ vào thư mục charts (tạo nếu chưa có)
                 charts_dir = os.path.join(os.path.dirname(output_path), 'charts')
                 os.makedirs(charts_dir, exist_ok=True)
@@ -276,7 +169,7 @@ class HTMLReportGenerator:
         Args:
             data (dict): Dữ liệu cho báo cáo
             output_path (str): Đường dẫn đến file đầu ra (HTML)
-            chart_path (str, optional): Đường dẫn đến biểu đồ
+            chart_path (str, optional): Đường dẫn đến biểu đồ (bỏ qua khi dùng backend 'svg')
 
         Returns:
             str: Đường dẫn đến file báo cáo HTML
@@ -298,8 +191,17 @@ class HTMLReportGenerator:
             if 'timestamp' not in data:
                 data['timestamp'] = datetime.now().strftime('%H:%M:%S %d/%m/%Y')
             
+            # Mặc định trường daily_stats nếu chưa có
+            data.setdefault('daily_stats', [])
+            
             # Xử lý biểu đồ nếu có
-            if chart_path:
+            if self.chart_backend == 'svg':
+                data['chart_svg'] = self.svg_chart_generator.generate_weekly_chart(
+                    data['start_date'],
+                    data['end_date'],
+                    data['daily_stats']
+                )
+            elif chart_path:
                 # Copy biểu đồ vào thư mục charts (tạo nếu chưa có)
                 charts_dir = os.path.join(os.path.dirname(output_path), 'charts')
                 os.makedirs(charts_dir, exist_ok=True)
@@ -313,9 +215,6 @@ class HTMLReportGenerator:
                 
                 data['chart_filename'] = chart_filename
             
-            # Mặc định trường daily_stats nếu chưa có
-            data.setdefault('daily_stats', [])
-            
             # Render template
             template = self.template_env.get_template('weekly_report.html')
             html_content = template.render(**data)
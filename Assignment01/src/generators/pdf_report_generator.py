@@ -9,20 +9,105 @@ import os
 import logging
 import json
 from datetime import datetime
-import jinja2
+from itertools import chain, islice
+from xml.sax.saxutils import escape
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
 
+from .template_registry import get_template_environment
+
+# Số hàng log trong mỗi bảng: bảng nhỏ được chia trang nhanh và được giải phóng ngay sau khi vẽ
+LOG_TABLE_CHUNK_SIZE = 500
+
+# Style của bảng logs, dùng chung cho mọi phần bảng
+LOG_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+# Tiêu đề cột của bảng logs
+LOG_TABLE_HEADER = ["Thời gian", "ID", "Trạng thái", "Mô hình", "Định dạng"]
+
+# Độ dài tối đa của thông báo lỗi hiển thị trong báo cáo tóm tắt
+SUMMARY_MESSAGE_LENGTH = 90
+
+
+class _StreamingDocTemplate(SimpleDocTemplate):
+    """
+    SimpleDocTemplate dựng tài liệu từ một iterable flowable thay vì một danh sách đầy đủ
+
+    Danh sách truyền cho build() chỉ giữ vài flowable và được bổ sung từ iterator sau mỗi
+    lần handle_flowable (điểm mở rộng của BaseDocTemplate). Nhờ vậy chỉ vài bảng nhỏ nằm
+    trong bộ nhớ cùng lúc, bất kể tổng số hàng.
+    """
+
+    def __init__(self, filename, min_buffered=2, **kwargs):
+        """
+        Khởi tạo tài liệu
+
+        Args:
+            filename (str): Đường dẫn file PDF
+            min_buffered (int, optional): Số flowable tối thiểu được nạp sẵn. Mặc định là 2.
+            **kwargs: Tham số của SimpleDocTemplate
+        """
+        super().__init__(filename, **kwargs)
+        self._min_buffered = min_buffered
+        self._pending = iter(())
+        self._buffered = None
+
+    def build_streaming(self, flowables):
+        """
+        Dựng tài liệu từ các flowable theo thứ tự
+
+        Args:
+            flowables (iterable): Các flowable, có thể là generator
+        """
+        self._pending = iter(flowables)
+        self._buffered = []
+        self._refill(self._buffered)
+        try:
+            self.build(self._buffered)
+        finally:
+            self._buffered = None
+
+    def handle_flowable(self, flowables):
+        super().handle_flowable(flowables)
+        # handle_flowable cũng được gọi cho danh sách nội bộ (ví dụ các hành động đầu trang),
+        # chỉ bổ sung danh sách đang được dựng
+        if flowables is self._buffered:
+            self._refill(flowables)
+
+    def _refill(self, flowables):
+        """
+        Bổ sung danh sách từ iterator tới min_buffered phần tử
+
+        Args:
+            flowables (list): Danh sách flowable đang được dựng
+        """
+        while len(flowables) < self._min_buffered:
+            flowable = next(self._pending, None)
+            if flowable is None:
+                break
+            flowables.append(flowable)
+
+
 class PDFReportGenerator:
     """
     Lớp tạo báo cáo PDF từ dữ liệu sử dụng ReportLab
     """
 
-    def __init__(self):
+    def __init__(self, template_cache_dir=None):
         """
         Khởi tạo đối tượng PDFReportGenerator
+
+        Args:
+            template_cache_dir (str, optional): Thư mục lưu bytecode của template (Settings.template_cache_dir)
         """
         self.logger = logging.getLogger(__name__)
 
@@ -43,21 +128,86 @@ class PDFReportGenerator:
         )
         self.normal_style = self.styles['Normal']
         
-        # Tạo môi trường Jinja2 sử dụng thư mục templates (vẫn giữ lại để truy xuất dữ liệu templates)
-        template_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
-        self.template_env = jinja2.Environment(
-            loader=jinja2.FileSystemLoader(searchpath=template_dir),
-            autoescape=jinja2.select_autoescape(['html', 'xml'])
-        )
+        # Môi trường Jinja2 dùng chung trong tiến trình (vẫn giữ lại để truy xuất dữ liệu templates)
+        self.template_env = get_template_environment(template_cache_dir)
+
+    def _daily_stats_table(self, data):
+        """
+        Tạo bảng thống kê tổng quan của báo cáo hàng ngày
 
-    def generate_daily_report(self, data, output_path, chart_path=None):
+        Args:
+            data (dict): Dữ liệu cho báo cáo
+
+        Returns:
+            Table: Bảng thống kê
+        """
+        stats_data = [
+            ["Thông số", "Giá trị"],
+            ["Tổng số lượng", str(data.get('total_count', 0))],
+            ["Số lượng thành công", str(data.get('success_count', 0))],
+            ["Số lượng thất bại", str(data.get('failure_count', 0))],
+            ["Tỉ lệ thành công", f"{data.get('success_rate', 0):.1f}%"],
+            ["Tỉ lệ thất bại", f"{data.get('failure_rate', 0):.1f}%"]
+        ]
+
+        if data.get('avg_duration_ms') is not None:
+            stats_data.append(["Thời gian xử lý trung bình", f"{data['avg_duration_ms'] / 1000:.2f}s"])
+
+        stats_table = Table(stats_data, colWidths=[200, 200])
+        stats_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (1, 0), 'CENTER'),
+            ('FONTNAME', (0, 0), (1, 0), 'Helvetica-Bold'),
+            ('BOTTOMPADDING', (0, 0), (1, 0), 12),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+        return stats_table
+
+    def _log_table_chunks(self, log_rows, chunk_size):
+        """
+        Chia các hàng log thành nhiều bảng nhỏ, mỗi bảng lặp lại hàng tiêu đề
+
+        Args:
+            log_rows (iterator): Các hàng log (dict)
+            chunk_size (int): Số hàng mỗi bảng
+
+        Yields:
+            Table: Một phần của bảng logs
+        """
+        while True:
+            chunk = [
+                [
+                    log.get('timestamp', ''),
+                    log.get('id', ''),
+                    log.get('status', ''),
+                    log.get('model', ''),
+                    log.get('output_format', '')
+                ]
+                for log in islice(log_rows, chunk_size)
+            ]
+            if not chunk:
+                break
+
+            logs_table = Table([LOG_TABLE_HEADER] + chunk, colWidths=[100, 50, 80, 80, 80], repeatRows=1)
+            logs_table.setStyle(LOG_TABLE_STYLE)
+            yield logs_table
+
+    def generate_daily_report(self, data, output_path, chart_path=None, log_rows=None,
+                              chunk_size=LOG_TABLE_CHUNK_SIZE):
         """
         Tạo báo cáo hàng ngày và lưu vào file PDF
 
+        Bảng logs được chia thành các bảng nhỏ chunk_size hàng và được nạp dần trong lúc dựng PDF.
+        Khi truyền log_rows là một iterator (ví dụ DatabaseManager.iter_logs_by_date), các hàng
+        được đọc theo luồng nên bộ nhớ sử dụng không phụ thuộc số lượng log trong ngày.
+
         Args:
             data (dict): Dữ liệu cho báo cáo
             output_path (str): Đường dẫn đến file đầu ra (PDF)
             chart_path (str, optional): Đường dẫn đến biểu đồ
+            log_rows (iterable, optional): Các hàng log. Mặc định là data['logs'].
+            chunk_size (int, optional): Số hàng log trong mỗi bảng. Mặc định là LOG_TABLE_CHUNK_SIZE.
 
         Returns:
             str: Đường dẫn đến file báo cáo PDF
@@ -77,7 +227,7 @@ class PDFReportGenerator:
                 data['timestamp'] = datetime.now().strftime('%H:%M:%S %d/%m/%Y')
 
             # Tạo tài liệu PDF
-            doc = SimpleDocTemplate(output_path, pagesize=A4)
+            doc = _StreamingDocTemplate(output_path, pagesize=A4)
             elements = []
             
             # Tiêu đề báo cáo
@@ -88,25 +238,7 @@ class PDFReportGenerator:
             elements.append(Paragraph("Thông tin tổng quan", self.heading_style))
             
             # Bảng thống kê
-            stats_data = [
-                ["Thông số", "Giá trị"],
-                ["Tổng số lượng", str(data.get('total_count', 0))],
-                ["Số lượng thành công", str(data.get('success_count', 0))],
-                ["Số lượng thất bại", str(data.get('failure_count', 0))],
-                ["Tỉ lệ thành công", f"{data.get('success_rate', 0):.1f}%"],
-                ["Tỉ lệ thất bại", f"{data.get('failure_rate', 0):.1f}%"]
-            ]
-            
-            stats_table = Table(stats_data, colWidths=[200, 200])
-            stats_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (1, 0), 'CENTER'),
-                ('FONTNAME', (0, 0), (1, 0), 'Helvetica-Bold'),
-                ('BOTTOMPADDING', (0, 0), (1, 0), 12),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            elements.append(stats_table)
+            elements.append(self._daily_stats_table(data))
             elements.append(Spacer(1, 20))
             
             # Thêm biểu đồ nếu có
@@ -116,30 +248,110 @@ class PDFReportGenerator:
                 elements.append(chart_image)
                 elements.append(Spacer(1, 20))
             
-            # Chi tiết logs
-            if 'logs' in data and data['logs']:
+            # Chi tiết logs (chỉ thêm tiêu đề khi có ít nhất một hàng)
+            log_rows = iter((data.get('logs') or []) if log_rows is None else log_rows)
+            first_log = next(log_rows, None)
+            log_tables = []
+            if first_log is not None:
                 elements.append(Paragraph("Chi tiết logs", self.heading_style))
-                logs_data = [["Thời gian", "ID", "Trạng thái", "Mô hình", "Định dạng"]]
-                
-                for log in data['logs']:
-                    logs_data.append([
-                        log.get('timestamp', ''),
-                        log.get('id', ''),
-                        log.get('status', ''),
-                        log.get('model', ''),
-                        log.get('output_format', '')
+                log_tables = self._log_table_chunks(chain([first_log], log_rows), chunk_size)
+            
+            # Thông tin thời gian tạo báo cáo
+            footer = [
+                Spacer(1, 30),
+                Paragraph(f"Báo cáo được tạo vào: {data['timestamp']}", self.normal_style)
+            ]
+            
+            # Tạo file PDF, các bảng logs được tạo dần trong lúc dựng
+            doc.build_streaming(chain(elements, log_tables, footer))
+            self.logger.info(f"Báo cáo PDF hàng ngày đã được tạo: {output_path}")
+            return output_path
+        except Exception as e:
+            self.logger.error(f"Lỗi khi tạo báo cáo PDF hàng ngày: {str(e)}")
+            return None
+
+    def generate_daily_summary_report(self, data, output_path, chart_path=None):
+        """
+        Tạo báo cáo tóm tắt hàng ngày và lưu vào file PDF
+
+        Báo cáo chỉ gồm số liệu tổng hợp, các nhóm lỗi và một số lỗi tiêu biểu đã được
+        giới hạn sẵn bằng SQL, nên kích thước và thời gian tạo không phụ thuộc số lượng log.
+
+        Args:
+            data (dict): Dữ liệu cho báo cáo, ngoài các trường thống kê có thể gồm:
+                - failure_clusters: danh sách nhóm lỗi (signature, count, first_seen, last_seen)
+                - slowest_failures: danh sách lỗi chậm nhất
+                - recent_failures: danh sách lỗi gần nhất
+            output_path (str): Đường dẫn đến file đầu ra (PDF)
+            chart_path (str, optional): Đường dẫn đến biểu đồ
+
+        Returns:
+            str: Đường dẫn đến file báo cáo PDF
+        """
+        try:
+            # Đảm bảo đường dẫn có đuôi .pdf
+            if not output_path.lower().endswith('.pdf'):
+                output_path = f"{os.path.splitext(output_path)[0]}.pdf"
+            
+            # Đảm bảo thư mục đầu ra tồn tại
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            
+            # Thêm dữ liệu ngày và thời gian
+            if 'date' not in data:
+                data['date'] = datetime.now().strftime('%d/%m/%Y')
+            if 'timestamp' not in data:
+                data['timestamp'] = datetime.now().strftime('%H:%M:%S %d/%m/%Y')
+
+            # Tạo tài liệu PDF
+            doc = SimpleDocTemplate(output_path, pagesize=A4)
+            elements = []
+            
+            # Tiêu đề báo cáo
+            elements.append(Paragraph(f"Báo cáo tóm tắt hàng ngày - {data['date']}", self.title_style))
+            elements.append(Spacer(1, 20))
+            
+            # Thông tin tổng quan
+            elements.append(Paragraph("Thông tin tổng quan", self.heading_style))
+            elements.append(self._daily_stats_table(data))
+            elements.append(Spacer(1, 20))
+            
+            # Thêm biểu đồ nếu có
+            if chart_path and os.path.exists(chart_path):
+                elements.append(Paragraph("Biểu đồ phân tích", self.heading_style))
+                elements.append(Image(chart_path, width=400, height=300))
+                elements.append(Spacer(1, 20))
+            
+            # Nhóm lỗi theo thông báo lỗi đã chuẩn hóa
+            if data.get('failure_clusters'):
+                elements.append(Paragraph("Nhóm lỗi", self.heading_style))
+                clusters_data = [["Số lượng", "Lỗi", "Lần cuối"]]
+                for cluster in data['failure_clusters']:
+                    clusters_data.append([
+                        str(cluster.get('count', 0)),
+                        Paragraph(self._shorten(cluster.get('signature')), self.normal_style),
+                        str(cluster.get('last_seen', ''))[:19]
                     ])
+                elements.append(self._summary_table(clusters_data, [60, 290, 120]))
+                elements.append(Spacer(1, 20))
+            
+            # Các lỗi tiêu biểu
+            for key, heading in (('slowest_failures', "Lỗi có thời gian xử lý lâu nhất"),
+                                 ('recent_failures', "Lỗi gần nhất")):
+                if not data.get(key):
+                    continue
                 
-                logs_table = Table(logs_data, colWidths=[100, 50, 80, 80, 80])
-                logs_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
-                elements.append(logs_table)
+                elements.append(Paragraph(heading, self.heading_style))
+                failures_data = [["Thời gian", "ID", "Thời lượng", "Lỗi"]]
+                for failure in data[key]:
+                    duration_ms = failure.get('duration_ms')
+                    failures_data.append([
+                        str(failure.get('timestamp', ''))[:19],
+                        str(failure.get('item_id', '')),
+                        f"{duration_ms / 1000:.2f}s" if duration_ms is not None else "N/A",
+                        Paragraph(self._shorten(failure.get('error_message')), self.normal_style)
+                    ])
+                elements.append(self._summary_table(failures_data, [110, 70, 60, 230]))
+                elements.append(Spacer(1, 20))
             
             # Thông tin thời gian tạo báo cáo
             elements.append(Spacer(1, 30))
@@ -147,12 +359,50 @@ class PDFReportGenerator:
             
             # Tạo file PDF
             doc.build(elements)
-            self.logger.info(f"Báo cáo PDF hàng ngày đã được tạo: {output_path}")
+            self.logger.info(f"Báo cáo PDF tóm tắt hàng ngày đã được tạo: {output_path}")
             return output_path
         except Exception as e:
-            self.logger.error(f"Lỗi khi tạo báo cáo PDF hàng ngày: {str(e)}")
+            self.logger.error(f"Lỗi khi tạo báo cáo PDF tóm tắt hàng ngày: {str(e)}")
             return None
 
+    def _shorten(self, message):
+        """
+        Rút gọn và escape thông báo lỗi để hiển thị trong Paragraph
+
+        Args:
+            message (str): Thông báo lỗi
+
+        Returns:
+            str: Thông báo đã rút gọn
+        """
+        message = message or ''
+        if len(message) > SUMMARY_MESSAGE_LENGTH:
+            message = message[:SUMMARY_MESSAGE_LENGTH - 3] + '...'
+        return escape(message)
+
+    def _summary_table(self, table_data, col_widths):
+        """
+        Tạo bảng cho báo cáo tóm tắt
+
+        Args:
+            table_data (list): Dữ liệu bảng, hàng đầu là tiêu đề
+            col_widths (list): Độ rộng các cột
+
+        Returns:
+            Table: Bảng đã định dạng
+        """
+        table = Table(table_data, colWidths=col_widths, repeatRows=1)
+        table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+        return table
+
     def generate_weekly_report(self, data, output_path, chart_path=None):
         """
         Tạo báo cáo hàng tuần và lưu vào file PDF
@@ -227,11 +477,11 @@ class PDFReportGenerator:
                 elements.append(Spacer(1, 20))
             
             # Bảng dữ liệu theo ngày
-            if 'days' in data and data['days']:
+            if data.get('daily_stats'):
                 elements.append(Paragraph("Thống kê theo ngày", self.heading_style))
                 days_data = [["Ngày", "Tổng số", "Thành công", "Thất bại", "Tỉ lệ thành công"]]
                 
-                for day in data['days']:
+                for day in data['daily_stats']:
                     days_data.append([
                         day.get('date', ''),
                         str(day.get('total_count', 0)),
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module mô hình dữ liệu báo cáo
+
+Dữ liệu báo cáo được đọc từ cơ sở dữ liệu một lần vào các đối tượng bất biến,
+sau đó cùng một đối tượng được dùng cho mọi định dạng đầu ra (PDF, HTML, JSON/XML).
+Mỗi lần gọi as_dict() trả về một dict mới nên các generator có thể thêm khóa riêng
+(ví dụ chart_svg) mà không ảnh hưởng tới nhau.
+"""
+
+from dataclasses import dataclass, asdict, field
+from datetime import date, datetime
+from typing import Optional, Tuple
+
+# Định dạng thời điểm tạo báo cáo hiển thị trong các báo cáo
+TIMESTAMP_FORMAT = '%H:%M:%S %d/%m/%Y'
+
+
+def _rate(part, total):
+    """
+    Tính tỉ lệ phần trăm, trả về 0 khi tổng bằng 0
+    """
+    return (part / total) * 100 if total > 0 else 0
+
+
+@dataclass(frozen=True)
+class LogEntry:
+    """
+    Một hàng của bảng logs
+    """
+
+    id: int
+    item_id: str
+    description: Optional[str]
+    output_format: Optional[str]
+    model: Optional[str]
+    status: str
+    drive_url: Optional[str]
+    error_message: Optional[str]
+    timestamp: str
+    duration_ms: Optional[int] = None
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Tạo LogEntry từ một hàng sqlite3.Row hoặc dict
+
+        Args:
+            row (Mapping): Hàng của bảng logs
+
+        Returns:
+            LogEntry: Hàng log bất biến
+        """
+        return cls(**{name: row[name] for name in row.keys() if name in cls.__dataclass_fields__})
+
+
+@dataclass(frozen=True)
+class FailureCluster:
+    """
+    Nhóm các lỗi có cùng thông báo lỗi sau khi chuẩn hóa
+    """
+
+    signature: Optional[str]
+    count: int
+    first_seen: str
+    last_seen: str
+    sample_message: Optional[str]
+
+
+@dataclass(frozen=True)
+class DayStats:
+    """
+    Thống kê của một ngày trong báo cáo tuần
+    """
+
+    date: str
+    total_count: int
+    success_count: int
+    failure_count: int
+
+    @property
+    def success_rate(self):
+        return _rate(self.success_count, self.total_count)
+
+    @property
+    def failure_rate(self):
+        return _rate(self.failure_count, self.total_count)
+
+    def as_dict(self):
+        """
+        Chuyển thống kê ngày thành dict
+
+        Returns:
+            dict: Thống kê ngày kèm tỉ lệ thành công / thất bại
+        """
+        data = asdict(self)
+        data['success_rate'] = self.success_rate
+        data['failure_rate'] = self.failure_rate
+        return data
+
+
+@dataclass(frozen=True)
+class DailyReportData:
+    """
+    Dữ liệu của báo cáo hàng ngày
+    """
+
+    date: date
+    total_count: int
+    success_count: int
+    failure_count: int
+    avg_duration_ms: Optional[float] = None
+    # Các cặp (tên, số lượng), sắp xếp theo số lượng giảm dần
+    format_stats: Tuple[Tuple[str, int], ...] = ()
+    model_stats: Tuple[Tuple[str, int], ...] = ()
+    # Chỉ có ở chế độ 'full'
+    logs: Tuple[LogEntry, ...] = ()
+    # Chỉ có ở chế độ 'summary'
+    failure_clusters: Tuple[FailureCluster, ...] = ()
+    slowest_failures: Tuple[LogEntry, ...] = ()
+    recent_failures: Tuple[LogEntry, ...] = ()
+    generated_at: datetime = field(default_factory=datetime.now)
+
+    @property
+    def success_rate(self):
+        return _rate(self.success_count, self.total_count)
+
+    @property
+    def failure_rate(self):
+        return _rate(self.failure_count, self.total_count)
+
+    def iter_log_dicts(self):
+        """
+        Duyệt các hàng log dưới dạng dict
+
+        Yields:
+            dict: Một hàng log
+        """
+        for entry in self.logs:
+            yield asdict(entry)
+
+    def as_dict(self, include_logs=True):
+        """
+        Chuyển dữ liệu báo cáo thành dict dùng được cho template và xuất JSON/XML
+
+        Args:
+            include_logs (bool, optional): Có kèm danh sách logs hay không. Mặc định là True.
+
+        Returns:
+            dict: Dữ liệu báo cáo, ngày được định dạng YYYY-MM-DD
+        """
+        data = {
+            'date': self.date.strftime('%Y-%m-%d'),
+            'total_count': self.total_count,
+            'success_count': self.success_count,
+            'failure_count': self.failure_count,
+            'success_rate': self.success_rate,
+            'failure_rate': self.failure_rate,
+            'avg_duration_ms': self.avg_duration_ms,
+            'format_stats': dict(self.format_stats),
+            'model_stats': dict(self.model_stats),
+            'timestamp': self.generated_at.strftime(TIMESTAMP_FORMAT)
+        }
+
+        if include_logs:
+            data['logs'] = list(self.iter_log_dicts())
+
+        if self.failure_clusters:
+            data['failure_clusters'] = [asdict(cluster) for cluster in self.failure_clusters]
+        if self.slowest_failures:
+            data['slowest_failures'] = [asdict(entry) for entry in self.slowest_failures]
+        if self.recent_failures:
+            data['recent_failures'] = [asdict(entry) for entry in self.recent_failures]
+
+        return data
+
+
+@dataclass(frozen=True)
+class WeeklyReportData:
+    """
+    Dữ liệu của báo cáo hàng tuần
+    """
+
+    start_date: date
+    end_date: date
+    days: Tuple[DayStats, ...] = ()
+    generated_at: datetime = field(default_factory=datetime.now)
+
+    @property
+    def total_count(self):
+        return sum(day.total_count for day in self.days)
+
+    @property
+    def success_count(self):
+        return sum(day.success_count for day in self.days)
+
+    @property
+    def failure_count(self):
+        return sum(day.failure_count for day in self.days)
+
+    def as_dict(self):
+        """
+        Chuyển dữ liệu báo cáo thành dict dùng được cho template và xuất JSON/XML
+
+        Returns:
+            dict: Dữ liệu báo cáo gồm tổng hợp cả tuần (summary) và thống kê từng ngày (daily_stats)
+        """
+        return {
+            'start_date': self.start_date.strftime('%Y-%m-%d'),
+            'end_date': self.end_date.strftime('%Y-%m-%d'),
+            'summary': {
+                'total_count': self.total_count,
+                'success_count': self.success_count,
+                'failure_count': self.failure_count,
+                'success_rate': _rate(self.success_count, self.total_count),
+                'failure_rate': _rate(self.failure_count, self.total_count)
+            },
+            'daily_stats': [day.as_dict() for day in self.days],
+            'timestamp': self.generated_at.strftime(TIMESTAMP_FORMAT)
+        }
@@ -6,48 +6,238 @@ Module tạo báo cáo từ dữ liệu trong cơ sở dữ liệu
 """
 
 import os
+import re
 import logging
 from datetime import datetime, timedelta
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from .chart_generator import ChartGenerator
+from .html_report_generator import HTMLReportGenerator
 from .pdf_report_generator import PDFReportGenerator
+from .report_data import DailyReportData, DayStats, FailureCluster, LogEntry, WeeklyReportData
+
+# Các chế độ báo cáo hàng ngày: 'full' liệt kê mọi log, 'summary' chỉ gồm số liệu tổng hợp,
+# nhóm lỗi và N lỗi tiêu biểu nên thời gian tạo không phụ thuộc số lượng log trong ngày
+REPORT_MODES = ('full', 'summary')
+
+# Các định dạng báo cáo hàng ngày có thể tạo cùng lúc
+REPORT_FORMATS = ('pdf', 'html', 'json', 'xml')
+
+# Số nhóm lỗi / lỗi tiêu biểu mặc định trong báo cáo tóm tắt
+SUMMARY_TOP_N = 10
+
+# Độ dài tối đa của chữ ký lỗi sau khi chuẩn hóa
+ERROR_SIGNATURE_LENGTH = 200
+
+# Các mẫu thay thế khi chuẩn hóa thông báo lỗi, áp dụng theo thứ tự
+_ERROR_NORMALIZATION_PATTERNS = [
+    (re.compile(r'https?://\S+'), '<url>'),
+    (re.compile(r'\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b', re.IGNORECASE), '<uuid>'),
+    (re.compile(r'\b0x[0-9a-f]+\b|\b[0-9a-f]{16,}\b', re.IGNORECASE), '<hex>'),
+    (re.compile(r"'[^']*'|\"[^\"]*\""), '<str>'),
+    (re.compile(r'\d+(?:\.\d+)?'), '<n>'),
+    (re.compile(r'\s+'), ' '),
+]
+
+
+def normalize_error_message(message):
+    """
+    Chuẩn hóa thông báo lỗi để gom nhóm các lỗi cùng loại
+
+    Số, URL, UUID, mã hex và chuỗi trong dấu nháy được thay bằng ký hiệu chung, ví dụ
+    "Timeout after 30 seconds for request 42" -> "Timeout after <n> seconds for request <n>".
+
+    Args:
+        message (str): Thông báo lỗi
+
+    Returns:
+        str: Chữ ký lỗi, None nếu message là None
+    """
+    if message is None:
+        return None
+
+    for pattern, replacement in _ERROR_NORMALIZATION_PATTERNS:
+        message = pattern.sub(replacement, message)
+
+    return message.strip()[:ERROR_SIGNATURE_LENGTH]
+
+
+def _create_database_manager(db_path):
+    """
+    Tạo DatabaseManager cho db_path
+
+    generators được import như package cấp cao nhất khi chạy main.py và như src.generators
+    trong kiểm thử, nên persistence được import theo cả hai cách.
+
+    Args:
+        db_path (str): Đường dẫn đến file cơ sở dữ liệu
+
+    Returns:
+        DatabaseManager: Thể hiện của quản lý cơ sở dữ liệu
+    """
+    try:
+        from ..persistence import DatabaseManager
+    except ImportError:
+        from persistence import DatabaseManager
+    return DatabaseManager(db_path)
 
 class ReportGenerator:
     """
     Lớp tạo báo cáo từ dữ liệu trong cơ sở dữ liệu
     """
 
-    def __init__(self, db_path, output_dir):
+    def __init__(self, db_path, output_dir, chart_backend='png', template_cache_dir=None, db_manager=None):
         """
         Khởi tạo đối tượng ReportGenerator
 
         Args:
             db_path (str): Đường dẫn đến file cơ sở dữ liệu
             output_dir (str): Thư mục lưu báo cáo đầu ra
+            chart_backend (str, optional): Backend biểu đồ của báo cáo HTML ('png' hoặc 'svg').
+                Mặc định là 'png'.
+            template_cache_dir (str, optional): Thư mục lưu bytecode của template (Settings.template_cache_dir)
+            db_manager (DatabaseManager, optional): Quản lý cơ sở dữ liệu dùng để duyệt logs theo luồng.
+                Mặc định tạo mới từ db_path.
         """
         self.logger = logging.getLogger(__name__)
         self.db_path = db_path
         self.output_dir = output_dir
+        self.db_manager = db_manager if db_manager is not None else _create_database_manager(db_path)
 
         # Đảm bảo thư mục đầu ra tồn tại
         os.makedirs(output_dir, exist_ok=True)
 
-        # Khởi tạo các đối tượng tạo biểu đồ và PDF
+        # Khởi tạo các đối tượng tạo biểu đồ, PDF và HTML
         self.chart_generator = ChartGenerator(output_dir)
-        self.pdf_generator = PDFReportGenerator()
+        self.pdf_generator = PDFReportGenerator(template_cache_dir)
+        self.html_generator = HTMLReportGenerator(chart_backend, template_cache_dir)
+
+    def build_daily_report_data(self, date=None, mode='full', top_n=SUMMARY_TOP_N, include_logs=True):
+        """
+        Đọc dữ liệu báo cáo hàng ngày từ cơ sở dữ liệu một lần
+
+        Args:
+            date (datetime.date, optional): Ngày tạo báo cáo. Mặc định là hôm nay.
+            mode (str, optional): 'full' kèm mọi log, 'summary' kèm nhóm lỗi và top_n lỗi
+                chậm nhất / gần nhất. Mặc định là 'full'.
+            top_n (int, optional): Số nhóm lỗi và lỗi tiêu biểu trong chế độ 'summary'
+            include_logs (bool, optional): Ở chế độ 'full', có nạp mọi log vào bộ nhớ hay không.
+                Báo cáo PDF không cần vì đọc logs theo luồng từ con trỏ. Mặc định là True.
+
+        Returns:
+            DailyReportData: Dữ liệu báo cáo, None nếu không có dữ liệu
+
+        Raises:
+            ValueError: Nếu chế độ báo cáo không hợp lệ
+        """
+        if mode not in REPORT_MODES:
+            raise ValueError(f"Chế độ báo cáo không hợp lệ: {mode}. Hỗ trợ: {', '.join(REPORT_MODES)}")
+
+        # Nếu không có ngày được chỉ định, sử dụng ngày hôm nay
+        if date is None:
+            date = datetime.now().date()
+
+        daily_stats = self._fetch_daily_stats(date)
+
+        if not daily_stats:
+            return None
+
+        details = {}
+        if mode == 'full' and include_logs:
+            details['logs'] = tuple(LogEntry.from_row(row) for row in self._fetch_daily_logs(date))
+        elif mode == 'summary' and daily_stats['failure_count']:
+            details['failure_clusters'] = tuple(
+                FailureCluster(**cluster) for cluster in self._fetch_failure_clusters(date, top_n)
+            )
+            details['slowest_failures'] = tuple(
+                LogEntry.from_row(row) for row in self._fetch_top_failures(date, 'duration', top_n)
+            )
+            details['recent_failures'] = tuple(
+                LogEntry.from_row(row) for row in self._fetch_top_failures(date, 'recent', top_n)
+            )
+
+        return DailyReportData(
+            date=date,
+            total_count=daily_stats['total_count'],
+            success_count=daily_stats['success_count'],
+            failure_count=daily_stats['failure_count'],
+            avg_duration_ms=daily_stats['avg_duration_ms'],
+            format_stats=tuple(daily_stats['format_stats'].items()),
+            model_stats=tuple(daily_stats['model_stats'].items()),
+            **details
+        )
+
+    def build_weekly_report_data(self, end_date=None):
+        """
+        Đọc dữ liệu báo cáo hàng tuần từ cơ sở dữ liệu một lần
+
+        Args:
+            end_date (datetime.date, optional): Ngày kết thúc của tuần. Mặc định là hôm nay.
+
+        Returns:
+            WeeklyReportData: Dữ liệu báo cáo, None nếu không có dữ liệu
+        """
+        # Nếu không có ngày kết thúc được chỉ định, sử dụng ngày hôm nay
+        if end_date is None:
+            end_date = datetime.now().date()
+
+        # Tính ngày bắt đầu (7 ngày trước ngày kết thúc)
+        start_date = end_date - timedelta(days=6)
+
+        weekly_stats = self._fetch_date_range_stats(start_date, end_date)
+
+        if not weekly_stats:
+            return None
+
+        return WeeklyReportData(
+            start_date=start_date,
+            end_date=end_date,
+            days=tuple(
+                DayStats(
+                    date=day['date'],
+                    total_count=day['total_count'],
+                    success_count=day['success_count'],
+                    failure_count=day['failure_count']
+                )
+                for day in weekly_stats
+            )
+        )
 
-    def generate_daily_report(self, date=None):
+    def generate_daily_report(self, date=None, mode='full', top_n=SUMMARY_TOP_N, formats=None):
         """
         Tạo báo cáo hàng ngày
 
+        Khi truyền formats, dữ liệu được đọc một lần, biểu đồ được vẽ một lần và các định dạng
+        được tạo song song trong một thread pool, nên tổng thời gian xấp xỉ định dạng chậm nhất.
+
+        Ở chế độ 'full', báo cáo PDF đọc logs theo luồng từ con trỏ cơ sở dữ liệu nên bộ nhớ
+        không phụ thuộc số lượng log; logs chỉ được nạp vào bộ nhớ khi có định dạng HTML/JSON/XML.
+
         Args:
             date (datetime.date, optional): Ngày tạo báo cáo. Mặc định là hôm nay.
+            mode (str, optional): 'full' liệt kê mọi log, 'summary' chỉ gồm số liệu tổng hợp,
+                nhóm lỗi và top_n lỗi chậm nhất / gần nhất. Mặc định là 'full'.
+            top_n (int, optional): Số nhóm lỗi và lỗi tiêu biểu trong chế độ 'summary'
+            formats (list, optional): Các định dạng cần tạo trong REPORT_FORMATS.
+                Mặc định chỉ tạo báo cáo PDF.
 
         Returns:
-            str: Đường dẫn đến file báo cáo
+            str | dict: Đường dẫn đến file báo cáo PDF khi không truyền formats,
+                ngược lại là dict {định dạng: đường dẫn} (None với định dạng bị lỗi)
         """
+        if mode not in REPORT_MODES:
+            self.logger.error(f"Chế độ báo cáo không hợp lệ: {mode}. Hỗ trợ: {', '.join(REPORT_MODES)}")
+            return None
+
+        if formats is not None:
+            invalid_formats = [fmt for fmt in formats if fmt not in REPORT_FORMATS]
+            if invalid_formats or not formats:
+                self.logger.error(f"Định dạng báo cáo không hợp lệ: {invalid_formats or formats}. "
+                                  f"Hỗ trợ: {', '.join(REPORT_FORMATS)}")
+                return None
+
         try:
             # Nếu không có ngày được chỉ định, sử dụng ngày hôm nay
             if date is None:
@@ -55,43 +245,84 @@ class ReportGenerator:
 
             self.logger.info(f"Tạo báo cáo hàng ngày cho {date}")
 
-            # Lấy dữ liệu từ cơ sở dữ liệu
-            daily_logs = self._fetch_daily_logs(date)
-            daily_stats = self._fetch_daily_stats(date)
+            # Lấy dữ liệu từ cơ sở dữ liệu, chỉ nạp logs khi có định dạng khác PDF cần đến
+            requested_formats = formats or ['pdf']
+            include_logs = any(fmt != 'pdf' for fmt in requested_formats)
+            report_data = self.build_daily_report_data(date, mode, top_n, include_logs=include_logs)
 
-            if not daily_stats:
+            if report_data is None:
                 self.logger.warning(f"Không có dữ liệu để tạo báo cáo cho {date}")
                 self.logger.warning(f"No data to generate report for {date}")
                 return None
 
-            # Tạo biểu đồ thống kê
-            chart_path = self.chart_generator.generate_daily_chart(
-                date,
-                daily_stats['success_count'],
-                daily_stats['failure_count']
-            )
-
-            # Tạo báo cáo PDF
-            report_filename = f"report_{date.strftime('%Y%m%d')}.pdf"
-            report_path = os.path.join(self.output_dir, report_filename)
-
-            self.pdf_generator.generate_daily_report(
-                report_path,
-                date,
-                daily_stats,
-                daily_logs,
-                os.path.basename(chart_path)
-            )
-
-            self.logger.info(f"Đã tạo báo cáo hàng ngày: {report_path}")
-            self.logger.info(f"Daily report generated: {report_path}")
-
-            return report_path
+            # Chỉ vẽ biểu đồ PNG (matplotlib) khi có định dạng dùng đến: PDF, hoặc HTML với backend 'png'
+            chart_path = None
+            if 'pdf' in requested_formats or ('html' in requested_formats and
+                                               self.html_generator.chart_backend == 'png'):
+                chart_path = self.chart_generator.generate_daily_chart(
+                    date,
+                    report_data.success_count,
+                    report_data.failure_count
+                )
+
+            prefix = 'report_summary' if mode == 'summary' else 'report'
+            base_path = os.path.join(self.output_dir, f"{prefix}_{date.strftime('%Y%m%d')}")
+
+            if formats is None:
+                report_path = self._render_daily_format('pdf', report_data, mode, base_path, chart_path)
+                if report_path:
+                    self.logger.info(f"Đã tạo báo cáo hàng ngày: {report_path}")
+                    self.logger.info(f"Daily report generated: {report_path}")
+                return report_path
+
+            # Mỗi định dạng nhận bản dict riêng từ dữ liệu bất biến nên có thể chạy song song
+            formats = list(dict.fromkeys(formats))
+            with ThreadPoolExecutor(max_workers=len(formats)) as executor:
+                futures = {
+                    fmt: executor.submit(self._render_daily_format, fmt, report_data, mode, base_path, chart_path)
+                    for fmt in formats
+                }
+            report_paths = {fmt: future.result() for fmt, future in futures.items()}
+
+            self.logger.info(f"Đã tạo báo cáo hàng ngày: {report_paths}")
+            return report_paths
 
         except Exception as e:
             self.logger.error(f"Lỗi khi tạo báo cáo hàng ngày: {e}")
             return None
 
+    def _render_daily_format(self, fmt, report_data, mode, base_path, chart_path):
+        """
+        Tạo báo cáo hàng ngày ở một định dạng
+
+        Args:
+            fmt (str): Định dạng trong REPORT_FORMATS
+            report_data (DailyReportData): Dữ liệu báo cáo
+            mode (str): Chế độ báo cáo
+            base_path (str): Đường dẫn file đầu ra, chưa có đuôi
+            chart_path (str): Đường dẫn đến biểu đồ
+
+        Returns:
+            str: Đường dẫn đến file báo cáo, None nếu có lỗi
+        """
+        if fmt == 'pdf' and mode == 'summary':
+            return self.pdf_generator.generate_daily_summary_report(
+                report_data.as_dict(include_logs=False), f"{base_path}.pdf", chart_path)
+
+        if fmt == 'pdf':
+            # Dùng logs đã nạp cho các định dạng khác, nếu chưa nạp thì đọc theo luồng từ con trỏ
+            if report_data.logs:
+                log_rows = report_data.iter_log_dicts()
+            else:
+                log_rows = self.db_manager.iter_logs_by_date(report_data.date)
+            return self.pdf_generator.generate_daily_report(
+                report_data.as_dict(include_logs=False), f"{base_path}.pdf", chart_path, log_rows=log_rows)
+
+        if fmt == 'html':
+            return self.html_generator.generate_daily_report(report_data.as_dict(), f"{base_path}.html", chart_path)
+
+        return self.html_generator.export_data_to_file(report_data.as_dict(), f"{base_path}.{fmt}", fmt)
+
     def generate_weekly_report(self, end_date=None):
         """
         Tạo báo cáo hàng tuần
@@ -103,42 +334,35 @@ class ReportGenerator:
             str: Đường dẫn đến file báo cáo
         """
         try:
-            # Nếu không có ngày kết thúc được chỉ định, sử dụng ngày hôm nay
-            if end_date is None:
-                end_date = datetime.now().date()
+            # Lấy dữ liệu từ cơ sở dữ liệu
+            report_data = self.build_weekly_report_data(end_date)
 
-            # Tính ngày bắt đầu (7 ngày trước ngày kết thúc)
-            start_date = end_date - timedelta(days=6)
+            if report_data is None:
+                self.logger.warning(f"Không có dữ liệu để tạo báo cáo tuần kết thúc vào {end_date or 'hôm nay'}")
+                return None
 
+            start_date, end_date = report_data.start_date, report_data.end_date
             self.logger.info(f"Tạo báo cáo hàng tuần từ {start_date} đến {end_date}")
 
-            # Lấy dữ liệu từ cơ sở dữ liệu
-            weekly_stats = self._fetch_date_range_stats(start_date, end_date)
-
-            if not weekly_stats:
-                self.logger.warning(f"Không có dữ liệu để tạo báo cáo từ {start_date} đến {end_date}")
-                return None
+            data = report_data.as_dict()
 
             # Tạo biểu đồ thống kê
             chart_path = self.chart_generator.generate_weekly_chart(
                 start_date,
                 end_date,
-                weekly_stats
+                data['daily_stats']
             )
 
             # Tạo báo cáo PDF
             report_filename = f"weekly_report_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.pdf"
-            report_path = os.path.join(self.output_dir, report_filename)
-
-            self.pdf_generator.generate_weekly_report(
-                report_path,
-                start_date,
-                end_date,
-                weekly_stats,
-                os.path.basename(chart_path)
+            report_path = self.pdf_generator.generate_weekly_report(
+                data,
+                os.path.join(self.output_dir, report_filename),
+                chart_path
             )
 
-            self.logger.info(f"Đã tạo báo cáo hàng tuần: {report_path}")
+            if report_path:
+                self.logger.info(f"Đã tạo báo cáo hàng tuần: {report_path}")
 
             return report_path
 
@@ -156,29 +380,7 @@ class ReportGenerator:
         Returns:
             list: Danh sách logs
         """
-        try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-
-            # Chuyển đổi date thành chuỗi ngày
-            date_str = date.strftime('%Y-%m-%d')
-
-            cursor.execute('''
-            SELECT * FROM logs
-            WHERE date(timestamp) = date(?)
-            ORDER BY timestamp
-            ''', (date_str,))
-
-            rows = cursor.fetchall()
-            logs = [dict(row) for row in rows]
-
-            conn.close()
-            return logs
-
-        except Exception as e:
-            self.logger.error(f"Lỗi khi lấy logs hàng ngày: {e}")
-            return []
+        return list(self.db_manager.iter_logs_by_date(date))
 
     def _fetch_daily_stats(self, date):
         """
@@ -197,13 +399,17 @@ class ReportGenerator:
             # Chuyển đổi date thành chuỗi ngày
             date_str = date.strftime('%Y-%m-%d')
 
-            # Đếm tổng số mục
-            # Count total items
+            # Đếm tổng số mục, số lượng thành công và thất bại trong một lần quét
+            # Count total items, successes and failures in a single pass
             cursor.execute('''
-            SELECT COUNT(*) FROM logs
+            SELECT COUNT(*),
+                COALESCE(SUM(CASE WHEN status = 'success' THEN 1 ELSE 0 END), 0),
+                COALESCE(SUM(CASE WHEN status = 'failure' THEN 1 ELSE 0 END), 0),
+                AVG(duration_ms)
+            FROM logs
             WHERE date(timestamp) = date(?)
             ''', (date_str,))
-            total_count = cursor.fetchone()[0]
+            total_count, success_count, failure_count, avg_duration_ms = cursor.fetchone()
 
             # Nếu không có dữ liệu, trả về None
             # If no data, return None
@@ -211,22 +417,6 @@ class ReportGenerator:
                 conn.close()
                 return None
 
-            # Đếm số lượng thành công
-            # Count successes
-            cursor.execute('''
-            SELECT COUNT(*) FROM logs
-            WHERE date(timestamp) = date(?) AND status = 'success'
-            ''', (date_str,))
-            success_count = cursor.fetchone()[0]
-
-            # Đếm số lượng thất bại
-            # Count failures
-            cursor.execute('''
-            SELECT COUNT(*) FROM logs
-            WHERE date(timestamp) = date(?) AND status = 'failure'
-            ''', (date_str,))
-            failure_count = cursor.fetchone()[0]
-
             # Thống kê theo định dạng
             cursor.execute('''
             SELECT output_format, COUNT(*) as count
@@ -254,6 +444,7 @@ class ReportGenerator:
                 'failure_count': failure_count,
                 'success_rate': (success_count / total_count) * 100 if total_count > 0 else 0,
                 'failure_rate': (failure_count / total_count) * 100 if total_count > 0 else 0,
+                'avg_duration_ms': avg_duration_ms,
                 'format_stats': format_stats,
                 'model_stats': model_stats
             }
@@ -264,6 +455,85 @@ class ReportGenerator:
             self.logger.error(f"Lỗi khi lấy thống kê hàng ngày: {e}")
             return None
 
+    def _fetch_failure_clusters(self, date, limit=SUMMARY_TOP_N):
+        """
+        Gom nhóm các lỗi trong ngày theo thông báo lỗi đã chuẩn hóa
+
+        Args:
+            date (datetime.date): Ngày cần lấy dữ liệu
+            limit (int, optional): Số nhóm tối đa
+
+        Returns:
+            list: Danh sách nhóm lỗi (signature, count, first_seen, last_seen, sample_message),
+                sắp xếp theo số lượng giảm dần
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            conn.create_function('normalize_error', 1, normalize_error_message, deterministic=True)
+            cursor = conn.cursor()
+
+            cursor.execute('''
+            SELECT normalize_error(error_message) AS signature,
+                COUNT(*) AS count,
+                MIN(timestamp) AS first_seen,
+                MAX(timestamp) AS last_seen,
+                MAX(error_message) AS sample_message
+            FROM logs
+            WHERE date(timestamp) = date(?) AND status = 'failure'
+            GROUP BY signature
+            ORDER BY count DESC, last_seen DESC
+            LIMIT ?
+            ''', (date.strftime('%Y-%m-%d'), limit))
+
+            clusters = [dict(row) for row in cursor.fetchall()]
+
+            conn.close()
+            return clusters
+
+        except Exception as e:
+            self.logger.error(f"Lỗi khi gom nhóm lỗi: {e}")
+            return []
+
+    def _fetch_top_failures(self, date, order_by='duration', limit=SUMMARY_TOP_N):
+        """
+        Lấy các lỗi tiêu biểu trong ngày
+
+        Args:
+            date (datetime.date): Ngày cần lấy dữ liệu
+            order_by (str, optional): 'duration' (chậm nhất) hoặc 'recent' (gần nhất)
+            limit (int, optional): Số lỗi tối đa
+
+        Returns:
+            list: Danh sách lỗi
+        """
+        # Lỗi không có duration_ms (ghi trước khi có cột này) được xếp sau cùng
+        order_clauses = {
+            'duration': 'duration_ms IS NULL, duration_ms DESC, timestamp DESC',
+            'recent': 'timestamp DESC'
+        }
+
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+
+            cursor.execute(f'''
+            SELECT * FROM logs
+            WHERE date(timestamp) = date(?) AND status = 'failure'
+            ORDER BY {order_clauses[order_by]}
+            LIMIT ?
+            ''', (date.strftime('%Y-%m-%d'), limit))
+
+            failures = [dict(row) for row in cursor.fetchall()]
+
+            conn.close()
+            return failures
+
+        except Exception as e:
+            self.logger.error(f"Lỗi khi lấy các lỗi tiêu biểu: {e}")
+            return []
+
     def _fetch_date_range_stats(self, start_date, end_date):
         """
         Lấy thống kê theo khoảng ngày từ cơ sở dữ liệu
@@ -0,0 +1,305 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module tạo biểu đồ SVG nhúng trực tiếp vào báo cáo HTML
+
+Biểu đồ được dựng thành chuỗi SVG từ các dict thống kê mà không cần matplotlib,
+nên nhanh hơn nhiều và nhẹ hơn ảnh PNG khi gửi báo cáo qua email.
+"""
+
+import math
+import logging
+from datetime import datetime
+from html import escape
+
+# Màu sắc dùng chung với ChartGenerator
+SUCCESS_COLOR = '#2ecc71'
+FAILURE_COLOR = '#e74c3c'
+RATE_COLOR = '#3498db'
+OTHER_COLOR = '#95a5a6'
+FORMAT_COLORS = {
+    'png': '#3498db',
+    'jpg': '#2ecc71',
+    'gif': '#e67e22',
+    'mp3': '#9b59b6',
+}
+
+# Thuộc tính chung của phần tử <svg>
+SVG_FONT = 'font-family="Arial, sans-serif" font-size="12" fill="#333"'
+
+
+def _num(value):
+    """
+    Định dạng số ngắn gọn cho tọa độ SVG (tối đa 1 chữ số thập phân)
+    """
+    text = f"{value:.1f}"
+    return text[:-2] if text.endswith('.0') else text
+
+
+def _date_label(value):
+    """
+    Định dạng ngày cho tiêu đề, chấp nhận cả datetime.date và chuỗi đã định dạng sẵn
+    """
+    return value.strftime('%Y-%m-%d') if hasattr(value, 'strftime') else str(value)
+
+
+def _svg(width, height, title, body):
+    """
+    Bọc nội dung vào phần tử <svg> co giãn theo chiều rộng vùng chứa
+
+    Args:
+        width (int): Chiều rộng hệ tọa độ
+        height (int): Chiều cao hệ tọa độ
+        title (str): Tiêu đề cho trình đọc màn hình
+        body (list): Danh sách phần tử SVG
+
+    Returns:
+        str: Chuỗi SVG
+    """
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" '
+        f'width="100%" role="img" {SVG_FONT}><title>{escape(title)}</title>'
+        + ''.join(body) + '</svg>'
+    )
+
+
+def _pie(cx, cy, radius, values, colors):
+    """
+    Dựng các lát của biểu đồ tròn
+
+    Args:
+        cx (float): Tọa độ x tâm
+        cy (float): Tọa độ y tâm
+        radius (float): Bán kính
+        values (list): Giá trị của từng lát
+        colors (list): Màu của từng lát
+
+    Returns:
+        list: Danh sách phần tử SVG
+    """
+    total = sum(values)
+    non_zero = [(value, color) for value, color in zip(values, colors) if value > 0]
+
+    # Một lát chiếm toàn bộ: cung 360 độ không vẽ được bằng path nên dùng hình tròn
+    if len(non_zero) == 1:
+        return [f'<circle cx="{_num(cx)}" cy="{_num(cy)}" r="{_num(radius)}" fill="{non_zero[0][1]}"/>']
+
+    elements = []
+    angle = -math.pi / 2  # Bắt đầu từ đỉnh, giống startangle=90 của matplotlib
+    for value, color in non_zero:
+        sweep = 2 * math.pi * value / total
+        x1, y1 = cx + radius * math.cos(angle), cy + radius * math.sin(angle)
+        angle += sweep
+        x2, y2 = cx + radius * math.cos(angle), cy + radius * math.sin(angle)
+        large_arc = 1 if sweep > math.pi else 0
+        elements.append(
+            f'<path d="M{_num(cx)},{_num(cy)} L{_num(x1)},{_num(y1)} '
+            f'A{_num(radius)},{_num(radius)} 0 {large_arc} 1 {_num(x2)},{_num(y2)} Z" fill="{color}"/>'
+        )
+    return elements
+
+
+def _legend(x, y, entries):
+    """
+    Dựng chú thích dạng danh sách
+
+    Args:
+        x (float): Tọa độ x
+        y (float): Tọa độ y của dòng đầu
+        entries (list): Danh sách (nhãn, màu)
+
+    Returns:
+        list: Danh sách phần tử SVG
+    """
+    elements = []
+    for index, (label, color) in enumerate(entries):
+        row_y = y + index * 20
+        elements.append(f'<rect x="{_num(x)}" y="{_num(row_y - 10)}" width="12" height="12" fill="{color}"/>')
+        elements.append(f'<text x="{_num(x + 18)}" y="{_num(row_y)}">{escape(label)}</text>')
+    return elements
+
+
+class SVGChartGenerator:
+    """
+    Lớp tạo biểu đồ SVG cho báo cáo HTML, cùng giao diện với ChartGenerator
+    nhưng trả về chuỗi SVG thay vì đường dẫn file PNG
+    """
+
+    def __init__(self):
+        """
+        Khởi tạo đối tượng SVGChartGenerator
+        """
+        self.logger = logging.getLogger(__name__)
+
+    def generate_daily_chart(self, date, success_count, failure_count):
+        """
+        Tạo biểu đồ thống kê hàng ngày
+
+        Args:
+            date (datetime.date hoặc str): Ngày tạo biểu đồ
+            success_count (int): Số lượng thành công
+            failure_count (int): Số lượng thất bại
+
+        Returns:
+            str: Chuỗi SVG hoặc None nếu có lỗi
+        """
+        try:
+            date_str = _date_label(date)
+            counts = [success_count, failure_count]
+            colors = [SUCCESS_COLOR, FAILURE_COLOR]
+            labels = ['Thành công / Success', 'Thất bại / Failure']
+            total = sum(counts)
+
+            width, height = 720, 320
+            plot_top, plot_bottom = 50, 270
+            max_count = max(counts) or 1
+
+            body = [f'<text x="180" y="25" text-anchor="middle" font-size="16">Thống kê ngày: {date_str}</text>',
+                    f'<line x1="40" y1="{plot_bottom}" x2="330" y2="{plot_bottom}" stroke="#999"/>']
+
+            # Biểu đồ cột
+            for index, (count, color, label) in enumerate(zip(counts, colors, labels)):
+                bar_height = (plot_bottom - plot_top) * count / max_count
+                x = 70 + index * 140
+                y = plot_bottom - bar_height
+                body.append(f'<rect x="{x}" y="{_num(y)}" width="90" height="{_num(bar_height)}" fill="{color}"/>')
+                body.append(f'<text x="{x + 45}" y="{_num(y - 6)}" text-anchor="middle" '
+                            f'font-weight="bold">{count}</text>')
+                body.append(f'<text x="{x + 45}" y="{plot_bottom + 18}" text-anchor="middle">{escape(label)}</text>')
+
+            # Biểu đồ tròn
+            body.append(f'<text x="540" y="25" text-anchor="middle" font-size="16">Tỷ lệ %: {date_str}</text>')
+            if total > 0:
+                body.extend(_pie(480, 170, 110, counts, colors))
+                body.extend(_legend(605, 150, [
+                    (f"{label.split(' / ')[0]}: {count / total * 100:.1f}%", color)
+                    for label, count, color in zip(labels, counts, colors)
+                ]))
+            else:
+                body.append('<text x="540" y="170" text-anchor="middle" font-size="14">Không có dữ liệu</text>')
+
+            return _svg(width, height, f"Thống kê ngày {date_str}", body)
+
+        except Exception as e:
+            self.logger.error(f"Lỗi khi tạo biểu đồ SVG hàng ngày: {e}")
+            return None
+
+    def generate_weekly_chart(self, start_date, end_date, stats_data):
+        """
+        Tạo biểu đồ thống kê hàng tuần
+
+        Args:
+            start_date (datetime.date hoặc str): Ngày bắt đầu
+            end_date (datetime.date hoặc str): Ngày kết thúc
+            stats_data (list): Dữ liệu thống kê hàng ngày
+
+        Returns:
+            str: Chuỗi SVG hoặc None nếu không có dữ liệu hoặc có lỗi
+        """
+        try:
+            if not stats_data:
+                self.logger.warning(f"Không có dữ liệu để tạo biểu đồ SVG từ {start_date} đến {end_date}")
+                return None
+
+            title_period = f"{_date_label(start_date)} - {_date_label(end_date)}"
+
+            width = 720
+            left, right = 50, 700
+            count_top, count_bottom = 40, 220
+            rate_top, rate_bottom = 290, 430
+            height = 470
+
+            slot = (right - left) / len(stats_data)
+            bar_width = min(slot * 0.6, 60)
+            max_total = max(stat['success_count'] + stat['failure_count'] for stat in stats_data) or 1
+
+            body = [
+                f'<text x="{width / 2}" y="22" text-anchor="middle" font-size="16">'
+                f'Số lượng theo ngày: {escape(title_period)}</text>',
+                f'<line x1="{left}" y1="{count_bottom}" x2="{right}" y2="{count_bottom}" stroke="#999"/>',
+                f'<text x="{width / 2}" y="{rate_top - 18}" text-anchor="middle" font-size="16">'
+                f'Tỷ lệ thành công theo ngày: {escape(title_period)}</text>',
+                f'<line x1="{left}" y1="{rate_bottom}" x2="{right}" y2="{rate_bottom}" stroke="#999"/>',
+            ]
+
+            # Lưới tỷ lệ 0%, 50%, 100%
+            for rate in (0, 50, 100):
+                y = rate_bottom - (rate_bottom - rate_top) * rate / 100
+                body.append(f'<line x1="{left}" y1="{_num(y)}" x2="{right}" y2="{_num(y)}" '
+                            f'stroke="#ddd" stroke-dasharray="4 3"/>')
+                body.append(f'<text x="{left - 6}" y="{_num(y + 4)}" text-anchor="end">{rate}%</text>')
+
+            rate_points = []
+            for index, stat in enumerate(stats_data):
+                center = left + slot * (index + 0.5)
+                x = center - bar_width / 2
+                scale = (count_bottom - count_top) / max_total
+
+                # Cột chồng: thành công ở dưới, thất bại ở trên
+                success_height = stat['success_count'] * scale
+                failure_height = stat['failure_count'] * scale
+                success_y = count_bottom - success_height
+                failure_y = success_y - failure_height
+                body.append(f'<rect x="{_num(x)}" y="{_num(success_y)}" width="{_num(bar_width)}" '
+                            f'height="{_num(success_height)}" fill="{SUCCESS_COLOR}"/>')
+                body.append(f'<rect x="{_num(x)}" y="{_num(failure_y)}" width="{_num(bar_width)}" '
+                            f'height="{_num(failure_height)}" fill="{FAILURE_COLOR}"/>')
+                body.append(f'<text x="{_num(center)}" y="{_num(failure_y - 4)}" text-anchor="middle" font-size="10">'
+                            f'{stat["success_count"] + stat["failure_count"]}</text>')
+
+                date_label = escape(str(stat['date'])[5:])
+                body.append(f'<text x="{_num(center)}" y="{count_bottom + 15}" text-anchor="middle" '
+                            f'font-size="10">{date_label}</text>')
+                body.append(f'<text x="{_num(center)}" y="{rate_bottom + 15}" text-anchor="middle" '
+                            f'font-size="10">{date_label}</text>')
+
+                rate_y = rate_bottom - (rate_bottom - rate_top) * stat['success_rate'] / 100
+                rate_points.append((center, rate_y))
+
+            # Đường tỷ lệ thành công
+            body.append(f'<polyline fill="none" stroke="{RATE_COLOR}" stroke-width="2" points="'
+                        + ' '.join(f"{_num(x)},{_num(y)}" for x, y in rate_points) + '"/>')
+            body.extend(f'<circle cx="{_num(x)}" cy="{_num(y)}" r="4" fill="{RATE_COLOR}"/>' for x, y in rate_points)
+
+            body.extend(_legend(right - 110, count_top + 5, [('Thành công', SUCCESS_COLOR), ('Thất bại', FAILURE_COLOR)]))
+
+            return _svg(width, height, f"Thống kê tuần {title_period}", body)
+
+        except Exception as e:
+            self.logger.error(f"Lỗi khi tạo biểu đồ SVG hàng tuần: {e}")
+            return None
+
+    def generate_format_distribution_chart(self, stats_data):
+        """
+        Tạo biểu đồ phân phối theo định dạng đầu ra
+
+        Args:
+            stats_data (dict): Dữ liệu thống kê theo định dạng
+
+        Returns:
+            str: Chuỗi SVG hoặc None nếu không có dữ liệu hoặc có lỗi
+        """
+        try:
+            if not stats_data or not stats_data.get('format_stats'):
+                self.logger.warning("Không có dữ liệu định dạng để tạo biểu đồ SVG")
+                return None
+
+            format_stats = stats_data['format_stats']
+            formats = list(format_stats.keys())
+            counts = list(format_stats.values())
+            colors = [FORMAT_COLORS.get(fmt, OTHER_COLOR) for fmt in formats]
+            total = sum(counts)
+
+            body = ['<text x="250" y="25" text-anchor="middle" font-size="16">Phân phối định dạng đầu ra</text>']
+            body.extend(_pie(180, 170, 120, counts, colors))
+            body.extend(_legend(330, 120, [
+                (f"{fmt}: {count / total * 100:.1f}%" if total else fmt, color)
+                for fmt, count, color in zip(formats, counts, colors)
+            ]))
+
+            return _svg(500, 310, f"Phân phối định dạng {datetime.now().strftime('%Y-%m-%d')}", body)
+
+        except Exception as e:
+            self.logger.error(f"Lỗi khi tạo biểu đồ SVG phân phối định dạng: {e}")
+            return None
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module quản lý template Jinja2 dùng chung cho các báo cáo
+
+Môi trường Jinja2 được tạo một lần cho mỗi tiến trình (và mỗi thư mục bộ nhớ đệm) nên mỗi
+template chỉ được biên dịch một lần. Mã đã biên dịch còn được lưu trên đĩa (FileSystemBytecodeCache) để các tiến trình
+sau bỏ qua bước phân tích và biên dịch.
+"""
+
+import os
+import logging
+from functools import lru_cache
+
+import jinja2
+
+# Thư mục chứa các template báo cáo
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def get_template_environment(cache_dir=None):
+    """
+    Lấy môi trường Jinja2 dùng chung cho các báo cáo
+
+    Template không được kiểm tra thay đổi sau lần nạp đầu tiên (auto_reload=False),
+    nên cần khởi động lại tiến trình khi sửa template.
+
+    Args:
+        cache_dir (str, optional): Thư mục lưu bytecode của template (Settings.template_cache_dir).
+            Mặc định dùng thư mục tạm riêng của người dùng do Jinja2 chọn.
+
+    Returns:
+        jinja2.Environment: Môi trường Jinja2
+    """
+    bytecode_cache = None
+    try:
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        bytecode_cache = jinja2.FileSystemBytecodeCache(cache_dir)
+    except OSError as e:
+        logger.warning(f"Không thể dùng bộ nhớ đệm bytecode cho template: {e}")
+
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(searchpath=TEMPLATE_DIR),
+        autoescape=jinja2.select_autoescape(['html', 'xml']),
+        bytecode_cache=bytecode_cache,
+        auto_reload=False
+    )
+
+
+def get_template(name, cache_dir=None):
+    """
+    Lấy template đã biên dịch theo tên
+
+    Args:
+        name (str): Tên file template trong TEMPLATE_DIR
+        cache_dir (str, optional): Thư mục lưu bytecode của template
+
+    Returns:
+        jinja2.Template: Template đã biên dịch
+    """
+    return get_template_environment(cache_dir).get_template(name)
@@ -3,7 +3,27 @@
 
 """
 Package initialization for integrations with external services
+
+Các lớp được import lười: module con (cùng googleapiclient) chỉ được tải
+khi lớp được truy cập lần đầu.
 """
 
-from .sheets_reader import GoogleSheetsReader
-from .drive_uploader import GoogleDriveUploader
+import importlib
+
+# Ánh xạ tên lớp -> module con chứa lớp đó
+_LAZY_EXPORTS = {
+    'GoogleSheetsReader': 'sheets_reader',
+    'GoogleDriveUploader': 'drive_uploader',
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
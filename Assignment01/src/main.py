@@ -9,28 +9,37 @@ import os
 import sys
 import logging
 import argparse
+import time
 from datetime import datetime
 from pathlib import Path
 
 # Thêm thư mục gốc vào đường dẫn để import config
 sys.path.append(str(Path(__file__).parent.parent))
 
+# Với --import-report, bộ đo thời gian import được cài trước các import bên dưới để đo cả chúng
+# (notifications -> requests, persistence...)
+from monitoring import ImportTimer
+_import_timer = ImportTimer().install() if '--import-report' in sys.argv[1:] else None
+
 # Import các module tự tạo
-from integrations import GoogleSheetsReader, GoogleDriveUploader
+# integrations và generators được import lười: SDK nặng (googleapiclient, openai, matplotlib, reportlab...)
+# chỉ được tải khi bước tương ứng chạy lần đầu
+import integrations
+import generators
 from notifications import EmailNotifier, SlackNotifier
 from persistence import DatabaseManager
-from generators import ReportGenerator, AIGenerator
+from monitoring import MetricsRegistry, NULL_METRICS, TextfileExporter
 import config
 
-# Đảm bảo dotenv được tải trước khi import config
-from dotenv import load_dotenv
-
-def setup_logging():
+def setup_logging(log_dir=None):
     """
     Thiết lập logging cho ứng dụng
+
+    Args:
+        log_dir (str, optional): Thư mục lưu file log. Mặc định là config.DEFAULT_LOG_DIR.
     """
-    log_dir = Path(config.LOG_DIR)
-    log_dir.mkdir(exist_ok=True)
+    log_dir = Path(log_dir or config.DEFAULT_LOG_DIR)
+    log_dir.mkdir(parents=True, exist_ok=True)
 
     log_file = log_dir / f"automation_{datetime.now().strftime('%Y%m%d')}.log"
 
@@ -56,36 +65,64 @@ def parse_arguments():
     parser.add_argument('--anthropic-key', help='Khóas API Anthropic')
     parser.add_argument('--skip-google-auth', action='store_true', help='Bỏ qua kiểm tra xác thực Google (chỉ dùng cho debug)')
     parser.add_argument('--debug', action='store_true', help='Chạy ở chế độ debug, bỏ qua một số kiểm tra')
+    parser.add_argument('--import-report', action='store_true', help='Ghi log thời gian import các thư viện nặng khi chạy (tương tự python -X importtime)')
+    parser.add_argument('--report-mode', choices=['full', 'summary'], default='full',
+                        help="Chế độ báo cáo hàng ngày: 'full' liệt kê mọi log, 'summary' chỉ gồm số liệu tổng hợp và các lỗi tiêu biểu")
+    parser.add_argument('--report-formats', nargs='+', choices=['pdf', 'html', 'json', 'xml'],
+                        help='Tạo báo cáo hàng ngày ở nhiều định dạng cùng lúc (mặc định chỉ PDF)')
+    parser.add_argument('--chart-backend', choices=['png', 'svg'],
+                        help="Backend biểu đồ của báo cáo HTML: 'svg' nhúng SVG trực tiếp, không cần vẽ PNG bằng matplotlib")
+    parser.add_argument('--metrics-file', help='Đường dẫn file .prom để xuất metric cho textfile collector của node_exporter')
     return parser.parse_args()
 
-def process_item(item, db_manager, drive_uploader, email_notifier, slack_notifier, logger, debug_mode=False):
+def process_item(item, settings, db_manager, drive_uploader, email_notifier, slack_notifier, logger, debug_mode=False, metrics=None):
     """
     Xử lý một mục từ Google Sheet và tạo nội dung
 
     Args:
         item (dict): Dữ liệu mục từ Google Sheet
+        settings (config.Settings): Cấu hình của quy trình
         db_manager (DatabaseManager): Thể hiện của quản lý cơ sở dữ liệu
         drive_uploader (GoogleDriveUploader): Thể hiện của trình tải lên Drive
         email_notifier (EmailNotifier): Thể hiện của thông báo email
         slack_notifier (SlackNotifier): Thể hiện của thông báo Slack
         logger (Logger): Thể hiện của logger
         debug_mode (bool): Chế độ debug, bỏ qua một số kiểm tra và sử dụng giả lập
+        metrics (MetricsRegistry, optional): Registry đo lường. Mặc định là registry rỗng không đo đạc.
+
+    Returns:
+        bool: Thành công hoặc thất bại
+    """
+    metrics = metrics or NULL_METRICS
+    items_counter = metrics.counter("pipeline_items_total", "Số mục đã xử lý theo trạng thái")
+
+    with metrics.span("process_item"):
+        success = _process_item_stages(item, settings, db_manager, drive_uploader, email_notifier, slack_notifier, logger, debug_mode, metrics)
+
+    items_counter.inc(status='success' if success else 'failure')
+    return success
+
+def _process_item_stages(item, settings, db_manager, drive_uploader, email_notifier, slack_notifier, logger, debug_mode, metrics):
+    """
+    Thực hiện các bước xử lý của một mục, đo thời gian từng bước qua metrics
 
     Returns:
         bool: Thành công hoặc thất bại
     """
+    start_time = time.perf_counter()
+
     try:
         logger.info(f"Xử lý mục: {item['id']} - {item['description']}")
 
         # Tạo nội dung bằng AI
-        if not config.AI_API_KEY and not debug_mode:
+        if not settings.ai_api_key and not debug_mode:
             raise Exception("Không có khóa API AI. Vui lòng thiết lập OPENAI_API_KEY hoặc ANTHROPIC_API_KEY trong tệp .env")
 
         if debug_mode:
             # Tạo giả lập đầu ra trong chế độ debug
             logger.warning("Chế độ debug: Giả lập tạo nội dung AI")
-            temp_dir = Path(config.DATA_DIR) / "temp"
-            temp_dir.mkdir(exist_ok=True)
+            temp_dir = Path(settings.data_dir) / "temp"
+            temp_dir.mkdir(parents=True, exist_ok=True)
             output_file = temp_dir / f"debug_output_{item['id']}.{item['output_format'].lower()}"
             
             # Tạo file giả lập trống
@@ -93,32 +130,38 @@ def process_item(item, db_manager, drive_uploader, email_notifier, slack_notifie
                 f.write(f"Dữ liệu giả lập cho {item['description']}")
         else:
             # Sử dụng AIGenerator thực tế
-            ai_generator = AIGenerator(config.AI_API_KEY, service=config.AI_SERVICE)
-            output_file = ai_generator.generate(
-                description=item['description'],
-                reference_url=item.get('example_asset_url'),
-                output_format=item['output_format'],
-                model=item['model']
-            )
+            with metrics.span("ai_generate", model=item['model']):
+                ai_generator = generators.AIGenerator(settings.ai_api_key, service=settings.ai_service)
+                output_file = ai_generator.generate(
+                    description=item['description'],
+                    reference_url=item.get('example_asset_url'),
+                    output_format=item['output_format'],
+                    model=item['model']
+                )
 
         if not output_file:
             raise Exception("Không thể tạo nội dung")
 
         # Tải lên Google Drive
-        drive_url = drive_uploader.upload(output_file, item['description'])
+        with metrics.span("drive_upload"):
+            drive_url = drive_uploader.upload(output_file, item['description'])
 
         # Lưu vào cơ sở dữ liệu
-        db_manager.log_success(
-            item_id=item['id'],
-            description=item['description'],
-            output_format=item['output_format'],
-            model=item['model'],
-            drive_url=drive_url
-        )
+        with metrics.span("db_write", status='success'):
+            db_manager.log_success(
+                item_id=item['id'],
+                description=item['description'],
+                output_format=item['output_format'],
+                model=item['model'],
+                drive_url=drive_url,
+                duration_ms=int((time.perf_counter() - start_time) * 1000)
+            )
 
         # Gửi thông báo thành công
-        email_notifier.send_success_notification(item, drive_url)
-        slack_notifier.send_success_notification(item, drive_url)
+        with metrics.span("notify_email"):
+            email_notifier.send_success_notification(item, drive_url)
+        with metrics.span("notify_slack"):
+            slack_notifier.send_success_notification(item, drive_url)
 
         logger.info(f"Xử lý thành công mục: {item['id']}")
         return True
@@ -127,63 +170,81 @@ def process_item(item, db_manager, drive_uploader, email_notifier, slack_notifie
         logger.error(f"Lỗi khi xử lý mục {item['id']}: {str(e)}")
 
         # Lưu vào cơ sở dữ liệu
-        db_manager.log_failure(
-            item_id=item['id'],
-            description=item['description'],
-            output_format=item['output_format'],
-            model=item['model'],
-            error_message=str(e)
-        )
+        with metrics.span("db_write", status='failure'):
+            db_manager.log_failure(
+                item_id=item['id'],
+                description=item['description'],
+                output_format=item['output_format'],
+                model=item['model'],
+                error_message=str(e),
+                duration_ms=int((time.perf_counter() - start_time) * 1000)
+            )
 
         # Gửi thông báo lỗi
-        email_notifier.send_failure_notification(item, str(e))
-        slack_notifier.send_failure_notification(item, str(e))
+        with metrics.span("notify_email"):
+            email_notifier.send_failure_notification(item, str(e))
+        with metrics.span("notify_slack"):
+            slack_notifier.send_failure_notification(item, str(e))
         return False
 
 def main():
     """
     Hàm chính của ứng dụng
     """
+    # Phân tích đối số
+    args = parse_arguments()
+
     # Thiết lập logging
     logger = setup_logging()
     logger.info("Bắt đầu quy trình tự động hóa")
 
-    # Phân tích đối số
-    args = parse_arguments()
-
-    # Tải tệp môi trường tùy chỉnh nếu được chỉ định
-    if args.env:
-        env_path = Path(args.env)
-        if env_path.exists():
-            logger.info(f"Đang tải môi trường từ {env_path}")
-            load_dotenv(env_path, override=True)
-        else:
-            logger.error(f"Không tìm thấy tệp môi trường: {env_path}")
+    import_timer = (_import_timer or ImportTimer()).install() if args.import_report else None
+    try:
+        # Dựng cấu hình một lần và truyền tường minh cho các thành phần
+        try:
+            settings = config.load_settings(env_file=args.env)
+        except FileNotFoundError as e:
+            logger.error(str(e))
             return
-    # Nếu không, chúng ta dựa vào config.py đã tải .env.local trước đó
-
-    # Ghi đè các khóa API từ dòng lệnh nếu được cung cấp
-    if args.openai_key:
-        os.environ["OPENAI_API_KEY"] = args.openai_key
-        config.OPENAI_API_KEY = args.openai_key
-        config.AI_API_KEY = args.openai_key
-        config.AI_SERVICE = "openai"
-    elif args.anthropic_key:
-        os.environ["ANTHROPIC_API_KEY"] = args.anthropic_key
-        config.ANTHROPIC_API_KEY = args.anthropic_key
-        config.AI_API_KEY = args.anthropic_key
-        config.AI_SERVICE = "anthropic"
 
+        # Ghi đè các khóa API từ dòng lệnh nếu được cung cấp
+        if args.openai_key:
+            settings = settings.with_overrides(openai_api_key=args.openai_key, preferred_ai_service="openai")
+        elif args.anthropic_key:
+            settings = settings.with_overrides(anthropic_api_key=args.anthropic_key, preferred_ai_service="anthropic")
+        settings = settings.with_overrides(report_chart_backend=args.chart_backend)
+
+        for warning in settings.validate():
+            logger.warning(warning)
+
+        settings.ensure_directories()
+        run_pipeline(args, settings, logger)
+    finally:
+        if import_timer:
+            import_timer.uninstall()
+            logger.info("Thời gian import các module (tích lũy | riêng):")
+            for line in import_timer.report():
+                logger.info(line)
+
+def run_pipeline(args, settings, logger):
+    """
+    Chạy quy trình tự động hóa với các đối số đã phân tích
+
+    Args:
+        args (argparse.Namespace): Đối số dòng lệnh
+        settings (config.Settings): Cấu hình của quy trình
+        logger (Logger): Thể hiện của logger
+    """
     # Đọc dữ liệu từ Google Sheets
-    sheet_id = args.sheet_id or config.GOOGLE_SHEET_ID
+    sheet_id = args.sheet_id or settings.google_sheet_id
 
     if not sheet_id:
         logger.error("Không có Google Sheet ID được cung cấp. Vui lòng đặt GOOGLE_SHEET_ID trong .env hoặc sử dụng --sheet-id")
         return
 
     # Kiểm tra xác thực Google tồn tại, trừ khi được bỏ qua trong chế độ debug
-    if not os.path.exists(config.GOOGLE_CREDENTIALS_FILE) and not (args.skip_google_auth or args.debug):
-        logger.error(f"Không tìm thấy tệp xác thực Google: {config.GOOGLE_CREDENTIALS_FILE}")
+    if not os.path.exists(settings.google_credentials_file) and not (args.skip_google_auth or args.debug):
+        logger.error(f"Không tìm thấy tệp xác thực Google: {settings.google_credentials_file}")
         logger.error("Vui lòng đặt tệp xác thực của bạn trong thư mục dữ liệu")
         logger.error("Hoặc chạy với cờ --skip-google-auth hoặc --debug để bỏ qua kiểm tra này")
         return
@@ -202,7 +263,7 @@ def main():
         ]
     else:
         # Đọc dữ liệu thực tế từ Google Sheets
-        sheets_reader = GoogleSheetsReader(config.GOOGLE_CREDENTIALS_FILE)
+        sheets_reader = integrations.GoogleSheetsReader(settings.google_credentials_file)
         items = sheets_reader.read_sheet(sheet_id)
 
     if not items:
@@ -210,10 +271,10 @@ def main():
         return
 
     # Khởi tạo các thành phần
-    db_manager = DatabaseManager(config.DATABASE_PATH)
+    db_manager = DatabaseManager(settings.database_path)
 
     # Kiểm tra ID thư mục Google Drive
-    if not config.DRIVE_FOLDER_ID and not (args.skip_google_auth or args.debug):
+    if not settings.drive_folder_id and not (args.skip_google_auth or args.debug):
         logger.error("Không có ID thư mục Google Drive được cung cấp. Vui lòng đặt GOOGLE_DRIVE_FOLDER_ID trong .env")
         return
 
@@ -227,30 +288,20 @@ def main():
         drive_uploader = DebugDriveUploader()
         logger.warning("Chế độ debug: Sử dụng trình tải lên Drive giả lập")
     else:
-        drive_uploader = GoogleDriveUploader(config.GOOGLE_CREDENTIALS_FILE, config.DRIVE_FOLDER_ID)
-
-    # Kiểm tra cấu hình email
-    if not all([
-        config.EMAIL_CONFIG["sender_email"],
-        config.EMAIL_CONFIG["sender_password"],
-        config.EMAIL_CONFIG["admin_email"]
-    ]):
-        logger.warning("Cấu hình email không đầy đủ. Thông báo email sẽ không hoạt động đúng.")
+        drive_uploader = integrations.GoogleDriveUploader(settings.google_credentials_file, settings.drive_folder_id)
 
-    email_notifier = EmailNotifier(config.EMAIL_CONFIG)
+    email_notifier = EmailNotifier(settings.email.as_dict())
+    slack_notifier = SlackNotifier(settings.slack_webhook_url)
 
-    # Kiểm tra URL webhook Slack
-    if not config.SLACK_WEBHOOK_URL:
-        logger.warning("URL webhook Slack không được cung cấp. Thông báo Slack sẽ không hoạt động.")
-
-    slack_notifier = SlackNotifier(config.SLACK_WEBHOOK_URL)
+    # Khởi tạo registry đo lường nếu cần xuất metric, nếu không dùng registry rỗng
+    metrics = MetricsRegistry() if args.metrics_file else NULL_METRICS
 
     # Xử lý từng mục
     success_count = 0
     failure_count = 0
 
     for item in items:
-        success = process_item(item, db_manager, drive_uploader, email_notifier, slack_notifier, logger, debug_mode=(args.skip_google_auth or args.debug))
+        success = process_item(item, settings, db_manager, drive_uploader, email_notifier, slack_notifier, logger, debug_mode=(args.skip_google_auth or args.debug), metrics=metrics)
         if success:
             success_count += 1
         else:
@@ -259,15 +310,30 @@ def main():
     # Tạo báo cáo hàng ngày
     logger.info("Tạo báo cáo hàng ngày")
 
-    report_generator = ReportGenerator(config.DATABASE_PATH, config.REPORT_OUTPUT_DIR)
-    report_path = report_generator.generate_daily_report()
+    with metrics.span("daily_report"):
+        report_generator = generators.ReportGenerator(settings.database_path, settings.report_output_dir,
+                                                      chart_backend=settings.report_chart_backend,
+                                                      template_cache_dir=settings.template_cache_dir,
+                                                      db_manager=db_manager)
+        if args.report_formats:
+            report_paths = report_generator.generate_daily_report(mode=args.report_mode,
+                                                                  formats=args.report_formats) or {}
+            # Email đính kèm PDF nếu có, ngược lại là định dạng đầu tiên tạo được
+            report_path = report_paths.get('pdf') or next(filter(None, report_paths.values()), None)
+        else:
+            report_path = report_generator.generate_daily_report(mode=args.report_mode)
 
     # Gửi báo cáo qua email
-    email_notifier.send_report(
-        report_path,
-        success_count,
-        failure_count
-    )
+    with metrics.span("notify_report"):
+        email_notifier.send_report(
+            report_path,
+            success_count,
+            failure_count
+        )
+
+    # Xuất metric cho node_exporter nếu được yêu cầu
+    if args.metrics_file:
+        TextfileExporter(args.metrics_file).export(metrics)
 
     logger.info("Hoàn thành quy trình tự động hóa")
     logger.info(f"Kết quả: {success_count} thành công, {failure_count} thất bại")
@@ -0,0 +1,10 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Package initialization for runtime metrics and tracing
+"""
+
+from .metrics import MetricsRegistry, NullMetrics, NULL_METRICS
+from .textfile_exporter import TextfileExporter, render_prometheus_text
+from .import_timer import ImportTimer
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module đo thời gian import các thư viện trong lúc chạy (tương tự -X importtime)
+"""
+
+import sys
+import time
+
+
+class ImportTimer:
+    """
+    Lớp ghi nhận thời gian thực thi của từng module (theo tên đầy đủ) được tải lần đầu
+
+    ImportTimer được đặt ở đầu sys.meta_path nên thấy mọi lần tải module: import tuyệt đối,
+    import tương đối, module con (ví dụ reportlab.platypus khi reportlab đã được tải) và
+    importlib.import_module trong các __getattr__ import lười.
+    """
+
+    def __init__(self):
+        """
+        Khởi tạo đối tượng ImportTimer
+        """
+        self.timings = {}       # Tên module -> thời gian tích lũy (gồm các module được import bên trong)
+        self.self_timings = {}  # Tên module -> thời gian riêng (không gồm các module được import bên trong)
+        self._nested_times = []
+        self._installed = False
+
+    def install(self):
+        """
+        Bắt đầu theo dõi các lệnh import
+
+        Returns:
+            ImportTimer: Chính đối tượng này
+        """
+        if not self._installed:
+            sys.meta_path.insert(0, self)
+            self._installed = True
+        return self
+
+    def uninstall(self):
+        """
+        Dừng theo dõi các lệnh import
+        """
+        if self._installed:
+            if self in sys.meta_path:
+                sys.meta_path.remove(self)
+            self._installed = False
+
+    def find_spec(self, fullname, path, target=None):
+        """
+        Tìm module bằng các finder còn lại và bọc loader của nó để đo thời gian thực thi
+
+        Args:
+            fullname (str): Tên đầy đủ của module
+            path (list): Đường dẫn tìm kiếm của package cha
+            target (module, optional): Module đang được tải lại
+
+        Returns:
+            ModuleSpec: Spec của module hoặc None nếu không tìm thấy
+        """
+        for finder in sys.meta_path:
+            find_spec = getattr(finder, 'find_spec', None)
+            if finder is self or find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        # Loader của module built-in/frozen là chính lớp importer dùng chung, không bọc được
+        loader = spec.loader
+        if loader is not None and not isinstance(loader, type) and hasattr(loader, 'exec_module'):
+            loader.exec_module = self._timed_exec_module(fullname, loader)
+        return spec
+
+    def _timed_exec_module(self, fullname, loader):
+        exec_module = loader.exec_module
+
+        def timed_exec_module(module):
+            # Chỉ đo lần thực thi đầu tiên, sau đó trả loader về như cũ
+            vars(loader).pop('exec_module', None)
+
+            self._nested_times.append(0.0)
+            start_time = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                elapsed = time.perf_counter() - start_time
+                nested = self._nested_times.pop()
+                if self._nested_times:
+                    self._nested_times[-1] += elapsed
+                self.timings.setdefault(fullname, elapsed)
+                self.self_timings.setdefault(fullname, elapsed - nested)
+
+        return timed_exec_module
+
+    def report(self, limit=15):
+        """
+        Tạo báo cáo các module import chậm nhất theo thời gian tích lũy
+
+        Args:
+            limit (int, optional): Số dòng tối đa. Mặc định là 15.
+
+        Returns:
+            list: Danh sách chuỗi, mỗi chuỗi gồm thời gian tích lũy, thời gian riêng và tên module
+        """
+        slowest = sorted(self.timings.items(), key=lambda entry: entry[1], reverse=True)[:limit]
+        return [
+            f"{seconds * 1000:10.1f} ms | {self.self_timings[module] * 1000:10.1f} ms | {module}"
+            for module, seconds in slowest
+        ]
@@ -0,0 +1,343 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module đo lường runtime (counter, histogram, span) cho quy trình tự động hóa
+"""
+
+import bisect
+import logging
+import threading
+import time
+
+# Các mốc histogram mặc định (giây), phù hợp với độ trễ của các lời gọi API bên ngoài
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Tên metric dùng chung cho các span của từng bước xử lý
+STAGE_DURATION_METRIC = "pipeline_stage_duration_seconds"
+STAGE_ERRORS_METRIC = "pipeline_stage_errors_total"
+
+
+def _label_key(labels):
+    """
+    Chuyển nhãn thành khóa có thể hash, sắp xếp theo tên nhãn
+
+    Args:
+        labels (dict): Nhãn của mẫu đo
+
+    Returns:
+        tuple: Danh sách cặp (tên, giá trị) đã sắp xếp
+    """
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class Counter:
+    """
+    Bộ đếm tăng dần, có hỗ trợ nhãn
+    """
+
+    def __init__(self, name, description=""):
+        """
+        Khởi tạo đối tượng Counter
+
+        Args:
+            name (str): Tên metric
+            description (str, optional): Mô tả metric
+        """
+        self.name = name
+        self.description = description
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        """
+        Tăng bộ đếm
+
+        Args:
+            amount (float, optional): Giá trị cần cộng thêm. Mặc định là 1.
+            **labels: Nhãn của mẫu đo
+        """
+        key = _label_key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels):
+        """
+        Lấy giá trị hiện tại của bộ đếm
+
+        Args:
+            **labels: Nhãn của mẫu đo
+
+        Returns:
+            float: Giá trị bộ đếm
+        """
+        return self.values.get(_label_key(labels), 0)
+
+
+class Histogram:
+    """
+    Histogram phân bố giá trị theo các mốc cố định, tương thích với Prometheus
+    """
+
+    def __init__(self, name, description="", buckets=DEFAULT_LATENCY_BUCKETS):
+        """
+        Khởi tạo đối tượng Histogram
+
+        Args:
+            name (str): Tên metric
+            description (str, optional): Mô tả metric
+            buckets (tuple, optional): Các mốc trên (upper bound) của histogram
+        """
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self.series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        """
+        Ghi nhận một giá trị đo
+
+        Args:
+            value (float): Giá trị đo
+            **labels: Nhãn của mẫu đo
+        """
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            series = self.series.get(key)
+            if series is None:
+                # Phần tử cuối cùng của bucket_counts là mốc +Inf
+                series = {'bucket_counts': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0}
+                self.series[key] = series
+
+            series['bucket_counts'][index] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def count(self, **labels):
+        """
+        Lấy số lượng mẫu đo đã ghi nhận
+
+        Args:
+            **labels: Nhãn của mẫu đo
+
+        Returns:
+            int: Số lượng mẫu
+        """
+        series = self.series.get(_label_key(labels))
+        return series['count'] if series else 0
+
+    def quantile(self, q, **labels):
+        """
+        Ước lượng phân vị bằng nội suy tuyến tính trong bucket (giống histogram_quantile của Prometheus)
+
+        Args:
+            q (float): Phân vị cần tính (0.0 đến 1.0)
+            **labels: Nhãn của mẫu đo
+
+        Returns:
+            float: Giá trị phân vị ước lượng hoặc None nếu chưa có dữ liệu
+        """
+        series = self.series.get(_label_key(labels))
+        if not series or series['count'] == 0:
+            return None
+
+        rank = q * series['count']
+        cumulative = 0
+        lower_bound = 0.0
+
+        for index, bucket_count in enumerate(series['bucket_counts']):
+            if cumulative + bucket_count >= rank and bucket_count > 0:
+                # Giá trị rơi vào bucket +Inf: trả về mốc hữu hạn lớn nhất
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                upper_bound = self.buckets[index]
+                return lower_bound + (upper_bound - lower_bound) * ((rank - cumulative) / bucket_count)
+            cumulative += bucket_count
+            if index < len(self.buckets):
+                lower_bound = self.buckets[index]
+
+        return self.buckets[-1]
+
+
+class Span:
+    """
+    Context manager đo thời gian của một bước xử lý
+    """
+
+    def __init__(self, registry, stage, labels):
+        """
+        Khởi tạo đối tượng Span
+
+        Args:
+            registry (MetricsRegistry): Registry nhận kết quả đo
+            stage (str): Tên bước xử lý
+            labels (dict): Nhãn bổ sung
+        """
+        self.registry = registry
+        self.stage = stage
+        self.labels = labels
+        self.start_time = None
+        self.duration = None
+
+    def __enter__(self):
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.duration = time.perf_counter() - self.start_time
+        self.registry.record_span(self.stage, self.duration, exc_value, self.labels)
+        # Không nuốt ngoại lệ
+        return False
+
+
+class MetricsRegistry:
+    """
+    Registry lưu trữ các metric và phát sự kiện span tới các hook đã đăng ký
+    """
+
+    def __init__(self):
+        """
+        Khởi tạo đối tượng MetricsRegistry
+        """
+        self.logger = logging.getLogger(__name__)
+        self.counters = {}
+        self.histograms = {}
+        self.span_hooks = []
+        self._lock = threading.Lock()
+
+    def counter(self, name, description=""):
+        """
+        Lấy hoặc tạo mới một counter
+
+        Args:
+            name (str): Tên metric
+            description (str, optional): Mô tả metric
+
+        Returns:
+            Counter: Đối tượng counter
+        """
+        with self._lock:
+            if name not in self.counters:
+                self.counters[name] = Counter(name, description)
+            return self.counters[name]
+
+    def histogram(self, name, description="", buckets=DEFAULT_LATENCY_BUCKETS):
+        """
+        Lấy hoặc tạo mới một histogram
+
+        Args:
+            name (str): Tên metric
+            description (str, optional): Mô tả metric
+            buckets (tuple, optional): Các mốc của histogram
+
+        Returns:
+            Histogram: Đối tượng histogram
+        """
+        with self._lock:
+            if name not in self.histograms:
+                self.histograms[name] = Histogram(name, description, buckets)
+            return self.histograms[name]
+
+    def span(self, stage, **labels):
+        """
+        Tạo span đo thời gian cho một bước xử lý
+
+        Args:
+            stage (str): Tên bước xử lý (ví dụ: ai_generate, drive_upload)
+            **labels: Nhãn bổ sung
+
+        Returns:
+            Span: Context manager đo thời gian
+        """
+        return Span(self, stage, labels)
+
+    def add_span_hook(self, hook):
+        """
+        Đăng ký hook được gọi mỗi khi một span kết thúc (ví dụ: cầu nối tới hệ thống tracing)
+
+        Args:
+            hook (callable): Hàm nhận (stage, duration, error, labels)
+        """
+        self.span_hooks.append(hook)
+
+    def record_span(self, stage, duration, error, labels):
+        """
+        Ghi nhận kết quả của một span
+
+        Args:
+            stage (str): Tên bước xử lý
+            duration (float): Thời gian thực thi (giây)
+            error (Exception): Ngoại lệ phát sinh hoặc None
+            labels (dict): Nhãn bổ sung
+        """
+        self.histogram(STAGE_DURATION_METRIC, "Thời gian thực thi của từng bước xử lý").observe(
+            duration, stage=stage, **labels)
+
+        if error is not None:
+            self.counter(STAGE_ERRORS_METRIC, "Số lỗi của từng bước xử lý").inc(stage=stage, **labels)
+
+        for hook in self.span_hooks:
+            try:
+                hook(stage, duration, error, labels)
+            except Exception as e:
+                # Hook lỗi không được làm gián đoạn quy trình chính
+                self.logger.warning(f"Lỗi trong span hook cho bước {stage}: {e}")
+
+
+class _NullSpan:
+    """
+    Span rỗng, không đo đạc gì
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+class _NullCounter:
+    """
+    Counter rỗng, bỏ qua mọi thao tác
+    """
+
+    def inc(self, amount=1, **labels):
+        pass
+
+
+class _NullHistogram:
+    """
+    Histogram rỗng, bỏ qua mọi thao tác
+    """
+
+    def observe(self, value, **labels):
+        pass
+
+
+class NullMetrics:
+    """
+    Registry rỗng dùng làm mặc định: mọi lời gọi trả về đối tượng dùng chung và không làm gì
+    """
+
+    _span = _NullSpan()
+    _counter = _NullCounter()
+    _histogram = _NullHistogram()
+
+    def counter(self, name, description=""):
+        return self._counter
+
+    def histogram(self, name, description="", buckets=DEFAULT_LATENCY_BUCKETS):
+        return self._histogram
+
+    def span(self, stage, **labels):
+        return self._span
+
+    def add_span_hook(self, hook):
+        pass
+
+
+# Thể hiện dùng chung của registry rỗng
+NULL_METRICS = NullMetrics()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module xuất metric ra file văn bản theo định dạng Prometheus (textfile collector của node_exporter)
+"""
+
+import os
+import logging
+import tempfile
+
+# Quyền của file .prom: node_exporter (thường chạy bằng user khác) phải đọc được
+PROM_FILE_MODE = 0o644
+
+
+def _format_labels(label_key, extra=None):
+    """
+    Định dạng nhãn theo cú pháp Prometheus
+
+    Args:
+        label_key (tuple): Danh sách cặp (tên, giá trị) của nhãn
+        extra (tuple, optional): Cặp nhãn bổ sung (ví dụ: ('le', '0.5'))
+
+    Returns:
+        str: Chuỗi nhãn, ví dụ {stage="drive_upload"}
+    """
+    pairs = list(label_key)
+    if extra:
+        pairs.append(extra)
+
+    if not pairs:
+        return ""
+
+    escaped = []
+    for name, value in pairs:
+        value = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        escaped.append(f'{name}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+def render_prometheus_text(registry):
+    """
+    Chuyển toàn bộ metric trong registry thành văn bản định dạng Prometheus
+
+    Args:
+        registry (MetricsRegistry): Registry chứa metric
+
+    Returns:
+        str: Nội dung văn bản định dạng Prometheus
+    """
+    lines = []
+
+    for name, counter in sorted(registry.counters.items()):
+        if counter.description:
+            lines.append(f"# HELP {name} {counter.description}")
+        lines.append(f"# TYPE {name} counter")
+        for label_key, value in sorted(counter.values.items()):
+            lines.append(f"{name}{_format_labels(label_key)} {value}")
+
+    for name, histogram in sorted(registry.histograms.items()):
+        if histogram.description:
+            lines.append(f"# HELP {name} {histogram.description}")
+        lines.append(f"# TYPE {name} histogram")
+        for label_key, series in sorted(histogram.series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(histogram.buckets, series['bucket_counts']):
+                cumulative += bucket_count
+                lines.append(f"{name}_bucket{_format_labels(label_key, ('le', repr(float(bound))))} {cumulative}")
+            lines.append(f"{name}_bucket{_format_labels(label_key, ('le', '+Inf'))} {series['count']}")
+            lines.append(f"{name}_sum{_format_labels(label_key)} {series['sum']}")
+            lines.append(f"{name}_count{_format_labels(label_key)} {series['count']}")
+
+    return "\n".join(lines) + "\n"
+
+
+class TextfileExporter:
+    """
+    Lớp ghi metric ra file .prom cho textfile collector của node_exporter
+    """
+
+    def __init__(self, output_path):
+        """
+        Khởi tạo đối tượng TextfileExporter
+
+        Args:
+            output_path (str): Đường dẫn file .prom đầu ra
+        """
+        self.logger = logging.getLogger(__name__)
+        self.output_path = output_path
+
+    def export(self, registry):
+        """
+        Ghi metric ra file một cách nguyên tử (ghi file tạm rồi đổi tên)
+        để node_exporter không đọc phải file ghi dở
+
+        Args:
+            registry (MetricsRegistry): Registry chứa metric
+
+        Returns:
+            str: Đường dẫn file đã ghi hoặc None nếu có lỗi
+        """
+        try:
+            output_dir = os.path.dirname(os.path.abspath(self.output_path))
+            os.makedirs(output_dir, exist_ok=True)
+
+            fd, temp_path = tempfile.mkstemp(dir=output_dir, prefix=".metrics_", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(render_prometheus_text(registry))
+                # mkstemp tạo file với quyền 0600 và os.replace giữ nguyên quyền đó
+                os.chmod(temp_path, PROM_FILE_MODE)
+                os.replace(temp_path, self.output_path)
+            except BaseException:
+                # Không để lại file tạm khi ghi thất bại
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+
+            self.logger.info(f"Đã xuất metric ra file: {self.output_path}")
+            return self.output_path
+
+        except Exception as e:
+            self.logger.error(f"Lỗi khi xuất metric ra file: {e}")
+            return None
@@ -6,3 +6,5 @@ Package initialization for data persistence
 """
 
 from .database import DatabaseManager
+from .log_exporter import LogExporter
+from .parquet_exporter import ParquetExporter
@@ -50,10 +50,23 @@ class DatabaseManager:
                 status TEXT NOT NULL,
                 drive_url TEXT,
                 error_message TEXT,
-                timestamp DATETIME NOT NULL
+                timestamp DATETIME NOT NULL,
+                duration_ms INTEGER
             )
             ''')
 
+            # Bổ sung cột duration_ms cho cơ sở dữ liệu tạo trước khi có cột này
+            columns = {row[1] for row in cursor.execute('PRAGMA table_info(logs)')}
+            if 'duration_ms' not in columns:
+                cursor.execute('ALTER TABLE logs ADD COLUMN duration_ms INTEGER')
+                self.logger.info("Đã thêm cột duration_ms vào bảng logs")
+
+            # Chỉ mục biểu thức theo ngày: các truy vấn WHERE date(timestamp) = ... chỉ đọc hàng của ngày đó
+            cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_logs_date_status
+            ON logs (date(timestamp), status)
+            ''')
+
             conn.commit()
             conn.close()
             self.logger.info("Đã khởi tạo cơ sở dữ liệu")
@@ -61,7 +74,7 @@ class DatabaseManager:
         except Exception as e:
             self.logger.error(f"Lỗi khi khởi tạo cơ sở dữ liệu: {e}")
 
-    def log_success(self, item_id, description, output_format, model, drive_url):
+    def log_success(self, item_id, description, output_format, model, drive_url, duration_ms=None):
         """
         Ghi log thành công
 
@@ -71,15 +84,16 @@ class DatabaseManager:
             output_format (str): Định dạng đầu ra
             model (str): Mô hình AI sử dụng
             drive_url (str): URL của tệp trên Google Drive
+            duration_ms (int, optional): Thời gian xử lý mục (mili giây)
         """
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute('''
-            INSERT INTO logs (item_id, description, output_format, model, status, drive_url, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (item_id, description, output_format, model, 'success', drive_url, datetime.now()))
+            INSERT INTO logs (item_id, description, output_format, model, status, drive_url, timestamp, duration_ms)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (item_id, description, output_format, model, 'success', drive_url, datetime.now(), duration_ms))
 
             conn.commit()
             conn.close()
@@ -88,7 +102,7 @@ class DatabaseManager:
         except Exception as e:
             self.logger.error(f"Lỗi khi ghi log thành công: {e}")
 
-    def log_failure(self, item_id, description, output_format, model, error_message):
+    def log_failure(self, item_id, description, output_format, model, error_message, duration_ms=None):
         """
         Ghi log thất bại
 
@@ -98,15 +112,16 @@ class DatabaseManager:
             output_format (str): Định dạng đầu ra
             model (str): Mô hình AI sử dụng
             error_message (str): Thông báo lỗi
+            duration_ms (int, optional): Thời gian xử lý mục cho tới khi lỗi (mili giây)
         """
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute('''
-            INSERT INTO logs (item_id, description, output_format, model, status, error_message, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (item_id, description, output_format, model, 'failure', error_message, datetime.now()))
+            INSERT INTO logs (item_id, description, output_format, model, status, error_message, timestamp, duration_ms)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (item_id, description, output_format, model, 'failure', error_message, datetime.now(), duration_ms))
 
             conn.commit()
             conn.close()
@@ -149,6 +164,48 @@ class DatabaseManager:
             self.logger.error(f"Lỗi khi lấy logs theo ngày: {e}")
             return []
 
+    def iter_logs_by_date(self, date, batch_size=1000):
+        """
+        Duyệt logs theo ngày bằng con trỏ, mỗi lần chỉ đọc batch_size hàng vào bộ nhớ
+
+        Kết nối được giữ mở cho tới khi duyệt xong (hoặc generator bị đóng).
+
+        Args:
+            date (datetime.date): Ngày cần lấy logs
+            batch_size (int, optional): Số hàng đọc mỗi lần. Mặc định là 1000.
+
+        Yields:
+            dict: Một hàng log
+        """
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+
+            # Chuyển đổi date thành chuỗi ngày
+            date_str = date.strftime('%Y-%m-%d')
+
+            cursor.execute('''
+            SELECT * FROM logs
+            WHERE date(timestamp) = date(?)
+            ORDER BY timestamp
+            ''', (date_str,))
+
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Lỗi khi duyệt logs theo ngày: {e}")
+
+        finally:
+            if conn is not None:
+                conn.close()
+
     def get_success_failure_count_by_date(self, date):
         """
         Lấy số lượng thành công và thất bại theo ngày
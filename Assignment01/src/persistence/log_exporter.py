@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module xuất bảng logs ra NDJSON hoặc CSV theo luồng
+
+Các hàng được đọc từ con trỏ cơ sở dữ liệu theo lô và ghi thẳng ra file (có thể nén gzip),
+nên bộ nhớ sử dụng không phụ thuộc vào khoảng ngày được xuất.
+"""
+
+import os
+import csv
+import gzip
+import json
+import sqlite3
+import logging
+import tempfile
+
+# Các định dạng xuất được hỗ trợ
+EXPORT_FORMATS = ('ndjson', 'csv')
+
+# Số hàng đọc từ con trỏ mỗi lần
+EXPORT_BATCH_SIZE = 5000
+
+# Mức nén gzip: mức 6 chậm hơn ít so với không nén, mức mặc định 9 chậm hơn nhiều mà file chỉ nhỏ hơn chút ít
+GZIP_COMPRESS_LEVEL = 6
+
+# Truy vấn xuất logs theo khoảng ngày. Sắp xếp theo ngày để SQLite trả hàng theo thứ tự của chỉ mục
+# idx_logs_date_status, nên hàng đầu tiên được ghi ngay mà không phải sắp xếp cả khoảng ngày trong
+# B-tree tạm. Trong cùng một ngày, hàng theo thứ tự của chỉ mục (trạng thái, rồi id).
+EXPORT_QUERY = '''
+SELECT * FROM logs
+WHERE date(timestamp) BETWEEN date(?) AND date(?)
+ORDER BY date(timestamp)
+'''
+
+class LogExporter:
+    """
+    Lớp xuất bảng logs theo khoảng ngày ra file NDJSON hoặc CSV
+    """
+
+    def __init__(self, db_path, batch_size=EXPORT_BATCH_SIZE):
+        """
+        Khởi tạo đối tượng LogExporter
+
+        Args:
+            db_path (str): Đường dẫn đến file cơ sở dữ liệu
+            batch_size (int, optional): Số hàng đọc từ con trỏ mỗi lần. Mặc định là EXPORT_BATCH_SIZE.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.db_path = db_path
+        self.batch_size = batch_size
+
+    def export(self, output_path, start_date, end_date, format_type='ndjson', compress=None):
+        """
+        Xuất logs trong khoảng ngày ra file
+
+        File được ghi vào một file tạm cùng thư mục rồi đổi tên, nên người đọc không bao giờ
+        thấy một file xuất dở dang.
+
+        Args:
+            output_path (str): Đường dẫn đến file đầu ra
+            start_date (datetime.date): Ngày bắt đầu (bao gồm)
+            end_date (datetime.date): Ngày kết thúc (bao gồm)
+            format_type (str, optional): 'ndjson' hoặc 'csv'. Mặc định là 'ndjson'.
+            compress (bool, optional): Nén gzip. Mặc định nén khi output_path có đuôi .gz.
+
+        Returns:
+            str: Đường dẫn đến file đã xuất, None nếu có lỗi
+        """
+        format_type = format_type.lower()
+        if format_type not in EXPORT_FORMATS:
+            self.logger.error(f"Định dạng không được hỗ trợ: {format_type}. Hỗ trợ: {', '.join(EXPORT_FORMATS)}")
+            return None
+
+        if compress is None:
+            compress = output_path.lower().endswith('.gz')
+        elif compress and not output_path.lower().endswith('.gz'):
+            output_path = f"{output_path}.gz"
+
+        output_dir = os.path.dirname(os.path.abspath(output_path))
+        temp_path = None
+        conn = None
+        try:
+            # Đảm bảo thư mục đầu ra tồn tại
+            os.makedirs(output_dir, exist_ok=True)
+
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+
+            cursor.execute(EXPORT_QUERY, (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')))
+            columns = [description[0] for description in cursor.description]
+
+            fd, temp_path = tempfile.mkstemp(dir=output_dir, suffix='.tmp')
+            os.close(fd)
+
+            if compress:
+                f = gzip.open(temp_path, 'wt', compresslevel=GZIP_COMPRESS_LEVEL, encoding='utf-8', newline='')
+            else:
+                f = open(temp_path, 'w', encoding='utf-8', newline='')
+
+            with f:
+                if format_type == 'ndjson':
+                    row_count = self._write_ndjson(f, cursor, columns)
+                else:
+                    row_count = self._write_csv(f, cursor, columns)
+
+            os.replace(temp_path, output_path)
+            temp_path = None
+
+            self.logger.info(f"Đã xuất {row_count} logs ra file {format_type}: {output_path}")
+            return output_path
+
+        except Exception as e:
+            self.logger.error(f"Lỗi khi xuất logs ra file {format_type}: {e}")
+            return None
+
+        finally:
+            if conn is not None:
+                conn.close()
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def export_ndjson(self, output_path, start_date, end_date, compress=None):
+        """
+        Xuất logs trong khoảng ngày ra file NDJSON (mỗi dòng một đối tượng JSON)
+
+        Args:
+            output_path (str): Đường dẫn đến file đầu ra
+            start_date (datetime.date): Ngày bắt đầu (bao gồm)
+            end_date (datetime.date): Ngày kết thúc (bao gồm)
+            compress (bool, optional): Nén gzip. Mặc định nén khi output_path có đuôi .gz.
+
+        Returns:
+            str: Đường dẫn đến file đã xuất, None nếu có lỗi
+        """
+        return self.export(output_path, start_date, end_date, 'ndjson', compress)
+
+    def export_csv(self, output_path, start_date, end_date, compress=None):
+        """
+        Xuất logs trong khoảng ngày ra file CSV có hàng tiêu đề
+
+        Args:
+            output_path (str): Đường dẫn đến file đầu ra
+            start_date (datetime.date): Ngày bắt đầu (bao gồm)
+            end_date (datetime.date): Ngày kết thúc (bao gồm)
+            compress (bool, optional): Nén gzip. Mặc định nén khi output_path có đuôi .gz.
+
+        Returns:
+            str: Đường dẫn đến file đã xuất, None nếu có lỗi
+        """
+        return self.export(output_path, start_date, end_date, 'csv', compress)
+
+    def _iter_batches(self, cursor):
+        """
+        Đọc các hàng từ con trỏ theo lô
+
+        Args:
+            cursor (sqlite3.Cursor): Con trỏ đã thực thi truy vấn
+
+        Yields:
+            list: Một lô hàng
+        """
+        while True:
+            rows = cursor.fetchmany(self.batch_size)
+            if not rows:
+                break
+            yield rows
+
+    def _write_ndjson(self, f, cursor, columns):
+        """
+        Ghi các hàng ra file NDJSON
+
+        Args:
+            f (file): File đầu ra ở chế độ văn bản
+            cursor (sqlite3.Cursor): Con trỏ đã thực thi truy vấn
+            columns (list): Tên các cột
+
+        Returns:
+            int: Số hàng đã ghi
+        """
+        row_count = 0
+        for rows in self._iter_batches(cursor):
+            f.writelines(
+                json.dumps(dict(zip(columns, row)), ensure_ascii=False) + '\n'
+                for row in rows
+            )
+            row_count += len(rows)
+        return row_count
+
+    def _write_csv(self, f, cursor, columns):
+        """
+        Ghi các hàng ra file CSV
+
+        Args:
+            f (file): File đầu ra ở chế độ văn bản
+            cursor (sqlite3.Cursor): Con trỏ đã thực thi truy vấn
+            columns (list): Tên các cột
+
+        Returns:
+            int: Số hàng đã ghi
+        """
+        writer = csv.writer(f)
+        writer.writerow(columns)
+
+        row_count = 0
+        for rows in self._iter_batches(cursor):
+            writer.writerows(rows)
+            row_count += len(rows)
+        return row_count
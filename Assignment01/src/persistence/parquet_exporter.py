@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module xuất bảng logs ra Parquet phân vùng theo ngày cho phân tích dữ liệu
+
+Các hàng được đọc theo lô và ghi vào thư mục dạng Hive (date=YYYY-MM-DD/part-*.parquet),
+đọc được trực tiếp bằng pandas.read_parquet hoặc pyarrow.dataset. Mỗi lần xuất chỉ đọc các
+hàng mới hơn mốc (watermark) đã lưu trong bảng export_watermarks của cùng cơ sở dữ liệu.
+
+Cần cài đặt pyarrow: pip install pyarrow
+"""
+
+import os
+import sqlite3
+import logging
+from datetime import datetime
+
+# Số hàng đọc từ con trỏ và chuyển thành bảng Arrow mỗi lần
+PARQUET_BATCH_SIZE = 50000
+
+# Tên mốc mặc định trong bảng export_watermarks
+DEFAULT_WATERMARK_NAME = 'logs_parquet'
+
+# Các cột được xuất, theo thứ tự trong file Parquet
+PARQUET_COLUMNS = (
+    'id', 'item_id', 'description', 'output_format', 'model', 'status',
+    'drive_url', 'error_message', 'timestamp', 'duration_ms'
+)
+
+class ParquetExporter:
+    """
+    Lớp xuất tăng dần bảng logs ra Parquet phân vùng theo ngày
+    """
+
+    def __init__(self, db_path, output_dir, batch_size=PARQUET_BATCH_SIZE, watermark_name=DEFAULT_WATERMARK_NAME):
+        """
+        Khởi tạo đối tượng ParquetExporter
+
+        Args:
+            db_path (str): Đường dẫn đến file cơ sở dữ liệu
+            output_dir (str): Thư mục gốc của dataset Parquet
+            batch_size (int, optional): Số hàng đọc mỗi lần. Mặc định là PARQUET_BATCH_SIZE.
+            watermark_name (str, optional): Tên mốc, dùng tên khác cho mỗi thư mục đích
+        """
+        self.logger = logging.getLogger(__name__)
+        self.db_path = db_path
+        self.output_dir = output_dir
+        self.batch_size = batch_size
+        self.watermark_name = watermark_name
+
+    def get_watermark(self):
+        """
+        Lấy id lớn nhất đã được xuất
+
+        Returns:
+            int: id của hàng cuối cùng đã xuất, 0 nếu chưa xuất lần nào
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            self._ensure_watermark_table(conn)
+
+            row = conn.execute('''
+            SELECT last_id FROM export_watermarks WHERE name = ?
+            ''', (self.watermark_name,)).fetchone()
+
+            conn.close()
+            return row[0] if row else 0
+
+        except Exception as e:
+            self.logger.error(f"Lỗi khi lấy mốc xuất Parquet: {e}")
+            return 0
+
+    def export(self):
+        """
+        Xuất các hàng mới kể từ mốc trước ra Parquet và cập nhật mốc
+
+        Mỗi ngày có hàng mới nhận một file date=YYYY-MM-DD/part-<id đầu tiên>.parquet. File được
+        ghi tạm rồi đổi tên, và mốc chỉ được cập nhật sau khi mọi file đã hoàn tất; nếu lần xuất
+        bị gián đoạn, lần chạy lại ghi đè đúng các file đó thay vì tạo bản trùng.
+
+        Returns:
+            list: Đường dẫn các file Parquet đã ghi (rỗng nếu không có hàng mới), None nếu có lỗi
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            self.logger.error("Lỗi: Thư viện pyarrow chưa được cài đặt. Sử dụng 'pip install pyarrow'")
+            return None
+
+        schema = pa.schema([
+            ('id', pa.int64()),
+            ('item_id', pa.string()),
+            ('description', pa.string()),
+            ('output_format', pa.string()),
+            ('model', pa.string()),
+            ('status', pa.string()),
+            ('drive_url', pa.string()),
+            ('error_message', pa.string()),
+            ('timestamp', pa.timestamp('us')),
+            ('duration_ms', pa.int64())
+        ])
+
+        conn = None
+        writers = {}
+        try:
+            conn = sqlite3.connect(self.db_path)
+            self._ensure_watermark_table(conn)
+
+            row = conn.execute('''
+            SELECT last_id FROM export_watermarks WHERE name = ?
+            ''', (self.watermark_name,)).fetchone()
+            last_id = row[0] if row else 0
+
+            # Chốt id lớn nhất trước khi đọc để các hàng ghi trong lúc xuất thuộc về lần sau
+            high_id = conn.execute('SELECT MAX(id) FROM logs').fetchone()[0] or 0
+            if high_id <= last_id:
+                self.logger.info("Không có logs mới để xuất Parquet")
+                return []
+
+            cursor = conn.execute(f'''
+            SELECT {', '.join(PARQUET_COLUMNS)}, date(timestamp) AS partition_date
+            FROM logs
+            WHERE id > ? AND id <= ?
+            ORDER BY id
+            ''', (last_id, high_id))
+
+            file_name = f"part-{last_id + 1:012d}.parquet"
+            row_count = 0
+
+            while True:
+                rows = cursor.fetchmany(self.batch_size)
+                if not rows:
+                    break
+
+                # Gom các hàng của lô theo ngày
+                partitions = {}
+                for log_row in rows:
+                    partitions.setdefault(log_row[-1], []).append(log_row)
+
+                for partition_date, partition_rows in partitions.items():
+                    if partition_date not in writers:
+                        partition_dir = os.path.join(self.output_dir, f"date={partition_date}")
+                        os.makedirs(partition_dir, exist_ok=True)
+                        final_path = os.path.join(partition_dir, file_name)
+                        writers[partition_date] = (
+                            pq.ParquetWriter(f"{final_path}.tmp", schema),
+                            final_path
+                        )
+
+                    writer = writers[partition_date][0]
+                    writer.write_table(self._to_arrow_table(pa, schema, partition_rows))
+
+                row_count += len(rows)
+
+            # Hoàn tất các file rồi mới cập nhật mốc
+            written_paths = []
+            for writer, final_path in writers.values():
+                writer.close()
+                os.replace(f"{final_path}.tmp", final_path)
+                written_paths.append(final_path)
+            writers = {}
+
+            conn.execute('''
+            INSERT OR REPLACE INTO export_watermarks (name, last_id, updated_at)
+            VALUES (?, ?, ?)
+            ''', (self.watermark_name, high_id, datetime.now()))
+            conn.commit()
+
+            self.logger.info(f"Đã xuất {row_count} logs ra {len(written_paths)} file Parquet trong {self.output_dir}")
+            return sorted(written_paths)
+
+        except Exception as e:
+            self.logger.error(f"Lỗi khi xuất logs ra Parquet: {e}")
+            return None
+
+        finally:
+            # Dọn các file tạm nếu lần xuất bị lỗi
+            for writer, final_path in writers.values():
+                try:
+                    writer.close()
+                except Exception:
+                    pass
+                if os.path.exists(f"{final_path}.tmp"):
+                    os.remove(f"{final_path}.tmp")
+            if conn is not None:
+                conn.close()
+
+    def _ensure_watermark_table(self, conn):
+        """
+        Tạo bảng lưu mốc xuất nếu chưa tồn tại
+
+        Args:
+            conn (sqlite3.Connection): Kết nối cơ sở dữ liệu
+        """
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS export_watermarks (
+            name TEXT PRIMARY KEY,
+            last_id INTEGER NOT NULL,
+            updated_at DATETIME NOT NULL
+        )
+        ''')
+        conn.commit()
+
+    def _to_arrow_table(self, pa, schema, rows):
+        """
+        Chuyển các hàng của một ngày thành bảng Arrow theo từng cột
+
+        Args:
+            pa (module): Module pyarrow
+            schema (pyarrow.Schema): Schema của file Parquet
+            rows (list): Các hàng (theo PARQUET_COLUMNS, thêm cột ngày ở cuối)
+
+        Returns:
+            pyarrow.Table: Bảng Arrow
+        """
+        columns = {name: [row[index] for row in rows] for index, name in enumerate(PARQUET_COLUMNS)}
+        columns['timestamp'] = [
+            datetime.fromisoformat(value) if value else None for value in columns['timestamp']
+        ]
+        return pa.Table.from_pydict(columns, schema=schema)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Kiểm thử cho module chart_generator
+Unit tests for chart_generator module
+"""
+
+import os
+import sys
+import unittest
+import tempfile
+from unittest import mock
+from datetime import date, timedelta
+
+# Thêm thư mục gốc vào sys.path để có thể import các module
+# Add root directory to sys.path to be able to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.generators.chart_generator import ChartGenerator
+
+class TestChartGenerator(unittest.TestCase):
+    """
+    Lớp kiểm thử cho ChartGenerator
+    Test class for ChartGenerator
+    """
+
+    def setUp(self):
+        """
+        Chuẩn bị trước mỗi kiểm thử
+        Setup before each test
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.chart_generator = ChartGenerator(self.temp_dir.name)
+
+    def tearDown(self):
+        """
+        Dọn dẹp sau mỗi kiểm thử
+        Cleanup after each test
+        """
+        self.temp_dir.cleanup()
+
+    def test_generate_daily_chart(self):
+        """
+        Kiểm thử tạo biểu đồ hàng ngày
+        Test generating a daily chart
+        """
+        chart_path = self.chart_generator.generate_daily_chart(date(2025, 6, 1), 8, 2)
+
+        self.assertTrue(os.path.exists(chart_path))
+        self.assertTrue(os.path.basename(chart_path).startswith("daily_chart_20250601_"))
+
+    def test_generate_daily_charts_in_process_pool(self):
+        """
+        Kiểm thử vẽ nhiều biểu đồ song song giữ đúng thứ tự đầu vào
+        Test parallel rendering keeps the input order
+        """
+        start = date(2025, 6, 1)
+        daily_stats = [
+            {'date': start + timedelta(days=offset), 'success_count': offset, 'failure_count': 1}
+            for offset in range(3)
+        ]
+        daily_stats.append({'date': '2025-06-04', 'success_count': 0, 'failure_count': 0})
+
+        chart_paths = self.chart_generator.generate_daily_charts(daily_stats, max_workers=2)
+
+        self.assertEqual([os.path.basename(path)[:len("daily_chart_YYYYMMDD")] for path in chart_paths], [
+            "daily_chart_20250601", "daily_chart_20250602",
+            "daily_chart_20250603", "daily_chart_20250604"
+        ])
+        for chart_path in chart_paths:
+            self.assertTrue(os.path.exists(chart_path))
+
+    def test_unchanged_inputs_reuse_cached_chart(self):
+        """
+        Kiểm thử dữ liệu không đổi dùng lại file đã có, dữ liệu thay đổi xóa file cũ
+        Test unchanged inputs reuse the existing file and changed inputs remove stale files
+        """
+        legacy_path = os.path.join(self.chart_generator.charts_dir, "daily_chart_20250601.png")
+        with open(legacy_path, 'wb') as f:
+            f.write(b'')
+
+        first_path = self.chart_generator.generate_daily_chart(date(2025, 6, 1), 8, 2)
+        self.assertFalse(os.path.exists(legacy_path))
+
+        with mock.patch('src.generators.chart_generator._render_job') as render_job:
+            self.assertEqual(self.chart_generator.generate_daily_chart(date(2025, 6, 1), 8, 2), first_path)
+            self.assertEqual(self.chart_generator.generate_daily_charts(
+                [{'date': '2025-06-01', 'success_count': 8, 'failure_count': 2}]), [first_path])
+            render_job.assert_not_called()
+
+        second_path = self.chart_generator.generate_daily_chart(date(2025, 6, 1), 9, 2)
+        self.assertNotEqual(second_path, first_path)
+        self.assertTrue(os.path.exists(second_path))
+        self.assertFalse(os.path.exists(first_path))
+
+    def test_render_batch_reports_invalid_jobs(self):
+        """
+        Kiểm thử yêu cầu không hợp lệ trả về None mà không ảnh hưởng các biểu đồ khác
+        Test invalid jobs return None without affecting other charts
+        """
+        chart_paths = self.chart_generator.render_batch([
+            ('unknown', {}),
+            ('format_distribution', {'format_stats': {'png': 3, 'mp3': 1}})
+        ])
+
+        self.assertIsNone(chart_paths[0])
+        self.assertTrue(os.path.exists(chart_paths[1]))
+
+if __name__ == '__main__':
+    unittest.main()
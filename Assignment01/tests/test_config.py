@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Kiểm thử cho module config
+Unit tests for config module
+"""
+
+import os
+import sys
+import unittest
+import tempfile
+
+# Thêm thư mục gốc vào sys.path để có thể import các module
+# Add root directory to sys.path to be able to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import config
+
+class TestSettings(unittest.TestCase):
+    """
+    Lớp kiểm thử cho Settings và load_settings
+    Test class for Settings and load_settings
+    """
+
+    def setUp(self):
+        """
+        Chuẩn bị trước mỗi kiểm thử
+        Setup before each test
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """
+        Dọn dẹp sau mỗi kiểm thử
+        Cleanup after each test
+        """
+        self.temp_dir.cleanup()
+
+    def test_load_settings_does_not_mutate_environment(self):
+        """
+        Kiểm thử load_settings đọc file .env mà không thay đổi os.environ
+        Test load_settings reads the .env file without mutating os.environ
+        """
+        env_file = os.path.join(self.temp_dir.name, '.env.test')
+        with open(env_file, 'w') as f:
+            f.write("OPENAI_API_KEY=file-key\nGOOGLE_SHEET_ID=file-sheet\n")
+
+        environ = {"OPENAI_API_KEY": "env-key", "ANTHROPIC_API_KEY": "env-anthropic"}
+        before = dict(os.environ)
+        settings = config.load_settings(env_file=env_file, environ=environ)
+
+        self.assertEqual(settings.openai_api_key, "file-key")
+        self.assertEqual(settings.anthropic_api_key, "env-anthropic")
+        self.assertEqual(settings.google_sheet_id, "file-sheet")
+        self.assertEqual(dict(os.environ), before)
+
+    def test_missing_env_file_raises(self):
+        """
+        Kiểm thử file môi trường không tồn tại gây lỗi FileNotFoundError
+        Test a missing environment file raises FileNotFoundError
+        """
+        with self.assertRaises(FileNotFoundError):
+            config.load_settings(env_file=os.path.join(self.temp_dir.name, 'missing.env'), environ={})
+
+    def test_ai_service_selection_and_overrides(self):
+        """
+        Kiểm thử chọn dịch vụ AI và ghi đè cấu hình không ảnh hưởng bản gốc
+        Test AI service selection and overrides leave the original untouched
+        """
+        settings = config.Settings(openai_api_key="openai-key", anthropic_api_key="anthropic-key")
+        self.assertEqual(settings.ai_service, "openai")
+        self.assertEqual(settings.ai_api_key, "openai-key")
+
+        overridden = settings.with_overrides(anthropic_api_key="cli-key", preferred_ai_service="anthropic",
+                                             openai_api_key=None)
+        self.assertEqual(overridden.ai_service, "anthropic")
+        self.assertEqual(overridden.ai_api_key, "cli-key")
+        self.assertEqual(overridden.openai_api_key, "openai-key")
+        self.assertEqual(settings.ai_service, "openai")
+
+    def test_validate_reports_missing_values(self):
+        """
+        Kiểm thử validate trả về cảnh báo cho các giá trị còn thiếu
+        Test validate returns warnings for missing values
+        """
+        self.assertEqual(len(config.Settings().validate()), 5)
+
+        complete = config.Settings(
+            data_dir=self.temp_dir.name,
+            google_sheet_id="sheet",
+            drive_folder_id="folder",
+            openai_api_key="key",
+            email=config.EmailSettings(sender_email="a@example.com", sender_password="p",
+                                       admin_email="b@example.com"),
+            slack_webhook_url="https://hooks.slack.local/test"
+        )
+        self.assertEqual(complete.validate(), [])
+        self.assertEqual(complete.database_path, os.path.join(self.temp_dir.name, "automation.db"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,7 +16,8 @@ from datetime import datetime, date
 # Add root directory to sys.path to be able to import modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.database import DatabaseManager
+from src.persistence.database import DatabaseManager
+from src.generators.report_generator import ReportGenerator
 
 class TestDatabaseManager(unittest.TestCase):
     """
@@ -60,7 +61,7 @@ class TestDatabaseManager(unittest.TestCase):
         # Lấy logs
         # Get logs
         today = datetime.now().date()
-        logs = self.db_manager._fetch_daily_logs(today)
+        logs = self.db_manager.get_logs_by_date(today)
 
         # Kiểm tra
         # Check
@@ -87,7 +88,7 @@ class TestDatabaseManager(unittest.TestCase):
         # Lấy logs
         # Get logs
         today = datetime.now().date()
-        logs = self.db_manager._fetch_daily_logs(today)
+        logs = self.db_manager.get_logs_by_date(today)
 
         # Kiểm tra
         # Check
@@ -130,15 +131,19 @@ class TestDatabaseManager(unittest.TestCase):
         # Lấy thống kê
         # Get statistics
         today = datetime.now().date()
-        stats = self.db_manager._fetch_daily_stats(today)
+        self.assertEqual(self.db_manager.get_success_failure_count_by_date(today), (2, 1))
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            stats = ReportGenerator(self.test_db_path, output_dir).build_daily_report_data(today)
 
         # Kiểm tra
         # Check
         self.assertIsNotNone(stats)
-        self.assertEqual(stats['total_count'], 3)
-        self.assertEqual(stats['success_count'], 2)
-        self.assertEqual(stats['failure_count'], 1)
-        self.assertAlmostEqual(stats['success_rate'], 66.67, delta=0.01)
+        self.assertEqual(stats.total_count, 3)
+        self.assertEqual(stats.success_count, 2)
+        self.assertEqual(stats.failure_count, 1)
+        self.assertAlmostEqual(stats.success_rate, 66.67, delta=0.01)
+        self.assertEqual(len(stats.logs), 3)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Kiểm thử cho module log_exporter
+Unit tests for log_exporter module
+"""
+
+import os
+import sys
+import csv
+import gzip
+import json
+import sqlite3
+import unittest
+import tempfile
+from datetime import datetime, timedelta
+
+# Thêm thư mục gốc vào sys.path để có thể import các module
+# Add root directory to sys.path to be able to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.persistence.database import DatabaseManager
+from src.persistence.log_exporter import EXPORT_QUERY, LogExporter
+
+class TestLogExporter(unittest.TestCase):
+    """
+    Lớp kiểm thử cho LogExporter
+    Test class for LogExporter
+    """
+
+    def setUp(self):
+        """
+        Chuẩn bị trước mỗi kiểm thử
+        Setup before each test
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.temp_dir.name, 'test.db')
+        db_manager = DatabaseManager(db_path)
+        for index in range(7):
+            db_manager.log_success(f"item-{index}", "Mô tả, có dấu phẩy", "png", "openai", "https://drive.google.com/x")
+        db_manager.log_failure("item-7", "Mô tả", "mp3", "claude", "Lỗi \"quota\"\ndòng 2")
+
+        # Lô nhỏ để kiểm tra việc đọc qua nhiều lô
+        # Small batches to exercise reading across several batches
+        self.exporter = LogExporter(db_path, batch_size=3)
+        self.today = datetime.now().date()
+
+    def tearDown(self):
+        """
+        Dọn dẹp sau mỗi kiểm thử
+        Cleanup after each test
+        """
+        self.temp_dir.cleanup()
+
+    def test_export_ndjson_gzip(self):
+        """
+        Kiểm thử xuất NDJSON nén gzip
+        Test exporting gzip-compressed NDJSON
+        """
+        output_path = self.exporter.export_ndjson(
+            os.path.join(self.temp_dir.name, 'export', 'logs.ndjson'), self.today, self.today, compress=True)
+
+        self.assertTrue(output_path.endswith('logs.ndjson.gz'))
+        with gzip.open(output_path, 'rt', encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f]
+
+        # Trong một ngày, hàng theo thứ tự của chỉ mục (trạng thái, rồi id)
+        # Within a day, rows follow the index order (status, then id)
+        self.assertEqual([row['item_id'] for row in rows], ["item-7"] + [f"item-{index}" for index in range(7)])
+        self.assertEqual(rows[0]['error_message'], "Lỗi \"quota\"\ndòng 2")
+
+    def test_export_query_avoids_temporary_sort(self):
+        """
+        Kiểm thử truy vấn xuất dùng thứ tự của chỉ mục, không sắp xếp tạm
+        Test the export query uses the index order without a temporary sort
+        """
+        conn = sqlite3.connect(self.exporter.db_path)
+        try:
+            plan = conn.execute(f"EXPLAIN QUERY PLAN {EXPORT_QUERY}", ('2025-01-01', '2025-01-31')).fetchall()
+        finally:
+            conn.close()
+
+        details = ' '.join(row[-1] for row in plan)
+        self.assertIn('idx_logs_date_status', details)
+        self.assertNotIn('TEMP B-TREE', details)
+
+    def test_export_csv(self):
+        """
+        Kiểm thử xuất CSV và lọc theo khoảng ngày
+        Test exporting CSV and filtering by date range
+        """
+        output_path = self.exporter.export_csv(
+            os.path.join(self.temp_dir.name, 'logs.csv'), self.today, self.today)
+
+        with open(output_path, encoding='utf-8', newline='') as f:
+            rows = list(csv.DictReader(f))
+
+        self.assertEqual(len(rows), 8)
+        self.assertEqual(rows[-1]['description'], "Mô tả, có dấu phẩy")
+
+        yesterday = self.today - timedelta(days=1)
+        output_path = self.exporter.export_csv(
+            os.path.join(self.temp_dir.name, 'empty.csv'), yesterday, yesterday)
+        with open(output_path, encoding='utf-8') as f:
+            self.assertEqual(len(f.read().splitlines()), 1)
+
+        self.assertIsNone(self.exporter.export(os.path.join(self.temp_dir.name, 'logs.xml'),
+                                               self.today, self.today, 'xml'))
+
+if __name__ == '__main__':
+    unittest.main()
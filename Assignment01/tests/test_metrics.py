@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Kiểm thử cho module monitoring
+Unit tests for monitoring module
+"""
+
+import os
+import sys
+import unittest
+import tempfile
+import subprocess
+
+# Thêm thư mục gốc vào sys.path để có thể import các module
+# Add root directory to sys.path to be able to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.monitoring import MetricsRegistry, NULL_METRICS, TextfileExporter, ImportTimer, render_prometheus_text
+
+class TestMetricsRegistry(unittest.TestCase):
+    """
+    Lớp kiểm thử cho MetricsRegistry
+    Test class for MetricsRegistry
+    """
+
+    def setUp(self):
+        """
+        Chuẩn bị trước mỗi kiểm thử
+        Setup before each test
+        """
+        self.registry = MetricsRegistry()
+
+    def test_span_records_duration_and_errors(self):
+        """
+        Kiểm thử span ghi nhận thời gian và lỗi
+        Test span records duration and errors
+        """
+        with self.registry.span("drive_upload"):
+            pass
+
+        with self.assertRaises(ValueError):
+            with self.registry.span("drive_upload"):
+                raise ValueError("upload failed")
+
+        histogram = self.registry.histograms["pipeline_stage_duration_seconds"]
+        self.assertEqual(histogram.count(stage="drive_upload"), 2)
+        self.assertEqual(self.registry.counters["pipeline_stage_errors_total"].get(stage="drive_upload"), 1)
+
+    def test_span_hook_receives_events(self):
+        """
+        Kiểm thử hook nhận sự kiện span
+        Test span hook receives events
+        """
+        events = []
+        self.registry.add_span_hook(lambda stage, duration, error, labels: events.append((stage, labels)))
+
+        with self.registry.span("ai_generate", model="openai"):
+            pass
+
+        self.assertEqual(events, [("ai_generate", {"model": "openai"})])
+
+    def test_histogram_quantile(self):
+        """
+        Kiểm thử ước lượng phân vị của histogram
+        Test histogram quantile estimation
+        """
+        histogram = self.registry.histogram("latency", buckets=(1.0, 2.0, 4.0))
+        for value in (0.5, 1.5, 1.5, 3.0):
+            histogram.observe(value)
+
+        self.assertAlmostEqual(histogram.quantile(0.5), 1.5)
+        self.assertAlmostEqual(histogram.quantile(1.0), 4.0)
+        self.assertIsNone(histogram.quantile(0.5, stage="missing"))
+
+    def test_null_metrics_is_noop(self):
+        """
+        Kiểm thử registry rỗng không làm gì
+        Test null registry does nothing
+        """
+        with NULL_METRICS.span("process_item"):
+            NULL_METRICS.counter("pipeline_items_total").inc(status="success")
+            NULL_METRICS.histogram("latency").observe(1.0)
+
+    def test_textfile_export(self):
+        """
+        Kiểm thử xuất metric theo định dạng Prometheus
+        Test exporting metrics in Prometheus text format
+        """
+        self.registry.counter("pipeline_items_total", "Items").inc(status="success")
+        self.registry.histogram("latency", buckets=(1.0,)).observe(0.5, stage="db_write")
+
+        text = render_prometheus_text(self.registry)
+        self.assertIn('# TYPE pipeline_items_total counter', text)
+        self.assertIn('pipeline_items_total{status="success"} 1', text)
+        self.assertIn('latency_bucket{stage="db_write",le="1.0"} 1', text)
+        self.assertIn('latency_bucket{stage="db_write",le="+Inf"} 1', text)
+        self.assertIn('latency_count{stage="db_write"} 1', text)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, "automation.prom")
+            self.assertEqual(TextfileExporter(output_path).export(self.registry), output_path)
+            with open(output_path, encoding='utf-8') as f:
+                self.assertEqual(f.read(), text)
+
+            # node_exporter chạy bằng user khác phải đọc được file, và không còn file tạm
+            self.assertEqual(os.stat(output_path).st_mode & 0o777, 0o644)
+            self.assertEqual(os.listdir(temp_dir), ["automation.prom"])
+
+    def test_textfile_export_failure_removes_temp_file(self):
+        """
+        Kiểm thử file tạm bị xóa khi ghi metric thất bại
+        Test the temporary file is removed when writing metrics fails
+        """
+        class BrokenRegistry:
+            @property
+            def counters(self):
+                raise RuntimeError("broken")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, "automation.prom")
+            self.assertIsNone(TextfileExporter(output_path).export(BrokenRegistry()))
+            self.assertEqual(os.listdir(temp_dir), [])
+
+
+class TestImportTimer(unittest.TestCase):
+    """
+    Lớp kiểm thử cho ImportTimer
+    Test class for ImportTimer
+    """
+
+    def setUp(self):
+        """
+        Tạo package tạm với một module con chậm và một module con import lười
+        Create a temporary package with a slow submodule and a lazily imported submodule
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        package_dir = os.path.join(self.temp_dir.name, "timed_pkg")
+        os.makedirs(package_dir)
+
+        with open(os.path.join(package_dir, "__init__.py"), "w", encoding="utf-8") as f:
+            f.write(
+                "import importlib\n"
+                "def __getattr__(name):\n"
+                "    return getattr(importlib.import_module('.lazy', __name__), name)\n"
+            )
+        for module_name in ("slow", "lazy"):
+            with open(os.path.join(package_dir, f"{module_name}.py"), "w", encoding="utf-8") as f:
+                f.write("import time\ntime.sleep(0.02)\nVALUE = 1\n")
+
+        sys.path.insert(0, self.temp_dir.name)
+        self.timer = ImportTimer()
+
+    def tearDown(self):
+        """
+        Gỡ ImportTimer và package tạm
+        Remove the ImportTimer and the temporary package
+        """
+        self.timer.uninstall()
+        sys.path.remove(self.temp_dir.name)
+        for module_name in ("timed_pkg", "timed_pkg.slow", "timed_pkg.lazy"):
+            sys.modules.pop(module_name, None)
+        self.temp_dir.cleanup()
+
+    def test_submodule_of_loaded_package_is_timed(self):
+        """
+        Kiểm thử module con được đo theo tên đầy đủ khi package cha đã được tải
+        Test a submodule is timed by its full name when its parent package is already loaded
+        """
+        import timed_pkg  # noqa: F401
+
+        self.timer.install()
+        import timed_pkg.slow  # noqa: F401
+        self.timer.uninstall()
+
+        self.assertNotIn("timed_pkg", self.timer.timings)
+        self.assertGreaterEqual(self.timer.timings["timed_pkg.slow"], 0.02)
+        self.assertTrue(self.timer.report()[0].endswith("| timed_pkg.slow"))
+
+    def test_lazy_getattr_import_is_timed(self):
+        """
+        Kiểm thử module được tải qua __getattr__ (importlib.import_module) cũng được đo
+        Test a module loaded through __getattr__ (importlib.import_module) is timed too
+        """
+        self.timer.install()
+        import timed_pkg
+        self.assertEqual(timed_pkg.VALUE, 1)
+        self.timer.uninstall()
+
+        self.assertIn("timed_pkg", self.timer.timings)
+        self.assertGreaterEqual(self.timer.timings["timed_pkg.lazy"], 0.02)
+        self.assertGreaterEqual(self.timer.self_timings["timed_pkg.lazy"], 0.02)
+
+    def test_main_times_its_module_level_imports(self):
+        """
+        Kiểm thử --import-report đo cả các import cấp module của main.py
+        Test --import-report also times the module-level imports of main.py
+        """
+        src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+        script = (
+            "import sys\n"
+            "sys.argv = ['main.py', '--import-report']\n"
+            "import main\n"
+            "print(' '.join(main._import_timer.timings))\n"
+        )
+        output = subprocess.run([sys.executable, "-c", script], cwd=src_dir, capture_output=True,
+                                text=True, check=True).stdout.split()
+
+        for module_name in ("notifications", "persistence", "persistence.database"):
+            self.assertIn(module_name, output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Kiểm thử cho module parquet_exporter
+Unit tests for parquet_exporter module
+"""
+
+import os
+import sys
+import unittest
+import tempfile
+import importlib.util
+from datetime import datetime
+
+# Thêm thư mục gốc vào sys.path để có thể import các module
+# Add root directory to sys.path to be able to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.persistence.database import DatabaseManager
+from src.persistence.parquet_exporter import ParquetExporter
+
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+class TestParquetExporter(unittest.TestCase):
+    """
+    Lớp kiểm thử cho ParquetExporter
+    Test class for ParquetExporter
+    """
+
+    def setUp(self):
+        """
+        Chuẩn bị trước mỗi kiểm thử
+        Setup before each test
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_manager = DatabaseManager(os.path.join(self.temp_dir.name, 'test.db'))
+        self.output_dir = os.path.join(self.temp_dir.name, 'parquet')
+        self.exporter = ParquetExporter(self.db_manager.db_path, self.output_dir, batch_size=2)
+
+        for index in range(5):
+            self.db_manager.log_success(f"item-{index}", "Mô tả", "png", "openai",
+                                        "https://drive.google.com/x", duration_ms=100 * index)
+
+    def tearDown(self):
+        """
+        Dọn dẹp sau mỗi kiểm thử
+        Cleanup after each test
+        """
+        self.temp_dir.cleanup()
+
+    @unittest.skipIf(HAS_PYARROW, "pyarrow đã được cài đặt / pyarrow is installed")
+    def test_export_without_pyarrow(self):
+        """
+        Kiểm thử xuất Parquet khi chưa cài pyarrow
+        Test Parquet export when pyarrow is not installed
+        """
+        self.assertIsNone(self.exporter.export())
+        self.assertEqual(self.exporter.get_watermark(), 0)
+        self.assertFalse(os.path.exists(self.output_dir))
+
+    @unittest.skipUnless(HAS_PYARROW, "cần pyarrow / requires pyarrow")
+    def test_incremental_export(self):
+        """
+        Kiểm thử xuất tăng dần theo mốc và phân vùng theo ngày
+        Test incremental export by watermark and date partitioning
+        """
+        import pyarrow.parquet as pq
+
+        first_paths = self.exporter.export()
+        partition = f"date={datetime.now().strftime('%Y-%m-%d')}"
+
+        self.assertEqual(len(first_paths), 1)
+        self.assertEqual(os.path.basename(os.path.dirname(first_paths[0])), partition)
+        self.assertEqual(pq.read_table(first_paths[0]).num_rows, 5)
+        self.assertEqual(self.exporter.get_watermark(), 5)
+
+        # Không có hàng mới thì không ghi file nào
+        # Nothing is written when there are no new rows
+        self.assertEqual(self.exporter.export(), [])
+
+        self.db_manager.log_failure("item-5", "Mô tả", "mp3", "claude", "Quota exceeded")
+        second_paths = self.exporter.export()
+
+        table = pq.read_table(second_paths[0])
+        self.assertEqual(table.column('item_id').to_pylist(), ["item-5"])
+        self.assertEqual(table.column('duration_ms').to_pylist(), [None])
+        self.assertEqual(self.exporter.get_watermark(), 6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Kiểm thử cho module pdf_report_generator
+Unit tests for pdf_report_generator module
+"""
+
+import os
+import sys
+import unittest
+import tempfile
+from datetime import date, datetime
+
+# Thêm thư mục gốc vào sys.path để có thể import các module
+# Add root directory to sys.path to be able to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from reportlab.platypus import Spacer
+
+from src.generators.pdf_report_generator import PDFReportGenerator, _StreamingDocTemplate
+from src.persistence.database import DatabaseManager
+
+class TestPDFReportGenerator(unittest.TestCase):
+    """
+    Lớp kiểm thử cho PDFReportGenerator
+    Test class for PDFReportGenerator
+    """
+
+    def setUp(self):
+        """
+        Chuẩn bị trước mỗi kiểm thử
+        Setup before each test
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.pdf_generator = PDFReportGenerator()
+
+    def tearDown(self):
+        """
+        Dọn dẹp sau mỗi kiểm thử
+        Cleanup after each test
+        """
+        self.temp_dir.cleanup()
+
+    def test_streaming_doc_template_loads_flowables_lazily(self):
+        """
+        Kiểm thử tài liệu chỉ lấy thêm flowable từ iterator khi cần
+        Test the document only pulls flowables from the iterator when needed
+        """
+        consumed = []
+        pulled_when_drawn = []
+
+        class RecordingSpacer(Spacer):
+            def draw(self):
+                pulled_when_drawn.append(len(consumed))
+
+        def flowables():
+            for index in range(50):
+                consumed.append(index)
+                yield RecordingSpacer(1, 100)
+
+        doc = _StreamingDocTemplate(os.path.join(self.temp_dir.name, 'streamed.pdf'), min_buffered=2)
+        doc.build_streaming(flowables())
+
+        self.assertEqual(len(pulled_when_drawn), 50)
+        # Khi flowable thứ i được vẽ, iterator chỉ đi trước tối đa min_buffered phần tử
+        # When flowable i is drawn, the iterator is at most min_buffered items ahead
+        for index, pulled in enumerate(pulled_when_drawn):
+            self.assertLessEqual(pulled, index + 3)
+
+    def test_daily_report_streams_rows_from_database(self):
+        """
+        Kiểm thử báo cáo PDF đọc logs theo luồng từ cơ sở dữ liệu
+        Test the PDF report streams logs from the database
+        """
+        db_manager = DatabaseManager(os.path.join(self.temp_dir.name, 'test.db'))
+        for index in range(25):
+            db_manager.log_success(f"item-{index}", "Mô tả", "png", "openai", "https://drive.google.com/x")
+
+        log_rows = db_manager.iter_logs_by_date(datetime.now().date(), batch_size=4)
+        output_path = self.pdf_generator.generate_daily_report(
+            {'date': '01/06/2025', 'total_count': 25, 'success_count': 25},
+            os.path.join(self.temp_dir.name, 'report.pdf'),
+            log_rows=log_rows,
+            chunk_size=10
+        )
+
+        self.assertTrue(os.path.exists(output_path))
+        # Generator đã được duyệt hết và kết nối đã đóng
+        # The generator is exhausted and the connection is closed
+        self.assertIsNone(next(log_rows, None))
+
+    def test_daily_report_without_logs(self):
+        """
+        Kiểm thử báo cáo PDF khi không có log nào
+        Test the PDF report without any logs
+        """
+        output_path = self.pdf_generator.generate_daily_report(
+            {'date': '01/06/2025'},
+            os.path.join(self.temp_dir.name, 'empty')
+        )
+
+        self.assertTrue(output_path.endswith('empty.pdf'))
+        self.assertTrue(os.path.exists(output_path))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Kiểm thử cho module report_generator
+Unit tests for report_generator module
+"""
+
+import os
+import sys
+import unittest
+import json
+import tempfile
+from unittest import mock
+from dataclasses import FrozenInstanceError
+from datetime import datetime
+
+# Thêm thư mục gốc vào sys.path để có thể import các module
+# Add root directory to sys.path to be able to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.generators.report_generator import ReportGenerator, normalize_error_message
+from src.generators.html_report_generator import HTMLReportGenerator
+from src.persistence.database import DatabaseManager
+
+class TestReportGenerator(unittest.TestCase):
+    """
+    Lớp kiểm thử cho ReportGenerator
+    Test class for ReportGenerator
+    """
+
+    def setUp(self):
+        """
+        Chuẩn bị trước mỗi kiểm thử
+        Setup before each test
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'test.db')
+        self.db_manager = DatabaseManager(self.db_path)
+        self.report_generator = ReportGenerator(self.db_path, os.path.join(self.temp_dir.name, 'reports'),
+                                                db_manager=self.db_manager)
+        self.today = datetime.now().date()
+
+        for index in range(6):
+            self.db_manager.log_success(f"ok-{index}", "Mô tả", "png", "openai",
+                                        "https://drive.google.com/x", duration_ms=100)
+        for index in range(4):
+            self.db_manager.log_failure(f"timeout-{index}", "Mô tả", "png", "openai",
+                                        f"Timeout after {30 + index} seconds for request {index}",
+                                        duration_ms=1000 * (index + 1))
+        self.db_manager.log_failure("quota", "Mô tả", "mp3", "claude", "Quota exceeded", duration_ms=50)
+
+    def tearDown(self):
+        """
+        Dọn dẹp sau mỗi kiểm thử
+        Cleanup after each test
+        """
+        self.temp_dir.cleanup()
+
+    def test_normalize_error_message(self):
+        """
+        Kiểm thử chuẩn hóa thông báo lỗi
+        Test error message normalization
+        """
+        self.assertEqual(normalize_error_message("Timeout after 30 seconds for request 42"),
+                         "Timeout after <n> seconds for request <n>")
+        self.assertEqual(normalize_error_message("Upload to https://drive.google.com/a?b=1 failed: 'x.png'"),
+                         "Upload to <url> failed: <str>")
+        self.assertIsNone(normalize_error_message(None))
+
+    def test_daily_stats_include_average_duration(self):
+        """
+        Kiểm thử thống kê hàng ngày có thời gian xử lý trung bình
+        Test daily stats include the average duration
+        """
+        stats = self.report_generator._fetch_daily_stats(self.today)
+
+        self.assertEqual(stats['total_count'], 11)
+        self.assertEqual(stats['success_count'], 6)
+        self.assertEqual(stats['failure_count'], 5)
+        self.assertAlmostEqual(stats['avg_duration_ms'], (600 + 10000 + 50) / 11)
+
+    def test_failure_clusters_and_top_failures(self):
+        """
+        Kiểm thử gom nhóm lỗi và lấy các lỗi tiêu biểu bằng SQL
+        Test failure clustering and top failures in SQL
+        """
+        clusters = self.report_generator._fetch_failure_clusters(self.today)
+
+        self.assertEqual([(c['signature'], c['count']) for c in clusters],
+                         [("Timeout after <n> seconds for request <n>", 4), ("Quota exceeded", 1)])
+
+        slowest = self.report_generator._fetch_top_failures(self.today, 'duration', 2)
+        self.assertEqual([f['item_id'] for f in slowest], ['timeout-3', 'timeout-2'])
+
+        recent = self.report_generator._fetch_top_failures(self.today, 'recent', 1)
+        self.assertEqual(recent[0]['item_id'], 'quota')
+
+    def test_report_data_is_shared_by_every_format(self):
+        """
+        Kiểm thử dữ liệu báo cáo bất biến được dùng cho PDF, HTML và JSON
+        Test the immutable report data feeds PDF, HTML and JSON
+        """
+        report_data = self.report_generator.build_daily_report_data(self.today)
+
+        with self.assertRaises(FrozenInstanceError):
+            report_data.total_count = 0
+        self.assertEqual(len(report_data.logs), 11)
+
+        output_dir = os.path.join(self.temp_dir.name, 'out')
+        html_path = HTMLReportGenerator(chart_backend='svg').generate_daily_report(
+            report_data.as_dict(), os.path.join(output_dir, 'daily.html'))
+        json_path = self.report_generator.pdf_generator.export_data_to_file(
+            report_data.as_dict(), os.path.join(output_dir, 'daily.json'))
+
+        with open(html_path, encoding='utf-8') as f:
+            self.assertIn('quota', f.read())
+        with open(json_path, encoding='utf-8') as f:
+            exported = json.load(f)
+        self.assertEqual(exported['total_count'], 11)
+        self.assertEqual(exported['logs'][-1]['item_id'], 'quota')
+
+    def test_daily_and_weekly_pdf_reports(self):
+        """
+        Kiểm thử tạo báo cáo PDF hàng ngày và hàng tuần
+        Test generating the daily and weekly PDF reports
+        """
+        daily_path = self.report_generator.generate_daily_report()
+        weekly_path = self.report_generator.generate_weekly_report()
+
+        self.assertTrue(os.path.exists(daily_path))
+        self.assertTrue(os.path.exists(weekly_path))
+
+    def test_multi_format_report(self):
+        """
+        Kiểm thử tạo báo cáo nhiều định dạng từ một lần đọc dữ liệu
+        Test generating several formats from a single data fetch
+        """
+        with mock.patch.object(self.db_manager, 'iter_logs_by_date',
+                               wraps=self.db_manager.iter_logs_by_date) as iter_logs, \
+                mock.patch.object(self.report_generator.chart_generator, 'generate_daily_chart',
+                                  wraps=self.report_generator.chart_generator.generate_daily_chart) as render_chart:
+            report_paths = self.report_generator.generate_daily_report(formats=['pdf', 'html', 'json'])
+
+        self.assertEqual(iter_logs.call_count, 1)
+        self.assertEqual(render_chart.call_count, 1)
+        self.assertEqual(sorted(report_paths), ['html', 'json', 'pdf'])
+        for fmt, report_path in report_paths.items():
+            self.assertTrue(report_path.endswith(f".{fmt}"))
+            self.assertTrue(os.path.exists(report_path))
+
+        self.assertIsNone(self.report_generator.generate_daily_report(formats=['docx']))
+
+    def test_full_pdf_streams_logs_from_cursor(self):
+        """
+        Kiểm thử báo cáo PDF đọc logs theo luồng mà không nạp chúng vào dữ liệu báo cáo
+        Test the PDF report streams logs without loading them into the report data
+        """
+        streamed = []
+        iter_logs_by_date = self.db_manager.iter_logs_by_date
+
+        def iter_daily_logs(date):
+            for row in iter_logs_by_date(date, batch_size=2):
+                streamed.append(row['item_id'])
+                yield row
+
+        with mock.patch.object(self.report_generator, '_fetch_daily_logs') as fetch_logs, \
+                mock.patch.object(self.report_generator, '_fetch_failure_clusters') as fetch_clusters, \
+                mock.patch.object(self.report_generator, '_fetch_top_failures') as fetch_top_failures, \
+                mock.patch.object(self.db_manager, 'iter_logs_by_date', side_effect=iter_daily_logs):
+            report_path = self.report_generator.generate_daily_report()
+
+        fetch_logs.assert_not_called()
+        fetch_clusters.assert_not_called()
+        fetch_top_failures.assert_not_called()
+        self.assertTrue(os.path.exists(report_path))
+        self.assertEqual(len(streamed), 11)
+
+    def test_svg_chart_backend_skips_png_chart(self):
+        """
+        Kiểm thử backend 'svg' nhúng SVG vào HTML và không vẽ biểu đồ PNG khi không cần
+        Test the 'svg' backend inlines SVG into HTML and skips the PNG chart when unused
+        """
+        report_generator = ReportGenerator(self.db_path, os.path.join(self.temp_dir.name, 'svg_reports'),
+                                           chart_backend='svg', db_manager=self.db_manager)
+        with mock.patch.object(report_generator.chart_generator, 'generate_daily_chart') as render_chart:
+            report_paths = report_generator.generate_daily_report(formats=['html', 'json'])
+
+        render_chart.assert_not_called()
+        with open(report_paths['html'], encoding='utf-8') as f:
+            self.assertIn('<svg', f.read())
+
+    def test_summary_report(self):
+        """
+        Kiểm thử tạo báo cáo tóm tắt và từ chối chế độ không hợp lệ
+        Test generating the summary report and rejecting an invalid mode
+        """
+        report_path = self.report_generator.generate_daily_report(mode='summary', top_n=3)
+
+        self.assertTrue(os.path.basename(report_path).startswith('report_summary_'))
+        self.assertTrue(os.path.exists(report_path))
+        self.assertIsNone(self.report_generator.generate_daily_report(mode='everything'))
+
+if __name__ == '__main__':
+    unittest.main()
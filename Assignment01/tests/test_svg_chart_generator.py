@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Kiểm thử cho module svg_chart_generator và backend SVG của HTMLReportGenerator
+Unit tests for svg_chart_generator module and the SVG backend of HTMLReportGenerator
+"""
+
+import os
+import sys
+import unittest
+import tempfile
+import xml.etree.ElementTree as ET
+from datetime import date
+
+# Thêm thư mục gốc vào sys.path để có thể import các module
+# Add root directory to sys.path to be able to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.generators.svg_chart_generator import SVGChartGenerator
+from src.generators.html_report_generator import HTMLReportGenerator
+
+SVG_NS = '{http://www.w3.org/2000/svg}'
+
+class TestSVGChartGenerator(unittest.TestCase):
+    """
+    Lớp kiểm thử cho SVGChartGenerator
+    Test class for SVGChartGenerator
+    """
+
+    def setUp(self):
+        """
+        Chuẩn bị trước mỗi kiểm thử
+        Setup before each test
+        """
+        self.svg_chart_generator = SVGChartGenerator()
+        self.stats_data = [
+            {'date': '2025-06-01', 'success_count': 8, 'failure_count': 2, 'success_rate': 80.0},
+            {'date': '2025-06-02', 'success_count': 0, 'failure_count': 0, 'success_rate': 0},
+            {'date': '2025-06-03', 'success_count': 5, 'failure_count': 5, 'success_rate': 50.0}
+        ]
+
+    def test_daily_chart_is_valid_svg(self):
+        """
+        Kiểm thử biểu đồ hàng ngày là SVG hợp lệ với hai cột và hai lát
+        Test the daily chart is valid SVG with two bars and two slices
+        """
+        root = ET.fromstring(self.svg_chart_generator.generate_daily_chart(date(2025, 6, 1), 8, 2))
+
+        self.assertEqual(root.tag, f"{SVG_NS}svg")
+        self.assertEqual(len(root.findall(f"{SVG_NS}path")), 2)
+        self.assertIn("80.0%", ''.join(root.itertext()))
+
+    def test_daily_chart_handles_single_and_empty_categories(self):
+        """
+        Kiểm thử trường hợp chỉ có một loại hoặc không có dữ liệu
+        Test single category and empty data cases
+        """
+        root = ET.fromstring(self.svg_chart_generator.generate_daily_chart(date(2025, 6, 1), 3, 0))
+        self.assertEqual(len(root.findall(f"{SVG_NS}circle")), 1)
+
+        root = ET.fromstring(self.svg_chart_generator.generate_daily_chart("01/06/2025", 0, 0))
+        self.assertIn("Không có dữ liệu", ''.join(root.itertext()))
+
+    def test_weekly_chart_escapes_and_plots_every_day(self):
+        """
+        Kiểm thử biểu đồ tuần vẽ đủ các ngày
+        Test the weekly chart plots every day
+        """
+        svg = self.svg_chart_generator.generate_weekly_chart(date(2025, 6, 1), date(2025, 6, 3), self.stats_data)
+        root = ET.fromstring(svg)
+
+        polyline = root.find(f"{SVG_NS}polyline")
+        self.assertEqual(len(polyline.get('points').split()), 3)
+        self.assertIsNone(self.svg_chart_generator.generate_weekly_chart(date(2025, 6, 1), date(2025, 6, 3), []))
+
+    def test_html_report_inlines_svg(self):
+        """
+        Kiểm thử báo cáo HTML với backend SVG nhúng biểu đồ nội tuyến
+        Test the HTML report with the SVG backend inlines the chart
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            html_generator = HTMLReportGenerator(chart_backend='svg')
+            output_path = html_generator.generate_weekly_report(
+                {'start_date': '2025-06-01', 'end_date': '2025-06-03', 'daily_stats': self.stats_data},
+                os.path.join(temp_dir, 'weekly.html')
+            )
+
+            with open(output_path, encoding='utf-8') as f:
+                html_content = f.read()
+
+            self.assertIn('<svg xmlns="http://www.w3.org/2000/svg"', html_content)
+            self.assertNotIn('<img', html_content)
+            self.assertFalse(os.path.exists(os.path.join(temp_dir, 'charts')))
+
+        with self.assertRaises(ValueError):
+            HTMLReportGenerator(chart_backend='gif')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Kiểm thử cho module template_registry
+Unit tests for template_registry module
+"""
+
+import os
+import sys
+import unittest
+import tempfile
+
+# Thêm thư mục gốc vào sys.path để có thể import các module
+# Add root directory to sys.path to be able to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import config
+from src.generators.template_registry import get_template, get_template_environment
+from src.generators.html_report_generator import HTMLReportGenerator
+
+class TestTemplateRegistry(unittest.TestCase):
+    """
+    Lớp kiểm thử cho template_registry
+    Test class for template_registry
+    """
+
+    def test_templates_are_compiled_once(self):
+        """
+        Kiểm thử môi trường và template được dùng lại giữa các lần gọi
+        Test the environment and templates are reused across calls
+        """
+        self.assertIs(get_template_environment(), get_template_environment())
+        self.assertIs(get_template('daily_report.html'), get_template('daily_report.html'))
+        self.assertIs(HTMLReportGenerator().template_env, HTMLReportGenerator().template_env)
+
+    def test_cache_dir_comes_from_settings(self):
+        """
+        Kiểm thử thư mục bộ nhớ đệm bytecode được lấy từ Settings, không từ biến môi trường lúc import
+        Test the bytecode cache directory comes from Settings, not the environment at import time
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_dir = os.path.join(temp_dir, 'template_cache')
+            settings = config.load_settings(environ={'REPORT_TEMPLATE_CACHE_DIR': cache_dir})
+            self.assertEqual(settings.template_cache_dir, cache_dir)
+
+            generator = HTMLReportGenerator(template_cache_dir=settings.template_cache_dir)
+            self.assertIs(generator.template_env, get_template_environment(cache_dir))
+            self.assertIsNot(generator.template_env, get_template_environment())
+
+            generator.generate_custom_report("Báo cáo", [], os.path.join(temp_dir, 'custom'))
+            self.assertTrue(os.listdir(cache_dir))
+
+    def test_custom_report_uses_template_file(self):
+        """
+        Kiểm thử báo cáo tùy chỉnh được dựng từ file template
+        Test the custom report is rendered from the template file
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = HTMLReportGenerator().generate_custom_report(
+                "Báo cáo <tùy chỉnh>",
+                [{'title': "Phần 1", 'content': "<b>Nội dung</b>",
+                  'data_table': {'headers': ["A", "B"], 'rows': [[1, 2]]}}],
+                os.path.join(temp_dir, 'custom')
+            )
+
+            with open(output_path, encoding='utf-8') as f:
+                html_content = f.read()
+
+        self.assertIn("Báo cáo &lt;tùy chỉnh&gt;", html_content)
+        self.assertIn("<b>Nội dung</b>", html_content)
+        self.assertIn("<td>2</td>", html_content)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Supported color spaces: OpenCV conversion from BGR, channel names and value range per channel
+COLOR_SPACES: Dict[str, Tuple[int, Tuple[str, str, str], Tuple[int, int, int]]] = {
+    "bgr": (-1, ("Blue", "Green", "Red"), (256, 256, 256)),
+    "hsv": (cv2.COLOR_BGR2HSV, ("Hue", "Saturation", "Value"), (180, 256, 256)),  # 8-bit hue is 0-179
+    "lab": (cv2.COLOR_BGR2LAB, ("L", "a", "b"), (256, 256, 256))
+}
+
+
+def compute_histograms(image: np.ndarray,
+                       color_space: str = "bgr",
+                       bins: int = 256,
+                       mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Compute the histogram of every channel of an image
+
+    Args:
+        image: Image in BGR format
+        color_space: Color space to compute histograms in, one of COLOR_SPACES
+        bins: Number of bins per channel
+        mask: Optional uint8 mask, only nonzero pixels are counted
+
+    Returns:
+        Raw counts as a float32 array of shape (3, bins)
+    """
+    if color_space not in COLOR_SPACES:
+        raise ValueError(f"Unknown color space: {color_space}. Available: {', '.join(COLOR_SPACES)}")
+
+    conversion, _, ranges = COLOR_SPACES[color_space]
+    if conversion >= 0:
+        image = cv2.cvtColor(image, conversion)
+
+    # calcHist per channel reads the interleaved image directly and is several times faster
+    # than a single np.bincount over all channels, which needs an offset copy of every pixel
+    return np.stack([
+        cv2.calcHist([image], [channel], mask, [bins], [0, ranges[channel]]).reshape(-1)
+        for channel in range(3)
+    ])
+
+
+def normalize_histograms(histograms: np.ndarray) -> np.ndarray:
+    """
+    Min-max normalize histograms to [0, 1] along the bin axis, like cv2.NORM_MINMAX
+
+    Args:
+        histograms: Array of shape (..., bins)
+
+    Returns:
+        Normalized float32 array of the same shape (constant histograms become zeros)
+    """
+    histograms = histograms.astype(np.float32)
+    minimum = histograms.min(axis=-1, keepdims=True)
+    spread = histograms.max(axis=-1, keepdims=True) - minimum
+
+    scale = np.divide(1.0, spread, out=np.zeros_like(spread), where=spread > 0)
+    return (histograms - minimum) * scale
+
+
+def center_histograms(histograms: np.ndarray) -> np.ndarray:
+    """
+    Normalize histograms and subtract each histogram's mean, ready for correlation
+
+    Args:
+        histograms: Array of shape (..., bins)
+
+    Returns:
+        Normalized, mean-centered float64 array of the same shape
+    """
+    centered = normalize_histograms(histograms).astype(np.float64)
+    centered -= centered.mean(axis=-1, keepdims=True)
+    return centered
+
+
+def stack_histograms(histograms_list: List[np.ndarray]) -> np.ndarray:
+    """
+    Stack the histograms of many images into a reference matrix for score_histograms
+
+    The histograms are normalized and mean-centered once here, so scoring against the
+    matrix only costs the correlation itself.
+
+    Args:
+        histograms_list: Histograms of shape (3, bins) from compute_histograms
+
+    Returns:
+        Array of shape (number of images, 3, bins)
+    """
+    return center_histograms(np.stack(histograms_list))
+
+
+def score_histograms(histograms: np.ndarray, reference_matrix: np.ndarray) -> np.ndarray:
+    """
+    Score one image's histograms against a matrix of reference histograms at once
+
+    The score per reference is the correlation of each channel's histograms
+    (cv2.HISTCMP_CORREL), averaged over the channels.
+
+    Args:
+        histograms: Histograms of shape (3, bins)
+        reference_matrix: Reference matrix of shape (references, 3, bins) from stack_histograms
+
+    Returns:
+        Array of shape (references,) with values from -1.0 to 1.0 (1.0 means identical)
+    """
+    centered = center_histograms(histograms)
+
+    numerator = np.einsum("cb,rcb->rc", centered, reference_matrix)
+    denominator = np.sqrt(
+        (centered * centered).sum(axis=-1) * np.einsum("rcb,rcb->rc", reference_matrix, reference_matrix)
+    )
+
+    # Like OpenCV, a channel with no variance in either histogram counts as a perfect match
+    correlation = np.divide(numerator, denominator, out=np.ones_like(numerator), where=denominator > 0)
+    return correlation.mean(axis=-1)
+
+
+def compare_histograms(histograms1: np.ndarray, histograms2: np.ndarray) -> float:
+    """
+    Score the histograms of two images
+
+    Args:
+        histograms1: Histograms of the first image, shape (3, bins)
+        histograms2: Histograms of the second image, shape (3, bins)
+
+    Returns:
+        Histogram similarity (1.0 means identical)
+    """
+    return float(score_histograms(histograms1, stack_histograms([histograms2]))[0])
@@ -102,6 +102,54 @@ VALIDATION_THRESHOLDS = {
     }
 }
 
+# Cấu hình SSIM nhanh trên ảnh thu nhỏ (chế độ xấp xỉ, tắt mặc định)
+# Khi bật, điểm trên ảnh thu nhỏ được dùng ngay nếu đã thấp hơn hẳn ngưỡng reject; các trường hợp khác tính lại đầy đủ.
+# Không có gì bảo đảm kết luận giống độ phân giải đầy đủ: với chi tiết mịn (ví dụ hoa văn 1 pixel) SSIM thu nhỏ
+# có thể thấp hơn rất nhiều, nên một ảnh "excellent" có thể bị reject. Chỉ bật khi sàng lọc nhanh chấp nhận sai lệch này
+# Chỉ tăng tốc các ảnh bị reject rõ ràng: ảnh đạt hoặc gần ngưỡng phải tính cả SSIM thu nhỏ lẫn SSIM đầy đủ nên
+# chậm hơn khi tắt. Chỉ có lợi khi sàng lọc các lô có phần lớn ảnh bị loại
+SSIM_FAST_PATH = {
+    "enabled": False,
+    "pyramid_levels": 1,  # Số lần thu nhỏ một nửa trước khi tính SSIM nhanh
+    "margin": 0.1         # Chỉ dùng điểm nhanh khi thấp hơn ngưỡng reject ít nhất giá trị này
+}
+
+# Cấu hình biểu đồ màu dùng cho chỉ số color_match
+COLOR_HISTOGRAM = {
+    "color_space": "bgr",  # Không gian màu: "bgr", "hsv" hoặc "lab"
+    "bins": 256            # Số khoảng (bin) trên mỗi kênh
+}
+
+# So sánh theo kênh alpha cho tài sản nền trong suốt
+# Các chỉ số chỉ tính trên vùng tiền cảnh (alpha lớn hơn ngưỡng) và ảnh được cắt theo khung bao chung của tiền cảnh;
+# ảnh không có kênh alpha hoặc hoàn toàn đục được so sánh như trước
+ALPHA_COMPARISON = {
+    "enabled": True,
+    "alpha_threshold": 8,  # Điểm ảnh có alpha lớn hơn giá trị này thuộc tiền cảnh
+    "crop_padding": 4      # Số điểm ảnh giữ thêm quanh khung bao để không mất đường viền
+}
+
+# Chế độ tạo hình minh họa so sánh khi xác thực
+# "always": mọi tài sản; "borderline": chỉ tài sản reject hoặc acceptable;
+# "on_demand": không tạo khi xác thực, tạo sau bằng "python src/validation.py --visualize <thư_mục_kết_quả>"
+VISUALIZATION_MODE = "borderline"
+
+# Cấu hình xác thực song song
+# Số tiến trình dùng để xác thực theo lô, mặc định bằng số lõi CPU
+VALIDATION_WORKERS = int(os.getenv("VALIDATION_WORKERS", os.cpu_count() or 1))
+# Các đuôi tệp ảnh được nhận khi xác thực cả một thư mục
+IMAGE_EXTENSIONS = [".png", ".jpg", ".jpeg", ".webp", ".bmp"]
+
+# Cấu hình chỉ mục băm cảm nhận (perceptual hash) để tìm ảnh gần trùng lặp
+PHASH_METHOD = "phash"  # Thuật toán băm: "ahash", "dhash" hoặc "phash"
+PHASH_DUPLICATE_DISTANCE = 6  # Khoảng cách Hamming tối đa (trên 64 bit) để coi hai ảnh là gần trùng lặp
+PHASH_INDEX_DIR = os.path.join(VALIDATION_DIR, "phash_index")  # Thư mục lưu chỉ mục của từng thư mục ảnh
+
+# Bộ nhớ đệm đặc trưng của ảnh tham chiếu (tệp .npy được đọc bằng ánh xạ bộ nhớ)
+# Mỗi ảnh được nhận diện bằng đường dẫn, thời điểm sửa đổi và kích thước; mục cũ bị xóa khi ảnh thay đổi
+FEATURE_CACHE_ENABLED = True
+FEATURE_CACHE_DIR = os.path.join(VALIDATION_DIR, "feature_cache")
+
 # Đảm bảo tất cả các thư mục cần thiết đều tồn tại
 # Tự động tạo thư mục nếu chưa có để tránh lỗi khi chạy chương trình
 for dir_path in [PROMPTS_DIR, REFERENCE_DIR, GENERATED_DIR, VALIDATION_DIR]:
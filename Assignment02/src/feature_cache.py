@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import shutil
+import hashlib
+from typing import Dict, Optional
+
+import numpy as np
+
+import config
+
+
+class FeatureCache:
+    """
+    On-disk cache of per-image arrays stored as .npy files and read back memory-mapped
+
+    Each source image gets an entry directory keyed by its absolute path. The entry
+    records the file's mtime and size, and is discarded as soon as either changes.
+    Inside an entry, arrays are grouped into named variants (for example the decoded
+    image, or the features computed at one target size).
+    """
+
+    def __init__(self, cache_dir: str = config.FEATURE_CACHE_DIR):
+        """
+        Initialize the feature cache
+
+        Args:
+            cache_dir: Directory holding the cache entries
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def load(self, image_path: str, variant: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Load the cached arrays of an image variant without copying them into memory
+
+        Args:
+            image_path: Path to the source image
+            variant: Name of the variant
+
+        Returns:
+            Dictionary of read-only memory-mapped arrays, or None if not cached or stale
+        """
+        entry_dir = self._valid_entry_dir(image_path)
+        if entry_dir is None:
+            return None
+
+        variant_dir = os.path.join(entry_dir, variant)
+        if not os.path.isdir(variant_dir):
+            return None
+
+        try:
+            return {
+                file_name[:-len(".npy")]: np.load(os.path.join(variant_dir, file_name), mmap_mode="r")
+                for file_name in os.listdir(variant_dir)
+                if file_name.endswith(".npy")
+            }
+        except (OSError, ValueError) as e:
+            print(f"Warning: discarding unreadable feature cache for {image_path}: {e}")
+            shutil.rmtree(variant_dir, ignore_errors=True)
+            return None
+
+    def store(self, image_path: str, variant: str, arrays: Dict[str, np.ndarray]) -> None:
+        """
+        Store the arrays of an image variant
+
+        The variant is written to a temporary directory and renamed into place, so
+        readers never see a partially written variant.
+
+        Args:
+            image_path: Path to the source image
+            variant: Name of the variant
+            arrays: Arrays to store by name
+        """
+        stat = os.stat(image_path)
+        entry_dir = self._entry_dir(image_path)
+
+        if self._valid_entry_dir(image_path) is None:
+            os.makedirs(entry_dir, exist_ok=True)
+            self._write_meta(entry_dir, {
+                "path": os.path.abspath(image_path),
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size
+            })
+
+        variant_dir = os.path.join(entry_dir, variant)
+        temp_dir = f"{variant_dir}.tmp{os.getpid()}"
+        os.makedirs(temp_dir, exist_ok=True)
+        try:
+            for name, array in arrays.items():
+                np.save(os.path.join(temp_dir, f"{name}.npy"), np.ascontiguousarray(array))
+
+            if os.path.isdir(variant_dir):
+                shutil.rmtree(variant_dir, ignore_errors=True)
+            os.replace(temp_dir, variant_dir)
+        except OSError as e:
+            # Another process may have stored the same variant first; its copy is as good as ours
+            print(f"Warning: could not store feature cache for {image_path}: {e}")
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def prune(self) -> int:
+        """
+        Remove entries whose source image was deleted or changed
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        for entry_name in os.listdir(self.cache_dir):
+            meta_path = os.path.join(self.cache_dir, entry_name, "meta.json")
+            if not os.path.exists(meta_path):
+                continue
+
+            try:
+                with open(meta_path, "r") as f:
+                    image_path = json.load(f)["path"]
+            except (OSError, ValueError, KeyError):
+                continue
+
+            if self._valid_entry_dir(image_path) is None and not os.path.exists(meta_path):
+                removed += 1
+
+        return removed
+
+    def _write_meta(self, entry_dir: str, meta: Dict) -> None:
+        """
+        Write the metadata of an entry atomically
+
+        Parallel validation workers share the cache, so meta.json is written to a
+        temporary file and renamed into place; readers see either no file or a complete one.
+
+        Args:
+            entry_dir: Path of the entry directory
+            meta: Metadata of the source image
+        """
+        meta_path = os.path.join(entry_dir, "meta.json")
+        temp_path = f"{meta_path}.tmp{os.getpid()}"
+        try:
+            with open(temp_path, "w") as f:
+                json.dump(meta, f)
+            os.replace(temp_path, meta_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _entry_dir(self, image_path: str) -> str:
+        """
+        Get the entry directory of an image
+
+        Args:
+            image_path: Path to the source image
+
+        Returns:
+            Path of the entry directory
+        """
+        key = hashlib.sha1(os.path.abspath(image_path).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key)
+
+    def _valid_entry_dir(self, image_path: str) -> Optional[str]:
+        """
+        Get the entry directory of an image if it matches the image's current mtime and size
+
+        An entry is only deleted when the image was removed or its mtime or size no
+        longer match. An entry whose metadata cannot be read is treated as missing but
+        kept, since another process may be writing it.
+
+        Args:
+            image_path: Path to the source image
+
+        Returns:
+            Path of the entry directory, or None if there is no valid entry
+        """
+        entry_dir = self._entry_dir(image_path)
+        meta_path = os.path.join(entry_dir, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+            mtime_ns, size = meta["mtime_ns"], meta["size"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+        try:
+            stat = os.stat(image_path)
+            if mtime_ns == stat.st_mtime_ns and size == stat.st_size:
+                return entry_dir
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return None
+
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        return None
@@ -4,19 +4,246 @@
 import os
 import cv2
 import numpy as np
-from typing import Dict, List, Optional, Tuple
-import matplotlib.pyplot as plt
-from skimage.metrics import structural_similarity as ssim
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import config
+from color_histograms import COLOR_SPACES, compute_histograms, compare_histograms
+from feature_cache import FeatureCache
+
+# Canny hysteresis thresholds shared by the edge metric and the edge visualization
+CANNY_THRESHOLDS = (100, 200)
+
+# SSIM parameters, matching the defaults of skimage.metrics.structural_similarity for uint8 images
+SSIM_WIN_SIZE = 7
+SSIM_K1 = 0.01
+SSIM_K2 = 0.03
+SSIM_DATA_RANGE = 255.0
+
+# Metrics from cheapest to most expensive, the order used when stopping at the first reject
+METRIC_EVALUATION_ORDER = ("color_match", "edge_accuracy", "ssim")
+
+# Order of the metrics in the returned results
+METRIC_NAMES = ("ssim", "color_match", "edge_accuracy")
+
+# Visualization layout: title bar height and gap between panels in pixels, histogram plot (width, height)
+VISUALIZATION_TITLE_HEIGHT = 40
+VISUALIZATION_GAP = 10
+
+# Longest side of image panels in visualizations, about the size matplotlib figures used to show
+VISUALIZATION_MAX_SIZE = 600
+HISTOGRAM_PLOT_SIZE = (512, 160)
+
+# Histogram line colors (BGR) for the blue, green and red channels, and for other color spaces
+HISTOGRAM_PLOT_COLORS = ((255, 0, 0), (0, 160, 0), (0, 0, 255))
+HISTOGRAM_DEFAULT_COLOR = (60, 60, 60)
+
+# PNG compression level of visualizations: low levels write several times faster for slightly larger files
+VISUALIZATION_PNG_COMPRESSION = 1
+
+
+def _padded_span(start: int, length: int, padding: int, limit: int) -> slice:
+    """
+    Pad a span along one image axis, keeping it inside the image and at least one SSIM window long
+
+    Args:
+        start: First pixel of the span
+        length: Number of pixels in the span
+        padding: Pixels to add on both sides
+        limit: Size of the image along the axis
+
+    Returns:
+        Slice of the padded span
+    """
+    low = max(0, start - padding)
+    high = min(limit, start + length + padding)
+
+    low = max(0, min(low, high - SSIM_WIN_SIZE))
+    high = min(limit, max(high, low + SSIM_WIN_SIZE))
+    return slice(low, high)
+
+
+@dataclass
+class SSIMStatistics:
+    """
+    SSIM window statistics of one grayscale image at one resolution
+    """
+    gray_float: np.ndarray  # Grayscale as float64, used for the SSIM cross term
+    local_mean: np.ndarray  # SSIM window mean of the grayscale image
+    local_var: np.ndarray   # SSIM window sample variance of the grayscale image
+
+
+@dataclass
+class ImageFeatures:
+    """
+    Per-image data computed once and shared by every metric and visualization
+    """
+    bgr: np.ndarray
+    gray: np.ndarray
+    edges: np.ndarray
+    histograms: np.ndarray  # Raw counts per channel, shape (3, bins)
+    mask: Optional[np.ndarray] = None  # Foreground mask (255 = foreground), None for opaque images
+    # SSIM statistics keyed by pyramid level (0 is full resolution), computed on first use
+    ssim_statistics: Dict[int, SSIMStatistics] = field(default_factory=dict)
+
+
+@dataclass
+class ReferenceImage:
+    """
+    Reference image decoded once, with its preprocessed variants cached per target size
+    """
+    path: str
+    bgr: np.ndarray
+    alpha: Optional[np.ndarray] = None  # Alpha channel, None for opaque images or when alpha is ignored
+    variants: Dict[Tuple[int, int], ImageFeatures] = field(default_factory=dict)
+
 
 class ImageComparison:
     """
     Handles image comparison operations for validating game assets
     """
+
+    def __init__(self,
+                 ssim_fast_path: Optional[Dict] = None,
+                 feature_cache: Optional[FeatureCache] = None,
+                 histogram_settings: Optional[Dict] = None,
+                 alpha_settings: Optional[Dict] = None):
+        """
+        Initialize the image comparison
+
+        Args:
+            ssim_fast_path: Optional downscaled SSIM settings, defaults to config.SSIM_FAST_PATH
+            feature_cache: Optional on-disk cache for decoded and preprocessed reference images
+            histogram_settings: Optional color space and bin count of the color histograms,
+                defaults to config.COLOR_HISTOGRAM
+            alpha_settings: Optional alpha-aware comparison settings, defaults to config.ALPHA_COMPARISON
+        """
+        self.ssim_fast_path = ssim_fast_path if ssim_fast_path is not None else config.SSIM_FAST_PATH
+        self.feature_cache = feature_cache
+        self.histogram_settings = histogram_settings or config.COLOR_HISTOGRAM
+        self.alpha_settings = alpha_settings if alpha_settings is not None else config.ALPHA_COMPARISON
+
+    def preprocess(self, image: np.ndarray, alpha: Optional[np.ndarray] = None) -> ImageFeatures:
+        """
+        Compute grayscale, edge map and per-channel histograms of an image once
+
+        With an alpha channel, the image is premultiplied so the arbitrary colors of
+        transparent pixels become black, and histograms only count foreground pixels.
+
+        Args:
+            image: Image in BGR format
+            alpha: Optional alpha channel of the image
+
+        Returns:
+            ImageFeatures holding the image and its derived data
+        """
+        mask = None
+        if alpha is not None:
+            image = cv2.multiply(image, cv2.merge([alpha, alpha, alpha]), scale=1 / 255)
+            _, mask = cv2.threshold(alpha, self.alpha_settings["alpha_threshold"], 255, cv2.THRESH_BINARY)
+
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        edges = cv2.Canny(gray, *CANNY_THRESHOLDS)
+        histograms = compute_histograms(
+            image,
+            self.histogram_settings["color_space"],
+            self.histogram_settings["bins"],
+            mask
+        )
+
+        return ImageFeatures(bgr=image, gray=gray, edges=edges, histograms=histograms, mask=mask)
+    
+    def load_reference(self, reference_image_path: str) -> ReferenceImage:
+        """
+        Decode a reference image so it can be compared against many generated images
+        
+        With a feature cache, the decoded image is memory-mapped from the cache
+        instead of decoding the file again.
+        
+        Args:
+            reference_image_path: Path to reference image
+            
+        Returns:
+            ReferenceImage with an empty cache of preprocessed variants
+        """
+        # The alpha channel is only decoded in alpha-aware mode, so that mode has its own variant
+        variant = "image_alpha" if self.alpha_settings.get("enabled") else "image"
+        cached = self.feature_cache.load(reference_image_path, variant) if self.feature_cache else None
+        if cached is not None:
+            return ReferenceImage(path=reference_image_path, bgr=cached["bgr"], alpha=cached.get("alpha"))
+        
+        reference_img, reference_alpha = self._read_image(reference_image_path, "reference")
+        
+        if self.feature_cache:
+            arrays = {"bgr": reference_img}
+            if reference_alpha is not None:
+                arrays["alpha"] = reference_alpha
+            self.feature_cache.store(reference_image_path, variant, arrays)
+        
+        return ReferenceImage(path=reference_image_path, bgr=reference_img, alpha=reference_alpha)
+    
+    def reference_features(self, reference: ReferenceImage, size: Tuple[int, int]) -> ImageFeatures:
+        """
+        Get the reference preprocessed at a given size, resizing and preprocessing it only once per size
+        
+        Args:
+            reference: Reference image from load_reference()
+            size: Target (height, width)
+            
+        Returns:
+            ImageFeatures of the reference at the requested size
+        """
+        if size in reference.variants:
+            return reference.variants[size]
+        
+        # Histograms depend on the settings, so they are part of the variant name
+        variant = (f"{size[0]}x{size[1]}_{self.histogram_settings['color_space']}"
+                   f"{self.histogram_settings['bins']}")
+        if reference.alpha is not None:
+            variant += f"_alpha{self.alpha_settings['alpha_threshold']}"
+        cached = self.feature_cache.load(reference.path, variant) if self.feature_cache else None
+        if cached is not None:
+            # The image itself is only stored for resized variants
+            cached.setdefault("bgr", reference.bgr)
+            features = ImageFeatures(**cached)
+        else:
+            reference_img = reference.bgr
+            reference_alpha = reference.alpha
+            
+            # Resize the reference to match the generated image if they have different dimensions
+            if reference_img.shape[:2] != size:
+                reference_img = cv2.resize(reference_img,
+                                           (size[1], size[0]),
+                                           interpolation=cv2.INTER_AREA)
+                if reference_alpha is not None:
+                    reference_alpha = cv2.resize(reference_alpha,
+                                                 (size[1], size[0]),
+                                                 interpolation=cv2.INTER_AREA)
+            
+            features = self.preprocess(reference_img, reference_alpha)
+            
+            if self.feature_cache:
+                arrays = {
+                    "gray": features.gray,
+                    "edges": features.edges,
+                    "histograms": features.histograms
+                }
+                if features.mask is not None:
+                    arrays["mask"] = features.mask
+                # The image itself is stored when resizing or premultiplying changed it
+                if features.bgr is not reference.bgr:
+                    arrays["bgr"] = features.bgr
+                self.feature_cache.store(reference.path, variant, arrays)
+        
+        reference.variants[size] = features
+        return features
     
     def compare_images(self, 
                       generated_image_path: str,
                       reference_image_path: str,
-                      output_dir: Optional[str] = None) -> Dict:
+                      output_dir: Optional[str] = None,
+                      early_exit: bool = False,
+                      visualize_when: Optional[Callable[[Dict], bool]] = None) -> Dict:
         """
         Compare a generated image against a reference image using multiple metrics
         
@@ -24,126 +251,340 @@ class ImageComparison:
             generated_image_path: Path to generated image
             reference_image_path: Path to reference image
             output_dir: Optional directory to save comparison results
+            early_exit: Stop at the first metric below its reject threshold
+            visualize_when: Optional function of the metrics deciding whether to save visualizations
             
         Returns:
             Dictionary of comparison metrics
         """
-        # Load images
-        generated_img = cv2.imread(generated_image_path)
-        reference_img = cv2.imread(reference_image_path)
+        reference = self.load_reference(reference_image_path)
+        return self.compare_to_reference(
+            generated_image_path,
+            reference,
+            output_dir,
+            early_exit,
+            visualize_when
+        )
+    
+    def generate_visualizations(self,
+                                generated_image_path: str,
+                                reference_image_path: str,
+                                output_dir: str) -> None:
+        """
+        Generate the comparison visualizations on their own, e.g. for an earlier validation
         
-        if generated_img is None:
-            raise ValueError(f"Could not load generated image: {generated_image_path}")
-        if reference_img is None:
-            raise ValueError(f"Could not load reference image: {reference_image_path}")
+        Args:
+            generated_image_path: Path to generated image
+            reference_image_path: Path to reference image
+            output_dir: Directory to save visualizations
+        """
+        generated, reference, _ = self._prepare_pair(
+            generated_image_path,
+            self.load_reference(reference_image_path)
+        )
+        self._generate_comparison_visualizations(generated, reference, output_dir)
+    
+    def compare_to_reference(self,
+                             generated_image_path: str,
+                             reference: ReferenceImage,
+                             output_dir: Optional[str] = None,
+                             early_exit: bool = False,
+                             visualize_when: Optional[Callable[[Dict], bool]] = None) -> Dict:
+        """
+        Compare a generated image against an already loaded reference image
+        
+        With early_exit, metrics are computed cheapest first and scoring stops at the
+        first one below its reject threshold in config.VALIDATION_THRESHOLDS, since a
+        single reject already makes the overall status a reject. The result then only
+        contains the metrics computed so far.
         
-        # Resize images to match if they have different dimensions
-        if generated_img.shape != reference_img.shape:
-            reference_img = cv2.resize(reference_img, 
-                                       (generated_img.shape[1], generated_img.shape[0]), 
-                                       interpolation=cv2.INTER_AREA)
+        Visualizations are saved to output_dir when visualize_when returns True for the
+        metrics. Without visualize_when, they are saved unless early_exit rejected the image.
         
-        # Convert to RGB for visualization (OpenCV loads as BGR)
-        generated_rgb = cv2.cvtColor(generated_img, cv2.COLOR_BGR2RGB)
-        reference_rgb = cv2.cvtColor(reference_img, cv2.COLOR_BGR2RGB)
+        In alpha-aware mode, images with transparency are cropped to the bounding box of
+        their combined foreground and SSIM is averaged over that foreground only.
+        
+        Args:
+            generated_image_path: Path to generated image
+            reference: Reference image from load_reference()
+            output_dir: Optional directory to save comparison results
+            early_exit: Stop at the first metric below its reject threshold
+            visualize_when: Optional function of the metrics deciding whether to save visualizations
+            
+        Returns:
+            Dictionary of comparison metrics
+        """
+        generated, reference, foreground = self._prepare_pair(generated_image_path, reference)
         
-        # Calculate SSIM
-        ssim_value = self._calculate_ssim(generated_img, reference_img)
+        metric_functions = {
+            "ssim": lambda: self._calculate_ssim(generated, reference, foreground),
+            "color_match": lambda: self._compare_color_histograms(generated.histograms, reference.histograms),
+            "edge_accuracy": lambda: self._compare_edges(generated.edges, reference.edges)
+        }
         
-        # Calculate color histogram similarity
-        color_match = self._compare_color_histograms(generated_img, reference_img)
+        metrics = {}
+        rejected = False
+        for name in METRIC_EVALUATION_ORDER:
+            metrics[name] = float(metric_functions[name]())
+            
+            if early_exit and metrics[name] < config.VALIDATION_THRESHOLDS[name]["reject"]:
+                rejected = True
+                break
         
-        # Calculate edge similarity
-        edge_accuracy = self._compare_edges(generated_img, reference_img)
+        results = {name: metrics[name] for name in METRIC_NAMES if name in metrics}
         
         # Generate comparison visualizations if output directory is provided
         if output_dir:
-            self._generate_comparison_visualizations(
-                generated_rgb, 
-                reference_rgb,
-                generated_img,
-                reference_img,
-                output_dir
-            )
+            visualize = visualize_when(results) if visualize_when else not rejected
+            if visualize:
+                self._generate_comparison_visualizations(generated, reference, output_dir)
         
         # Return comparison results
-        return {
-            "ssim": float(ssim_value),
-            "color_match": float(color_match),
-            "edge_accuracy": float(edge_accuracy)
-        }
+        return results
+    
+    def _read_image(self, image_path: str, role: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Decode an image, keeping its alpha channel in alpha-aware mode
+        
+        Args:
+            image_path: Path to the image
+            role: Role of the image in the comparison, used in the error message
+            
+        Returns:
+            Tuple of the image in BGR format and its alpha channel (None for opaque
+            images or when alpha is ignored)
+        """
+        if not self.alpha_settings.get("enabled"):
+            image = cv2.imread(image_path)
+            if image is None:
+                raise ValueError(f"Could not load {role} image: {image_path}")
+            return image, None
+        
+        image = cv2.imread(image_path, cv2.IMREAD_UNCHANGED)
+        if image is None:
+            raise ValueError(f"Could not load {role} image: {image_path}")
+        
+        # Without conversion flags, convert to 8-bit BGR like the default imread flags do
+        if image.dtype == np.uint16:
+            image = (image >> 8).astype(np.uint8)
+        if image.ndim == 2:
+            return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR), None
+        if image.shape[2] == 3:
+            return image, None
+        
+        alpha = np.ascontiguousarray(image[:, :, 3])
+        bgr = np.ascontiguousarray(image[:, :, :3])
+        
+        # Fully opaque images are compared exactly as without alpha
+        if alpha.min() == 255:
+            return bgr, None
+        return bgr, alpha
+    
+    def _prepare_pair(self,
+                      generated_image_path: str,
+                      reference: ReferenceImage) -> Tuple[ImageFeatures, ImageFeatures, Optional[np.ndarray]]:
+        """
+        Preprocess a generated image and the matching reference variant, cropped to their foreground
+        
+        Args:
+            generated_image_path: Path to generated image
+            reference: Reference image from load_reference()
+            
+        Returns:
+            Tuple of the generated and reference features, and their combined foreground
+            mask (None when both images are opaque)
+        """
+        generated_img, generated_alpha = self._read_image(generated_image_path, "generated")
+        
+        # Grayscale, edges and histograms are computed once per image
+        generated = self.preprocess(generated_img, generated_alpha)
+        reference_features = self.reference_features(reference, generated_img.shape[:2])
+        
+        # An opaque image is foreground everywhere, so there is nothing to crop or mask
+        if generated.mask is None or reference_features.mask is None:
+            return generated, reference_features, None
+        
+        foreground = cv2.bitwise_or(generated.mask, reference_features.mask)
+        if cv2.countNonZero(foreground) == 0:
+            return generated, reference_features, None
+        
+        # Crop both images to the bounding box of the combined foreground, with some padding
+        # to keep the outline edges; this also leaves far fewer pixels to score
+        x, y, width, height = cv2.boundingRect(foreground)
+        padding = self.alpha_settings.get("crop_padding", 0)
+        region = (
+            _padded_span(y, height, padding, foreground.shape[0]),
+            _padded_span(x, width, padding, foreground.shape[1])
+        )
+        
+        return self._crop_features(generated, region), self._crop_features(reference_features, region), \
+            foreground[region]
+    
+    def _crop_features(self, features: ImageFeatures, region: Tuple[slice, slice]) -> ImageFeatures:
+        """
+        Crop preprocessed image data to a region
+        
+        Histograms are kept as is since they only count foreground pixels, which all
+        lie inside the region. SSIM statistics are recomputed for the crop on first use.
+        
+        Args:
+            features: Preprocessed image
+            region: Row and column slices of the region
+            
+        Returns:
+            ImageFeatures of the cropped image
+        """
+        return ImageFeatures(
+            bgr=features.bgr[region],
+            gray=features.gray[region],
+            edges=features.edges[region],
+            histograms=features.histograms,
+            mask=features.mask[region] if features.mask is not None else None
+        )
     
-    def _calculate_ssim(self, img1: np.ndarray, img2: np.ndarray) -> float:
+    def _calculate_ssim(self,
+                        features1: ImageFeatures,
+                        features2: ImageFeatures,
+                        mask: Optional[np.ndarray] = None) -> float:
         """
         Calculate Structural Similarity Index (SSIM) between two images
         
+        When the approximate fast path is enabled, SSIM is first computed on downscaled
+        images. That score is returned if it is below the reject threshold by the
+        configured margin; otherwise SSIM is recomputed at full resolution. Downscaled
+        SSIM can be far lower than full resolution for fine detail, so with the fast
+        path a rejection may not match the full-resolution metric. Passing images pay
+        for both computations, so the fast path only speeds up reject-heavy batches.
+        
         Args:
-            img1: First image
-            img2: Second image
+            features1: Preprocessed first image
+            features2: Preprocessed second image
+            mask: Optional mask of the pixels to average SSIM over
             
         Returns:
             SSIM value (0.0 to 1.0, where 1.0 means identical)
         """
-        # Convert to grayscale for SSIM calculation
-        img1_gray = cv2.cvtColor(img1, cv2.COLOR_BGR2GRAY)
-        img2_gray = cv2.cvtColor(img2, cv2.COLOR_BGR2GRAY)
+        fast_path = self.ssim_fast_path
+        levels = fast_path.get("pyramid_levels", 0) if fast_path.get("enabled") else 0
+        
+        if levels > 0 and (min(features1.gray.shape) >> levels) >= SSIM_WIN_SIZE:
+            fast_value = self._ssim_at_level(features1, features2, levels, mask)
+            
+            reject_threshold = config.VALIDATION_THRESHOLDS["ssim"]["reject"]
+            if fast_value < reject_threshold - fast_path.get("margin", 0.0):
+                return fast_value
         
-        # Calculate SSIM
-        ssim_value, _ = ssim(img1_gray, img2_gray, full=True)
-        return ssim_value
+        return self._ssim_at_level(features1, features2, 0, mask)
     
-    def _compare_color_histograms(self, img1: np.ndarray, img2: np.ndarray) -> float:
+    def _ssim_statistics(self, features: ImageFeatures, level: int) -> SSIMStatistics:
         """
-        Compare color histograms of two images
+        Get the SSIM window statistics of an image at a pyramid level, computing them once
         
         Args:
-            img1: First image
-            img2: Second image
+            features: Preprocessed image
+            level: Number of times the image is halved (0 is full resolution)
             
         Returns:
-            Histogram comparison value (0.0 to 1.0, where 1.0 means identical)
+            SSIMStatistics of the image at that level
         """
-        # Calculate histograms for each color channel
-        hist_similarity = 0
-        
-        for i in range(3):  # BGR channels
-            hist1 = cv2.calcHist([img1], [i], None, [256], [0, 256])
-            hist2 = cv2.calcHist([img2], [i], None, [256], [0, 256])
+        if level not in features.ssim_statistics:
+            gray = features.gray
+            if level > 0:
+                scale = 0.5 ** level
+                gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
             
-            # Normalize histograms
-            cv2.normalize(hist1, hist1, 0, 1, cv2.NORM_MINMAX)
-            cv2.normalize(hist2, hist2, 0, 1, cv2.NORM_MINMAX)
+            # Window mean and variance only depend on one image, so only the cross term is computed per pair
+            gray_float = gray.astype(np.float64)
+            window = (SSIM_WIN_SIZE, SSIM_WIN_SIZE)
+            cov_norm = SSIM_WIN_SIZE ** 2 / (SSIM_WIN_SIZE ** 2 - 1)
+            local_mean = cv2.blur(gray_float, window)
+            local_var = cov_norm * (cv2.blur(gray_float * gray_float, window) - local_mean * local_mean)
             
-            # Compare histograms using correlation method
-            similarity = cv2.compareHist(hist1, hist2, cv2.HISTCMP_CORREL)
-            hist_similarity += similarity
+            features.ssim_statistics[level] = SSIMStatistics(
+                gray_float=gray_float,
+                local_mean=local_mean,
+                local_var=local_var
+            )
         
-        # Average similarity across channels
-        return hist_similarity / 3.0
+        return features.ssim_statistics[level]
     
-    def _compare_edges(self, img1: np.ndarray, img2: np.ndarray) -> float:
+    def _ssim_at_level(self,
+                       features1: ImageFeatures,
+                       features2: ImageFeatures,
+                       level: int,
+                       mask: Optional[np.ndarray] = None) -> float:
         """
-        Compare edge detection results between two images
+        Calculate SSIM between two images at a pyramid level
+        
+        Uses the same uniform 7x7 window, constants and border cropping as
+        skimage.metrics.structural_similarity.
         
         Args:
-            img1: First image
-            img2: Second image
+            features1: Preprocessed first image
+            features2: Preprocessed second image
+            level: Number of times the images are halved (0 is full resolution)
+            mask: Optional full-resolution mask of the pixels to average SSIM over
             
         Returns:
-            Edge similarity value (0.0 to 1.0, where 1.0 means identical)
+            SSIM value (0.0 to 1.0, where 1.0 means identical)
         """
-        # Convert to grayscale
-        img1_gray = cv2.cvtColor(img1, cv2.COLOR_BGR2GRAY)
-        img2_gray = cv2.cvtColor(img2, cv2.COLOR_BGR2GRAY)
+        stats1 = self._ssim_statistics(features1, level)
+        stats2 = self._ssim_statistics(features2, level)
         
-        # Apply Canny edge detection
-        edges1 = cv2.Canny(img1_gray, 100, 200)
-        edges2 = cv2.Canny(img2_gray, 100, 200)
+        if min(stats1.gray_float.shape) < SSIM_WIN_SIZE:
+            raise ValueError(f"Images must be at least {SSIM_WIN_SIZE}x{SSIM_WIN_SIZE} pixels for SSIM")
         
-        # Count edge pixels in each image
-        total_edges1 = np.count_nonzero(edges1)
-        total_edges2 = np.count_nonzero(edges2)
+        window = (SSIM_WIN_SIZE, SSIM_WIN_SIZE)
+        cov_norm = SSIM_WIN_SIZE ** 2 / (SSIM_WIN_SIZE ** 2 - 1)
+        c1 = (SSIM_K1 * SSIM_DATA_RANGE) ** 2
+        c2 = (SSIM_K2 * SSIM_DATA_RANGE) ** 2
         
+        ux, uy = stats1.local_mean, stats2.local_mean
+        vxy = cov_norm * (cv2.blur(stats1.gray_float * stats2.gray_float, window) - ux * uy)
+        
+        ssim_map = ((2 * ux * uy + c1) * (2 * vxy + c2)) / \
+                   ((ux * ux + uy * uy + c1) * (stats1.local_var + stats2.local_var + c2))
+        
+        # Discard the border where the window extends past the image, as skimage does
+        pad = (SSIM_WIN_SIZE - 1) // 2
+        ssim_map = ssim_map[pad:-pad, pad:-pad]
+        
+        if mask is not None:
+            if mask.shape != ux.shape:
+                mask = cv2.resize(mask, (ux.shape[1], ux.shape[0]), interpolation=cv2.INTER_NEAREST)
+            
+            # A transparent background is identical in both images and would inflate the score
+            foreground = mask[pad:-pad, pad:-pad] > 0
+            if foreground.any():
+                return ssim_map[foreground].mean(dtype=np.float64)
+        
+        return ssim_map.mean(dtype=np.float64)
+    
+    def _compare_color_histograms(self, histograms1: np.ndarray, histograms2: np.ndarray) -> float:
+        """
+        Compare color histograms of two images
+        
+        Args:
+            histograms1: Per-channel histograms of the first image
+            histograms2: Per-channel histograms of the second image
+            
+        Returns:
+            Histogram comparison value (0.0 to 1.0, where 1.0 means identical)
+        """
+        # Correlation of the min-max normalized histograms, averaged across channels
+        return compare_histograms(histograms1, histograms2)
+    
+    def _compare_edges(self, edges1: np.ndarray, edges2: np.ndarray) -> float:
+        """
+        Compare edge detection results between two images
+        
+        Args:
+            edges1: Canny edge map of the first image
+            edges2: Canny edge map of the second image
+            
+        Returns:
+            Edge similarity value (0.0 to 1.0, where 1.0 means identical)
+        """
         # Calculate intersection of edges
         intersection = np.count_nonzero(np.logical_and(edges1, edges2))
         
@@ -157,94 +598,138 @@ class ImageComparison:
         return intersection / union
     
     def _generate_comparison_visualizations(self,
-                                          generated_rgb: np.ndarray,
-                                          reference_rgb: np.ndarray,
-                                          generated_bgr: np.ndarray,
-                                          reference_bgr: np.ndarray,
+                                          generated: ImageFeatures,
+                                          reference: ImageFeatures,
                                           output_dir: str) -> None:
         """
         Generate visualization images for comparison
         
+        The panels are composed with NumPy and written directly with cv2.imwrite,
+        which is much faster than drawing matplotlib figures.
+        
         Args:
-            generated_rgb: Generated image in RGB format
-            reference_rgb: Reference image in RGB format
-            generated_bgr: Generated image in BGR format
-            reference_bgr: Reference image in BGR format
+            generated: Preprocessed generated image
+            reference: Preprocessed reference image
             output_dir: Directory to save visualizations
         """
         # Ensure output directory exists
         os.makedirs(output_dir, exist_ok=True)
         
         # 1. Side by side comparison
-        fig, axes = plt.subplots(1, 2, figsize=(12, 6))
+        self._write_visualization(output_dir, "side_by_side_comparison.png", self._side_by_side(
+            self._titled_panel(generated.bgr, 'Generated Asset'),
+            self._titled_panel(reference.bgr, 'Reference Asset')
+        ))
         
-        axes[0].imshow(generated_rgb)
-        axes[0].set_title('Generated Asset')
-        axes[0].axis('off')
+        # 2. Edge detection visualization
+        self._write_visualization(output_dir, "edge_comparison.png", self._side_by_side(
+            self._titled_panel(generated.edges, 'Generated Asset Edges'),
+            self._titled_panel(reference.edges, 'Reference Asset Edges')
+        ))
         
-        axes[1].imshow(reference_rgb)
-        axes[1].set_title('Reference Asset')
-        axes[1].axis('off')
+        # 3. Color histogram visualization
+        color_space = self.histogram_settings["color_space"]
+        color_channels = COLOR_SPACES[color_space][1]
         
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, "side_by_side_comparison.png"))
-        plt.close(fig)
+        rows = []
+        for i in range(3):
+            # Only BGR channels have a matching plot color
+            plot_color = HISTOGRAM_PLOT_COLORS[i] if color_space == "bgr" else HISTOGRAM_DEFAULT_COLOR
+            rows.append(self._side_by_side(
+                self._histogram_panel(generated.histograms[i],
+                                      f'Generated Asset - {color_channels[i]} Channel', plot_color),
+                self._histogram_panel(reference.histograms[i],
+                                      f'Reference Asset - {color_channels[i]} Channel', plot_color)
+            ))
+        self._write_visualization(output_dir, "histogram_comparison.png", cv2.vconcat(rows))
         
-        # 2. Edge detection visualization
-        generated_gray = cv2.cvtColor(generated_bgr, cv2.COLOR_BGR2GRAY)
-        reference_gray = cv2.cvtColor(reference_bgr, cv2.COLOR_BGR2GRAY)
+        # 4. Difference visualization
+        # Largest per-channel difference of each pixel, brighter meaning more different
+        diff_img = cv2.absdiff(generated.bgr, reference.bgr).max(axis=2)
+        heatmap = cv2.applyColorMap(diff_img, cv2.COLORMAP_INFERNO)
+        self._write_visualization(output_dir, "difference_visualization.png", self._titled_panel(
+            heatmap, 'Difference Visualization (brighter = larger difference)'
+        ))
+    
+    def _write_visualization(self, output_dir: str, file_name: str, image: np.ndarray) -> None:
+        """
+        Write a visualization image as a quickly compressed PNG
         
-        generated_edges = cv2.Canny(generated_gray, 100, 200)
-        reference_edges = cv2.Canny(reference_gray, 100, 200)
+        Args:
+            output_dir: Directory to save the image
+            file_name: Name of the image file
+            image: Image in BGR format
+        """
+        cv2.imwrite(os.path.join(output_dir, file_name), image,
+                    [cv2.IMWRITE_PNG_COMPRESSION, VISUALIZATION_PNG_COMPRESSION])
+    
+    def _titled_panel(self, image: np.ndarray, title: str) -> np.ndarray:
+        """
+        Add a title bar above an image
         
-        fig, axes = plt.subplots(1, 2, figsize=(12, 6))
+        Args:
+            image: Image in BGR or grayscale format
+            title: Title to draw
+            
+        Returns:
+            BGR image with the title bar
+        """
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
         
-        axes[0].imshow(generated_edges, cmap='gray')
-        axes[0].set_title('Generated Asset Edges')
-        axes[0].axis('off')
+        # Downscale large images, which keeps visualization files small and fast to write
+        scale = VISUALIZATION_MAX_SIZE / max(image.shape[:2])
+        if scale < 1:
+            image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
         
-        axes[1].imshow(reference_edges, cmap='gray')
-        axes[1].set_title('Reference Asset Edges')
-        axes[1].axis('off')
+        width = image.shape[1]
+        bar = np.full((VISUALIZATION_TITLE_HEIGHT, width, 3), 255, dtype=np.uint8)
         
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, "edge_comparison.png"))
-        plt.close(fig)
+        # Shrink the text for narrow images such as small sprites
+        font_scale = min(0.8, max(0.3, width / 800))
+        cv2.putText(bar, title, (10, VISUALIZATION_TITLE_HEIGHT - 12), cv2.FONT_HERSHEY_SIMPLEX,
+                    font_scale, (0, 0, 0), 1, cv2.LINE_AA)
         
-        # 3. Color histogram visualization
-        fig, axes = plt.subplots(3, 2, figsize=(12, 8))
-        color_channels = ['Blue', 'Green', 'Red']
+        return cv2.vconcat([bar, np.ascontiguousarray(image)])
+    
+    def _side_by_side(self, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """
+        Place two panels of equal height next to each other with a white gap
         
-        for i in range(3):
-            # Generated image histogram
-            hist_gen = cv2.calcHist([generated_bgr], [i], None, [256], [0, 256])
-            axes[i, 0].plot(hist_gen, color=color_channels[i].lower())
-            axes[i, 0].set_title(f'Generated Asset - {color_channels[i]} Channel')
-            axes[i, 0].set_xlim([0, 256])
-            
-            # Reference image histogram
-            hist_ref = cv2.calcHist([reference_bgr], [i], None, [256], [0, 256])
-            axes[i, 1].plot(hist_ref, color=color_channels[i].lower())
-            axes[i, 1].set_title(f'Reference Asset - {color_channels[i]} Channel')
-            axes[i, 1].set_xlim([0, 256])
-        
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, "histogram_comparison.png"))
-        plt.close(fig)
+        Args:
+            left: Left panel in BGR format
+            right: Right panel in BGR format
+            
+        Returns:
+            Combined BGR image
+        """
+        gap = np.full((left.shape[0], VISUALIZATION_GAP, 3), 255, dtype=np.uint8)
+        return cv2.hconcat([left, gap, right])
+    
+    def _histogram_panel(self, histogram: np.ndarray, title: str, color: Tuple[int, int, int]) -> np.ndarray:
+        """
+        Draw a histogram as a line plot
         
-        # 4. Difference visualization
-        # Create difference image
-        diff_img = cv2.absdiff(generated_bgr, reference_bgr)
-        
-        plt.figure(figsize=(8, 8))
-        plt.imshow(cv2.cvtColor(diff_img, cv2.COLOR_BGR2RGB))
-        plt.title('Difference Visualization')
-        plt.colorbar(label='Difference Intensity')
-        plt.axis('off')
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, "difference_visualization.png"))
-        plt.close()
-
+        Args:
+            histogram: Counts per bin
+            title: Title to draw above the plot
+            color: BGR line color
+            
+        Returns:
+            BGR image of the plot
+        """
+        width, height = HISTOGRAM_PLOT_SIZE
+        canvas = np.full((height, width, 3), 255, dtype=np.uint8)
+        cv2.rectangle(canvas, (0, 0), (width - 1, height - 1), (200, 200, 200), 1)
+        
+        peak = float(histogram.max())
+        if peak > 0:
+            xs = np.linspace(0, width - 1, len(histogram))
+            ys = (height - 1) - histogram / peak * (height - 10)
+            points = np.stack([xs, ys], axis=1).round().astype(np.int32)
+            cv2.polylines(canvas, [points], False, color, 1, cv2.LINE_AA)
+        
+        return self._titled_panel(canvas, title)
 
 if __name__ == "__main__":
     print("Image Comparison Module")
@@ -0,0 +1,552 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+import config
+
+# Side length of the hash grid, giving 64-bit hashes
+HASH_SIZE = 8
+
+# Side length of the image fed to the DCT for pHash
+PHASH_DCT_SIZE = 32
+
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    """
+    Pack a boolean grid into an integer, first element as the most significant bit
+
+    Args:
+        bits: Boolean array
+
+    Returns:
+        Integer with one bit per element
+    """
+    return int.from_bytes(np.packbits(bits.flatten()).tobytes(), "big")
+
+
+def average_hash(gray: np.ndarray, hash_size: int = HASH_SIZE) -> int:
+    """
+    Compute the average hash (aHash): each bit says whether a cell is brighter than the mean
+
+    Args:
+        gray: Grayscale image
+        hash_size: Side length of the hash grid
+
+    Returns:
+        Hash as an integer of hash_size * hash_size bits
+    """
+    small = cv2.resize(gray, (hash_size, hash_size), interpolation=cv2.INTER_AREA)
+    return _bits_to_int(small > small.mean())
+
+
+def difference_hash(gray: np.ndarray, hash_size: int = HASH_SIZE) -> int:
+    """
+    Compute the difference hash (dHash): each bit says whether brightness increases to the right
+
+    Args:
+        gray: Grayscale image
+        hash_size: Side length of the hash grid
+
+    Returns:
+        Hash as an integer of hash_size * hash_size bits
+    """
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    return _bits_to_int(small[:, 1:] > small[:, :-1])
+
+
+def perceptual_hash(gray: np.ndarray, hash_size: int = HASH_SIZE) -> int:
+    """
+    Compute the perceptual hash (pHash): each bit says whether a low-frequency DCT
+    coefficient is above the median of those coefficients
+
+    Args:
+        gray: Grayscale image
+        hash_size: Side length of the hash grid
+
+    Returns:
+        Hash as an integer of hash_size * hash_size bits
+    """
+    dct_size = max(PHASH_DCT_SIZE, hash_size * 4)
+    small = cv2.resize(gray, (dct_size, dct_size), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low_frequencies = cv2.dct(small)[:hash_size, :hash_size]
+    return _bits_to_int(low_frequencies > np.median(low_frequencies))
+
+
+# Available hash functions by name
+HASH_FUNCTIONS: Dict[str, Callable[[np.ndarray, int], int]] = {
+    "ahash": average_hash,
+    "dhash": difference_hash,
+    "phash": perceptual_hash
+}
+
+
+def hamming_distance(hash1: int, hash2: int) -> int:
+    """
+    Count the bits that differ between two hashes
+
+    Args:
+        hash1: First hash
+        hash2: Second hash
+
+    Returns:
+        Number of differing bits
+    """
+    return bin(hash1 ^ hash2).count("1")
+
+
+def hash_image(image_path: str, method: str = "phash", hash_size: int = HASH_SIZE) -> int:
+    """
+    Load an image and compute its perceptual hash
+
+    Args:
+        image_path: Path to the image
+        method: Hash function name, one of HASH_FUNCTIONS
+        hash_size: Side length of the hash grid
+
+    Returns:
+        Hash as an integer
+    """
+    if method not in HASH_FUNCTIONS:
+        raise ValueError(f"Unknown hash method: {method}. Available: {', '.join(HASH_FUNCTIONS)}")
+
+    gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        raise ValueError(f"Could not load image: {image_path}")
+
+    return HASH_FUNCTIONS[method](gray, hash_size)
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over Hamming distance for sub-linear nearest-hash lookups
+
+    Each node stores a hash and the items having it; a child is keyed by its distance
+    to the parent. By the triangle inequality, a query within distance r of the target
+    only needs the children whose key lies in [d - r, d + r], where d is the distance
+    from the target to the node.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty tree
+        """
+        # Node layout: [hash, items, {distance: child node}]
+        self.root: Optional[list] = None
+        self.size = 0
+
+    def add(self, hash_value: int, item: str) -> None:
+        """
+        Add an item with its hash
+
+        Args:
+            hash_value: Hash of the item
+            item: Item to store, e.g. an image path
+        """
+        self.size += 1
+
+        if self.root is None:
+            self.root = [hash_value, [item], {}]
+            return
+
+        node = self.root
+        while True:
+            distance = hamming_distance(hash_value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [hash_value, [item], {}]
+                return
+            node = child
+
+    def search(self, hash_value: int, max_distance: int) -> List[Tuple[int, str]]:
+        """
+        Find all items within a Hamming distance of a hash
+
+        Args:
+            hash_value: Hash to search for
+            max_distance: Maximum Hamming distance (inclusive)
+
+        Returns:
+            (distance, item) pairs sorted by distance
+        """
+        matches = []
+        stack = [self.root] if self.root is not None else []
+
+        while stack:
+            node = stack.pop()
+            distance = hamming_distance(hash_value, node[0])
+
+            if distance <= max_distance:
+                matches.extend((distance, item) for item in node[1])
+
+            for child_distance, child in node[2].items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+
+        return sorted(matches)
+
+    def nearest(self, hash_value: int, k: int = 1) -> List[Tuple[int, str]]:
+        """
+        Find the k items with the closest hashes
+
+        The search radius shrinks to the k-th best distance found so far, so only
+        branches that may still hold a closer item are visited.
+
+        Args:
+            hash_value: Hash to search for
+            k: Number of items to return
+
+        Returns:
+            Up to k (distance, item) pairs sorted by distance
+        """
+        best: List[Tuple[int, str]] = []
+        stack = [self.root] if self.root is not None else []
+
+        while stack:
+            node = stack.pop()
+            distance = hamming_distance(hash_value, node[0])
+
+            best.extend((distance, item) for item in node[1])
+            best = sorted(best)[:k]
+            radius = best[-1][0] if len(best) == k else float("inf")
+
+            # Visit the children closest to the target last, so they are popped first
+            for child_distance in sorted(node[2], key=lambda d: -abs(d - distance)):
+                if abs(child_distance - distance) <= radius:
+                    stack.append(node[2][child_distance])
+
+        return best
+
+
+class PerceptualHashIndex:
+    """
+    Persistent index of image perceptual hashes supporting near-duplicate and nearest-image queries
+    """
+
+    def __init__(self,
+                 index_path: Optional[str] = None,
+                 method: str = config.PHASH_METHOD,
+                 hash_size: int = HASH_SIZE):
+        """
+        Initialize the index, loading it from index_path if that file exists
+
+        Args:
+            index_path: Optional JSON file the index is loaded from and saved to
+            method: Hash function name, one of HASH_FUNCTIONS
+            hash_size: Side length of the hash grid
+        """
+        if method not in HASH_FUNCTIONS:
+            raise ValueError(f"Unknown hash method: {method}. Available: {', '.join(HASH_FUNCTIONS)}")
+
+        self.index_path = index_path
+        self.method = method
+        self.hash_size = hash_size
+
+        # Absolute path -> {"hash", "mtime", "size"}, in insertion order
+        self.entries: Dict[str, Dict] = {}
+        self._tree: Optional[BKTree] = None
+
+        if index_path and os.path.exists(index_path):
+            self.load()
+
+    @property
+    def tree(self) -> BKTree:
+        """
+        BK-tree over the indexed hashes, rebuilt after entries are removed or replaced
+        """
+        if self._tree is None:
+            self._tree = BKTree()
+            for path, entry in self.entries.items():
+                self._tree.add(entry["hash"], path)
+        return self._tree
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, image_path: str) -> int:
+        """
+        Hash an image and add it to the index, skipping the work if it is unchanged
+
+        Args:
+            image_path: Path to the image
+
+        Returns:
+            Hash of the image
+        """
+        path = os.path.abspath(image_path)
+        stat = os.stat(path)
+
+        entry = self.entries.get(path)
+        if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+            return entry["hash"]
+
+        hash_value = hash_image(path, self.method, self.hash_size)
+        self.entries[path] = {"hash": hash_value, "mtime": stat.st_mtime, "size": stat.st_size}
+
+        if entry is None and self._tree is not None:
+            self._tree.add(hash_value, path)
+        else:
+            # A replaced hash cannot be moved within the tree, so it is rebuilt on next use
+            self._tree = None
+
+        return hash_value
+
+    def add_directory(self, directory: str) -> int:
+        """
+        Index every image in a directory and drop entries whose files no longer exist there
+
+        Args:
+            directory: Directory of images
+
+        Returns:
+            Number of images indexed
+        """
+        directory = os.path.abspath(directory)
+        image_paths = [
+            str(child) for child in sorted(Path(directory).iterdir())
+            if child.is_file() and child.suffix.lower() in config.IMAGE_EXTENSIONS
+        ]
+
+        stale = [
+            path for path in self.entries
+            if os.path.dirname(path) == directory and not os.path.exists(path)
+        ]
+        for path in stale:
+            self.remove(path)
+
+        for image_path in image_paths:
+            self.add(image_path)
+
+        return len(image_paths)
+
+    def remove(self, image_path: str) -> None:
+        """
+        Remove an image from the index
+
+        Args:
+            image_path: Path to the image
+        """
+        if self.entries.pop(os.path.abspath(image_path), None) is not None:
+            self._tree = None
+
+    def search(self, image_path: str, max_distance: int = config.PHASH_DUPLICATE_DISTANCE) -> List[Tuple[int, str]]:
+        """
+        Find indexed images whose hash is within a Hamming distance of an image
+
+        Args:
+            image_path: Path to the query image (need not be indexed)
+            max_distance: Maximum Hamming distance (inclusive)
+
+        Returns:
+            (distance, path) pairs sorted by distance, excluding the query image itself
+        """
+        path = os.path.abspath(image_path)
+        hash_value = self._query_hash(path)
+        return [match for match in self.tree.search(hash_value, max_distance) if match[1] != path]
+
+    def nearest(self, image_path: str, k: int = 1) -> List[Tuple[int, str]]:
+        """
+        Find the indexed images closest to an image
+
+        Args:
+            image_path: Path to the query image (need not be indexed)
+            k: Number of images to return
+
+        Returns:
+            Up to k (distance, path) pairs sorted by distance, excluding the query image itself
+        """
+        path = os.path.abspath(image_path)
+        hash_value = self._query_hash(path)
+
+        # Ask for one more in case the query image itself is indexed
+        matches = self.tree.nearest(hash_value, k + 1)
+        return [match for match in matches if match[1] != path][:k]
+
+    def find_duplicates(self, max_distance: int = config.PHASH_DUPLICATE_DISTANCE) -> List[List[str]]:
+        """
+        Group indexed images that are near-duplicates of each other
+
+        Images are grouped transitively: two images share a group if a chain of
+        images within max_distance of each other links them.
+
+        Args:
+            max_distance: Maximum Hamming distance (inclusive) between near-duplicates
+
+        Returns:
+            Groups of two or more paths, each sorted, in order of first path
+        """
+        groups: List[List[str]] = []
+        visited = set()
+
+        for path, entry in self.entries.items():
+            if path in visited:
+                continue
+
+            group = []
+            pending = [(path, entry["hash"])]
+            visited.add(path)
+            while pending:
+                current_path, current_hash = pending.pop()
+                group.append(current_path)
+                for _, match in self.tree.search(current_hash, max_distance):
+                    if match not in visited:
+                        visited.add(match)
+                        pending.append((match, self.entries[match]["hash"]))
+
+            if len(group) > 1:
+                groups.append(sorted(group))
+
+        return sorted(groups)
+
+    def save(self, index_path: Optional[str] = None) -> str:
+        """
+        Save the index as JSON
+
+        Args:
+            index_path: Optional path overriding the one given at construction
+
+        Returns:
+            Path to the saved index
+        """
+        index_path = index_path or self.index_path
+        if not index_path:
+            raise ValueError("No index path given")
+
+        os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+        data = {
+            "method": self.method,
+            "hash_size": self.hash_size,
+            "entries": [
+                {"path": path, "hash": f"{entry['hash']:x}", "mtime": entry["mtime"], "size": entry["size"]}
+                for path, entry in self.entries.items()
+            ]
+        }
+
+        # Write to a temporary file first so an interrupted save keeps the previous index
+        temp_path = f"{index_path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(temp_path, index_path)
+
+        return index_path
+
+    def load(self, index_path: Optional[str] = None) -> None:
+        """
+        Load the index from JSON, ignoring it if it was built with other hash settings
+
+        Args:
+            index_path: Optional path overriding the one given at construction
+        """
+        index_path = index_path or self.index_path
+        with open(index_path, "r") as f:
+            data = json.load(f)
+
+        if data.get("method") != self.method or data.get("hash_size") != self.hash_size:
+            print(f"Warning: ignoring index {index_path} built with {data.get('method')} "
+                  f"(hash size {data.get('hash_size')})")
+            return
+
+        # Entries keep their saved order, so the rebuilt tree has the same shape
+        self.entries = {
+            entry["path"]: {"hash": int(entry["hash"], 16), "mtime": entry["mtime"], "size": entry["size"]}
+            for entry in data["entries"]
+        }
+        self._tree = None
+
+    def _query_hash(self, path: str) -> int:
+        """
+        Get the hash of a query image, reusing the indexed hash if the file is unchanged
+
+        Args:
+            path: Absolute path to the image
+
+        Returns:
+            Hash of the image
+        """
+        entry = self.entries.get(path)
+        if entry:
+            stat = os.stat(path)
+            if entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+                return entry["hash"]
+
+        return hash_image(path, self.method, self.hash_size)
+
+
+def index_path_for_directory(directory: str) -> str:
+    """
+    Get the index file used for a directory of images
+
+    Args:
+        directory: Directory of images
+
+    Returns:
+        Path to the index file inside config.PHASH_INDEX_DIR
+    """
+    directory = os.path.abspath(directory)
+    # The path is encoded in the file name so directories with the same name do not collide
+    encoded = directory.strip(os.sep).replace(os.sep, "__")
+    return os.path.join(config.PHASH_INDEX_DIR, f"{encoded}.json")
+
+
+def load_directory_index(directory: str, method: str = config.PHASH_METHOD) -> PerceptualHashIndex:
+    """
+    Load the persistent index of a directory, bring it up to date and save it
+
+    Args:
+        directory: Directory of images
+        method: Hash function name, one of HASH_FUNCTIONS
+
+    Returns:
+        Up to date PerceptualHashIndex of the directory
+    """
+    index = PerceptualHashIndex(index_path_for_directory(directory), method)
+    index.add_directory(directory)
+    index.save()
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Find near-duplicate images with perceptual hashes"
+    )
+    parser.add_argument("directory", nargs="?", default=config.GENERATED_DIR,
+                        help="Directory of images to index (default: %(default)s)")
+    parser.add_argument("--method", choices=sorted(HASH_FUNCTIONS), default=config.PHASH_METHOD,
+                        help="Hash function (default: %(default)s)")
+    parser.add_argument("--max-distance", type=int, default=config.PHASH_DUPLICATE_DISTANCE,
+                        help="Maximum Hamming distance between near-duplicates (default: %(default)s)")
+    parser.add_argument("--nearest", metavar="IMAGE", default=None,
+                        help="Show the indexed images closest to IMAGE instead of duplicate groups")
+    parser.add_argument("-k", type=int, default=5,
+                        help="Number of images shown with --nearest (default: %(default)s)")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.directory):
+        print(f"Directory not found: {args.directory}")
+        sys.exit(1)
+
+    index = load_directory_index(args.directory, args.method)
+    print(f"Indexed {len(index)} images in {args.directory}")
+
+    if args.nearest:
+        for distance, path in index.nearest(args.nearest, args.k):
+            print(f"{distance:3d}  {path}")
+    else:
+        groups = index.find_duplicates(args.max_distance)
+        print(f"Found {len(groups)} groups of near-duplicates")
+        for number, group in enumerate(groups, 1):
+            print(f"\nGroup {number}:")
+            for path in group:
+                print(f"  {path}")
@@ -4,15 +4,34 @@
 import os
 import sys
 import json
+import argparse
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Tuple
+from typing import Callable, Dict, List, Optional, Union, Tuple
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 import uuid
 
+import cv2
+import numpy as np
+
 import config
-from image_comparison import ImageComparison
+from feature_cache import FeatureCache
+from image_comparison import ImageComparison, ReferenceImage
+from perceptual_hash import load_directory_index
 from validation_reporting import ValidationReporter
 
+# Per-process state of a parallel validation worker, set up once by _init_worker
+_worker_state: Dict = {}
+
+# Overall statuses whose assets get visualizations during validation, per config.VISUALIZATION_MODE
+VISUALIZATION_STATUSES = {
+    "always": ("excellent", "acceptable", "reject"),
+    "borderline": ("acceptable", "reject"),
+    "on_demand": ()
+}
+
+
 class AssetValidator:
     """
     Main validator class that orchestrates the validation process for AI-generated game assets
@@ -25,9 +44,13 @@ class AssetValidator:
             layer_api_key: Optional API key for Layer.ai integration
         """
         self.layer_api_key = layer_api_key or config.LAYER_API_KEY
-        self.image_comparison = ImageComparison()
+        feature_cache = FeatureCache() if config.FEATURE_CACHE_ENABLED else None
+        self.image_comparison = ImageComparison(feature_cache=feature_cache)
         self.reporter = ValidationReporter()
 
+        # Perceptual hash indexes of reference directories, loaded on first use
+        self._reference_indexes: Dict = {}
+
         # Ensure validation directory exists
         os.makedirs(config.VALIDATION_DIR, exist_ok=True)
 
@@ -35,7 +58,9 @@ class AssetValidator:
                       generated_asset_path: str,
                       reference_asset_path: str,
                       validation_name: Optional[str] = None,
-                      metadata: Optional[Dict] = None) -> Dict:
+                      metadata: Optional[Dict] = None,
+                      early_exit: bool = False,
+                      visualize_rejected: bool = False) -> Dict:
         """
         Validate a generated asset against a reference asset
 
@@ -44,6 +69,9 @@ class AssetValidator:
             reference_asset_path: Path to the reference asset
             validation_name: Optional name for the validation
             metadata: Optional metadata about the validation
+            early_exit: Stop scoring at the first metric that rejects the asset
+            visualize_rejected: With early_exit, still generate visualizations and the
+                report for rejected assets
 
         Returns:
             Dictionary containing validation results
@@ -64,45 +92,415 @@ class AssetValidator:
         os.makedirs(validation_dir, exist_ok=True)
 
         # Run image comparisons
+        should_visualize = self._visualization_filter(early_exit, visualize_rejected)
         comparison_results = self.image_comparison.compare_images(
             generated_asset_path,
             reference_asset_path,
-            output_dir=validation_dir
+            output_dir=validation_dir,
+            early_exit=early_exit,
+            visualize_when=should_visualize
         )
 
-        # Create validation metadata
-        validation_metadata = metadata or {}
-        validation_metadata.update({
-            "validation_id": validation_name,
-            "timestamp": datetime.now().isoformat(),
-            "generated_asset": os.path.basename(generated_asset_path),
-            "reference_asset": os.path.basename(reference_asset_path)
-        })
+        return self._record_validation(
+            comparison_results,
+            generated_asset_path,
+            reference_asset_path,
+            validation_name,
+            validation_dir,
+            metadata or {},
+            visualized=should_visualize(comparison_results),
+            skip_rejected_report=early_exit and not visualize_rejected
+        )
 
-        # Combine results
-        validation_results = {
-            "metadata": validation_metadata,
-            "metrics": comparison_results,
-            "pass_fail": self._evaluate_results(comparison_results)
+    def validate_batch(self,
+                       generated_paths: List[str],
+                       reference_path: str,
+                       batch_name: Optional[str] = None,
+                       metadata: Optional[Dict] = None,
+                       workers: int = 1,
+                       chunksize: Optional[int] = None,
+                       early_exit: bool = False,
+                       visualize_rejected: bool = False) -> Dict:
+        """
+        Validate many generated assets against one reference asset
+
+        The reference is decoded and preprocessed once, and its resized variants are
+        cached per generated image size, so each candidate only costs its own decode,
+        preprocessing and pairwise metrics.
+
+        With more than one worker, candidates are validated in a process pool. The
+        decoded reference (and its alpha channel, if any) is placed in shared memory so
+        workers attach to it instead of receiving a pickled copy, and only paths and
+        result dictionaries cross process boundaries.
+
+        Args:
+            generated_paths: Paths to the generated assets
+            reference_path: Path to the reference asset
+            batch_name: Optional name for the batch
+            metadata: Optional metadata copied into every validation
+            workers: Number of worker processes (1 validates in this process)
+            chunksize: Candidates sent to a worker per task, defaults to about four tasks per worker
+            early_exit: Stop scoring each asset at the first metric that rejects it
+            visualize_rejected: With early_exit, still generate visualizations and the
+                report for rejected assets
+
+        Returns:
+            Dictionary with the batch id, per-asset validation results (in input order,
+            with the overall status "error" for assets that could not be validated)
+            and the batch report path
+        """
+        missing = [path for path in generated_paths if not os.path.exists(path)]
+        if missing:
+            raise FileNotFoundError(f"Generated assets not found: {', '.join(missing)}")
+
+        if not os.path.exists(reference_path):
+            raise FileNotFoundError(f"Reference asset not found: {reference_path}")
+
+        # Create batch name if not provided
+        if not batch_name:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            batch_name = f"batch_{timestamp}_{uuid.uuid4().hex[:8]}"
+
+        batch_dir = os.path.join(config.VALIDATION_DIR, batch_name)
+        os.makedirs(batch_dir, exist_ok=True)
+
+        reference = self.image_comparison.load_reference(reference_path)
+
+        # Prefix with the index so variants sharing a file name get separate directories
+        tasks = [
+            (generated_path, os.path.join(batch_dir, f"{index:03d}_{Path(generated_path).stem}"))
+            for index, generated_path in enumerate(generated_paths)
+        ]
+        validation_metadata = dict(metadata or {})
+        validation_metadata["batch_id"] = batch_name
+        options = {"early_exit": early_exit, "visualize_rejected": visualize_rejected}
+
+        workers = min(workers, len(tasks))
+        if workers <= 1:
+            results = [
+                self._validate_candidate(reference, generated_path, validation_dir, validation_metadata, **options)
+                for generated_path, validation_dir in tasks
+            ]
+        else:
+            results = self._validate_in_pool(reference, tasks, validation_metadata, options, workers, chunksize)
+
+        report_path = self.reporter.generate_batch_report(results, batch_dir)
+
+        return {
+            "batch_id": batch_name,
+            "reference_asset": os.path.basename(reference_path),
+            "results": results,
+            "report_path": report_path
         }
 
-        # Save validation results
+    def _validate_candidate(self,
+                            reference: ReferenceImage,
+                            generated_path: str,
+                            validation_dir: str,
+                            metadata: Dict,
+                            early_exit: bool = False,
+                            visualize_rejected: bool = False) -> Dict:
+        """
+        Validate one generated asset of a batch against the loaded reference
+
+        An asset that cannot be validated (for example a corrupt file) is recorded with
+        the overall status "error" instead of aborting the rest of the batch.
+
+        Args:
+            reference: Reference image from ImageComparison.load_reference()
+            generated_path: Path to the generated asset
+            validation_dir: Directory of this asset's validation
+            metadata: Batch metadata, copied for this validation
+            early_exit: Stop scoring at the first metric that rejects the asset
+            visualize_rejected: With early_exit, still generate visualizations and the
+                report for rejected assets
+
+        Returns:
+            Dictionary containing validation results
+        """
+        os.makedirs(validation_dir, exist_ok=True)
+
+        try:
+            should_visualize = self._visualization_filter(early_exit, visualize_rejected)
+            comparison_results = self.image_comparison.compare_to_reference(
+                generated_path,
+                reference,
+                output_dir=validation_dir,
+                early_exit=early_exit,
+                visualize_when=should_visualize
+            )
+
+            return self._record_validation(
+                comparison_results,
+                generated_path,
+                reference.path,
+                os.path.basename(validation_dir),
+                validation_dir,
+                dict(metadata),
+                visualized=should_visualize(comparison_results),
+                skip_rejected_report=early_exit and not visualize_rejected
+            )
+        except Exception as e:
+            print(f"Validation error for {generated_path}: {str(e)}")
+            return self._record_error(e, generated_path, reference.path, validation_dir, dict(metadata))
+
+    def render_visualizations(self, validation_dir: str) -> str:
+        """
+        Generate the visualizations of an earlier validation and regenerate its report
+
+        Args:
+            validation_dir: Directory of the validation, containing validation_results.json
+
+        Returns:
+            Path to the regenerated report
+        """
         results_path = os.path.join(validation_dir, "validation_results.json")
+        if not os.path.exists(results_path):
+            raise FileNotFoundError(f"Validation results not found: {results_path}")
+
+        with open(results_path, "r") as f:
+            validation_results = json.load(f)
+
+        metadata = validation_results["metadata"]
+        generated_asset_path = metadata["generated_asset_path"]
+        reference_asset_path = metadata["reference_asset_path"]
+
+        self.image_comparison.generate_visualizations(
+            generated_asset_path,
+            reference_asset_path,
+            validation_dir
+        )
+
+        validation_results["visualizations"] = True
         with open(results_path, "w") as f:
             json.dump(validation_results, f, indent=2)
 
-        # Generate validation report
-        report_path = self.reporter.generate_report(
+        return self.reporter.generate_report(
             validation_results,
             generated_asset_path,
             reference_asset_path,
             validation_dir
         )
 
+    def _visualization_filter(self, early_exit: bool, visualize_rejected: bool) -> Callable[[Dict], bool]:
+        """
+        Build the function deciding from an asset's metrics whether to generate its visualizations
+
+        Args:
+            early_exit: Whether scoring stops at the first rejecting metric
+            visualize_rejected: With early_exit, still visualize rejected assets
+
+        Returns:
+            Function of the comparison metrics returning True to generate visualizations
+        """
+        statuses = VISUALIZATION_STATUSES[config.VISUALIZATION_MODE]
+
+        def should_visualize(comparison_results: Dict) -> bool:
+            status = self._evaluate_results(comparison_results)["overall"]
+            if early_exit and status == "reject":
+                return visualize_rejected
+            return status in statuses
+
+        return should_visualize
+
+    def _validate_in_pool(self,
+                          reference: ReferenceImage,
+                          tasks: List[Tuple[str, str]],
+                          metadata: Dict,
+                          options: Dict,
+                          workers: int,
+                          chunksize: Optional[int]) -> List[Dict]:
+        """
+        Validate batch candidates in a process pool sharing the decoded reference
+
+        Args:
+            reference: Reference image from ImageComparison.load_reference()
+            tasks: (generated path, validation directory) pairs
+            metadata: Batch metadata, copied for each validation
+            options: Keyword options passed to _validate_candidate
+            workers: Number of worker processes
+            chunksize: Candidates sent to a worker per task, or None for the default
+
+        Returns:
+            Validation results in the order of tasks
+        """
+        if not chunksize:
+            # A few chunks per worker keeps cores busy when asset sizes vary, without per-asset IPC
+            chunksize = max(1, len(tasks) // (workers * 4))
+
+        # The color image and the alpha channel are laid out back to back in one shared block
+        arrays = {"bgr": reference.bgr}
+        if reference.alpha is not None:
+            arrays["alpha"] = reference.alpha
+
+        layout = {}
+        size = 0
+        for name, array in arrays.items():
+            layout[name] = (array.shape, array.dtype.str, size)
+            size += array.nbytes
+
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        try:
+            for name, (shape, dtype, offset) in layout.items():
+                shared = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+                shared[:] = arrays[name]
+
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(shm.name, layout, reference.path, metadata, options)
+            ) as executor:
+                return list(executor.map(_validate_in_worker, tasks, chunksize=chunksize))
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def _record_validation(self,
+                           comparison_results: Dict,
+                           generated_asset_path: str,
+                           reference_asset_path: str,
+                           validation_name: str,
+                           validation_dir: str,
+                           validation_metadata: Dict,
+                           visualized: bool = True,
+                           skip_rejected_report: bool = False) -> Dict:
+        """
+        Evaluate comparison results, then save them and the validation report
+
+        Args:
+            comparison_results: Dictionary of metric results from comparison
+            generated_asset_path: Path to the generated asset
+            reference_asset_path: Path to the reference asset
+            validation_name: Name of the validation
+            validation_dir: Directory of the validation
+            validation_metadata: Metadata to extend with the validation details
+            visualized: Whether the comparison visualizations were generated
+            skip_rejected_report: Do not generate the report when the asset is rejected
+
+        Returns:
+            Dictionary containing validation results
+        """
+        # Combine results
+        validation_results = {
+            "metadata": self._describe_validation(
+                validation_metadata, validation_name, generated_asset_path, reference_asset_path
+            ),
+            "metrics": comparison_results,
+            "pass_fail": self._evaluate_results(comparison_results),
+            "visualizations": visualized
+        }
+
+        # Save validation results
+        results_path = os.path.join(validation_dir, "validation_results.json")
+        with open(results_path, "w") as f:
+            json.dump(validation_results, f, indent=2)
+
+        # Generate validation report (rejected assets only keep their results file when skipped)
+        report_path = None
+        if not (skip_rejected_report and validation_results["pass_fail"]["overall"] == "reject"):
+            report_path = self.reporter.generate_report(
+                validation_results,
+                generated_asset_path,
+                reference_asset_path,
+                validation_dir
+            )
+
         validation_results["report_path"] = report_path
 
         return validation_results
 
+    def _record_error(self,
+                      error: Exception,
+                      generated_asset_path: str,
+                      reference_asset_path: str,
+                      validation_dir: str,
+                      validation_metadata: Dict) -> Dict:
+        """
+        Save the results of an asset whose validation failed with an error
+
+        Args:
+            error: Error raised while validating the asset
+            generated_asset_path: Path to the generated asset
+            reference_asset_path: Path to the reference asset
+            validation_dir: Directory of the validation
+            validation_metadata: Metadata to extend with the validation details
+
+        Returns:
+            Dictionary containing validation results with the overall status "error"
+        """
+        validation_results = {
+            "metadata": self._describe_validation(
+                validation_metadata, os.path.basename(validation_dir), generated_asset_path, reference_asset_path
+            ),
+            "metrics": {},
+            "pass_fail": {"overall": "error"},
+            "error": f"{type(error).__name__}: {error}",
+            "visualizations": False
+        }
+
+        results_path = os.path.join(validation_dir, "validation_results.json")
+        with open(results_path, "w") as f:
+            json.dump(validation_results, f, indent=2)
+
+        validation_results["report_path"] = None
+
+        return validation_results
+
+    def _describe_validation(self,
+                             validation_metadata: Dict,
+                             validation_name: str,
+                             generated_asset_path: str,
+                             reference_asset_path: str) -> Dict:
+        """
+        Add the validation id, timestamp and asset paths to the validation metadata
+
+        Args:
+            validation_metadata: Metadata to extend
+            validation_name: Name of the validation
+            generated_asset_path: Path to the generated asset
+            reference_asset_path: Path to the reference asset
+
+        Returns:
+            The extended metadata
+        """
+        validation_metadata.update({
+            "validation_id": validation_name,
+            "timestamp": datetime.now().isoformat(),
+            "generated_asset": os.path.basename(generated_asset_path),
+            "reference_asset": os.path.basename(reference_asset_path),
+            # Full paths let visualizations be generated later on demand
+            "generated_asset_path": os.path.abspath(generated_asset_path),
+            "reference_asset_path": os.path.abspath(reference_asset_path)
+        })
+        return validation_metadata
+
+    def select_reference(self,
+                         generated_asset_path: str,
+                         reference_dir: Optional[str] = None) -> Tuple[str, int]:
+        """
+        Pick the reference most similar to a generated asset by perceptual hash
+
+        The reference directory's hash index is persisted and only updated for new or
+        changed files, so the lookup avoids comparing the asset against every reference.
+
+        Args:
+            generated_asset_path: Path to the generated asset
+            reference_dir: Directory of references, defaults to config.REFERENCE_DIR
+
+        Returns:
+            Tuple of the reference path and its Hamming distance to the asset
+        """
+        reference_dir = reference_dir or config.REFERENCE_DIR
+        if reference_dir not in self._reference_indexes:
+            self._reference_indexes[reference_dir] = load_directory_index(reference_dir)
+
+        matches = self._reference_indexes[reference_dir].nearest(generated_asset_path)
+        if not matches:
+            raise FileNotFoundError(f"No reference assets found in: {reference_dir}")
+
+        distance, reference_path = matches[0]
+        return reference_path, distance
+
     def validate_with_layer_ai(self,
                              generated_asset_path: str,
                              reference_asset_path: str,
@@ -207,23 +605,173 @@ class AssetValidator:
         return evaluation
 
 
+def _init_worker(shm_name: str,
+                 layout: Dict[str, Tuple[Tuple[int, ...], str, int]],
+                 reference_path: str,
+                 metadata: Dict,
+                 options: Dict) -> None:
+    """
+    Set up a parallel validation worker: attach to the shared reference image once per process
+
+    Args:
+        shm_name: Name of the shared memory block holding the decoded reference
+        layout: Shape, NumPy dtype string and byte offset of each shared array
+            ("bgr", and "alpha" for references with an alpha channel)
+        reference_path: Path to the reference asset
+        metadata: Batch metadata, copied for each validation
+        options: Keyword options passed to _validate_candidate
+    """
+    # One OpenCV thread per process, otherwise workers oversubscribe the cores
+    cv2.setNumThreads(1)
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    arrays = {
+        name: np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+        for name, (shape, dtype, offset) in layout.items()
+    }
+
+    _worker_state.update({
+        "shm": shm,  # Keeps the shared buffer mapped for the lifetime of the worker
+        "validator": AssetValidator(),
+        "reference": ReferenceImage(path=reference_path, bgr=arrays["bgr"], alpha=arrays.get("alpha")),
+        "metadata": metadata,
+        "options": options
+    })
+
+
+def _validate_in_worker(task: Tuple[str, str]) -> Dict:
+    """
+    Validate one batch candidate inside a worker process
+
+    Args:
+        task: (generated path, validation directory) pair
+
+    Returns:
+        Dictionary containing validation results
+    """
+    generated_path, validation_dir = task
+    return _worker_state["validator"]._validate_candidate(
+        _worker_state["reference"],
+        generated_path,
+        validation_dir,
+        _worker_state["metadata"],
+        **_worker_state["options"]
+    )
+
+
+def _collect_image_paths(paths: List[str]) -> List[str]:
+    """
+    Expand directories into the image files they contain
+
+    Args:
+        paths: File or directory paths
+
+    Returns:
+        Image file paths, directory contents sorted by name
+    """
+    image_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            image_paths.extend(
+                str(child) for child in sorted(Path(path).iterdir())
+                if child.is_file() and child.suffix.lower() in config.IMAGE_EXTENSIONS
+            )
+        else:
+            image_paths.append(path)
+    return image_paths
+
+
 if __name__ == "__main__":
     print("Asset Validator Tool")
     print("====================")
 
-    if len(sys.argv) < 3:
-        print("Usage: python validation.py <generated_asset_path> <reference_asset_path>")
+    parser = argparse.ArgumentParser(
+        description="Validate generated assets against a reference asset"
+    )
+    parser.add_argument("paths", nargs="*", metavar="generated... reference",
+                        help="Generated asset files or directories of assets, then the reference asset "
+                             "or a directory to pick the closest reference for each asset")
+    parser.add_argument("--workers", type=int, default=config.VALIDATION_WORKERS,
+                        help="Worker processes for batch validation (default: %(default)s)")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="Assets sent to a worker per task (default: about four tasks per worker)")
+    parser.add_argument("--name", default=None,
+                        help="Name of the validation or batch")
+    parser.add_argument("--early-exit", action="store_true",
+                        help="Stop scoring an asset at the first metric that rejects it")
+    parser.add_argument("--visualize-rejected", action="store_true",
+                        help="With --early-exit, still generate visualizations and reports for rejected assets")
+    parser.add_argument("--visualize", nargs="+", metavar="VALIDATION_DIR", default=None,
+                        help="Generate the visualizations of earlier validations and regenerate their reports")
+    args = parser.parse_args()
+
+    if args.visualize:
+        validator = AssetValidator()
+        try:
+            for validation_dir in args.visualize:
+                report_path = validator.render_visualizations(validation_dir)
+                print(f"Visualizations generated! Report saved to: {report_path}")
+        except Exception as e:
+            print(f"Visualization error: {str(e)}")
+            sys.exit(1)
+        sys.exit(0)
+
+    if len(args.paths) < 2:
+        parser.error("expected at least one generated asset and a reference")
+    args.generated, args.reference = args.paths[:-1], args.paths[-1]
+
+    generated_assets = _collect_image_paths(args.generated)
+    if not generated_assets:
+        print("No generated assets found")
         sys.exit(1)
 
-    generated_asset = sys.argv[1]
-    reference_asset = sys.argv[2]
-
     validator = AssetValidator()
 
     try:
-        results = validator.validate_asset(generated_asset, reference_asset)
-        print(f"\nValidation complete! Report saved to: {results['report_path']}")
-        print(f"Overall status: {results['pass_fail']['overall'].upper()}")
+        # With a reference directory, assets are grouped by their closest reference
+        if os.path.isdir(args.reference):
+            reference_groups: Dict[str, List[str]] = {}
+            for generated_asset in generated_assets:
+                reference_asset, distance = validator.select_reference(generated_asset, args.reference)
+                print(f"{os.path.basename(generated_asset)} -> {os.path.basename(reference_asset)} "
+                      f"(hash distance {distance})")
+                reference_groups.setdefault(reference_asset, []).append(generated_asset)
+        else:
+            reference_groups = {args.reference: generated_assets}
+
+        for reference_asset, assets in reference_groups.items():
+            name = args.name
+            if name and len(reference_groups) > 1:
+                name = f"{name}_{Path(reference_asset).stem}"
+
+            if len(generated_assets) == 1 and not os.path.isdir(args.generated[0]):
+                results = validator.validate_asset(
+                    assets[0],
+                    reference_asset,
+                    name,
+                    early_exit=args.early_exit,
+                    visualize_rejected=args.visualize_rejected
+                )
+                if results["report_path"]:
+                    print(f"\nValidation complete! Report saved to: {results['report_path']}")
+                else:
+                    print("\nValidation complete! Report skipped for the rejected asset")
+                print(f"Overall status: {results['pass_fail']['overall'].upper()}")
+            else:
+                batch = validator.validate_batch(
+                    assets,
+                    reference_asset,
+                    batch_name=name,
+                    workers=args.workers,
+                    chunksize=args.chunksize,
+                    early_exit=args.early_exit,
+                    visualize_rejected=args.visualize_rejected
+                )
+                statuses = [result["pass_fail"]["overall"] for result in batch["results"]]
+                print(f"\nValidated {len(statuses)} assets against {os.path.basename(reference_asset)}! "
+                      f"Batch report saved to: {batch['report_path']}")
+                for status in ("excellent", "acceptable", "reject", "error"):
+                    print(f"{status.upper()}: {statuses.count(status)}")
     except Exception as e:
         print(f"Validation error: {str(e)}")
         sys.exit(1)
@@ -31,18 +31,22 @@ class ValidationReporter:
         # Create template directory if it doesn't exist
         os.makedirs(self.template_dir, exist_ok=True)
         
-        # Create default template if not exists
+        # Create or update the default template
         self._create_default_template()
         
         # Initialize Jinja2 environment
         self.env = Environment(loader=FileSystemLoader(self.template_dir))
     
     def _create_default_template(self):
-        """Create default HTML template if it doesn't exist"""
+        """
+        Write the default HTML template, replacing an existing copy that differs from it
+
+        Templates written by older versions lack rows and sections that current results
+        rely on (optional metrics, skipped visualizations), so they are not kept.
+        """
         default_template_path = os.path.join(self.template_dir, "validation_report.html")
-        
-        if not os.path.exists(default_template_path):
-            default_template = """<!DOCTYPE html>
+
+        default_template = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -169,27 +173,34 @@ class ValidationReporter:
             </tr>
         </thead>
         <tbody>
+            {% if validation_results.metrics.ssim is defined %}
             <tr>
                 <td>SSIM (Structural Similarity)</td>
                 <td>{{ "%.3f"|format(validation_results.metrics.ssim) }}</td>
                 <td class="status-{{ validation_results.pass_fail.ssim.status }}">{{ validation_results.pass_fail.ssim.status | upper }}</td>
                 <td>Measures structural similarity between images (0-1, higher is better)</td>
             </tr>
+            {% endif %}
+            {% if validation_results.metrics.color_match is defined %}
             <tr>
                 <td>Color Match</td>
                 <td>{{ "%.3f"|format(validation_results.metrics.color_match) }}</td>
                 <td class="status-{{ validation_results.pass_fail.color_match.status }}">{{ validation_results.pass_fail.color_match.status | upper }}</td>
                 <td>Measures color histogram similarity (0-1, higher is better)</td>
             </tr>
+            {% endif %}
+            {% if validation_results.metrics.edge_accuracy is defined %}
             <tr>
                 <td>Edge Accuracy</td>
                 <td>{{ "%.3f"|format(validation_results.metrics.edge_accuracy) }}</td>
                 <td class="status-{{ validation_results.pass_fail.edge_accuracy.status }}">{{ validation_results.pass_fail.edge_accuracy.status | upper }}</td>
                 <td>Measures similarity of edge features (0-1, higher is better)</td>
             </tr>
+            {% endif %}
         </tbody>
     </table>
 
+    {% if validation_results.visualizations %}
     <h2>Side by Side Comparison</h2>
     <div class="full-width-image">
         <h3>Generated vs. Reference</h3>
@@ -213,16 +224,28 @@ class ValidationReporter:
         <h3>Pixel Differences</h3>
         <img src="difference_visualization.png" alt="Difference Visualization">
     </div>
+    {% else %}
+    <h2>Visualizations</h2>
+    <p>Visualizations were not generated for this asset. Run
+    <code>python src/validation.py --visualize {{ output_dir }}</code> to add them to this report.</p>
+    {% endif %}
 
     <footer>
         <p>Game Asset Validation System | Generated on {{ validation_results.metadata.timestamp }}</p>
     </footer>
 </body>
 </html>"""
-            
-            os.makedirs(self.template_dir, exist_ok=True)
-            with open(default_template_path, "w") as f:
-                f.write(default_template)
+
+        if os.path.exists(default_template_path):
+            with open(default_template_path, "r") as f:
+                if f.read() == default_template:
+                    return
+
+        # Parallel validation workers may update the template at the same time
+        temp_path = f"{default_template_path}.tmp{os.getpid()}"
+        with open(temp_path, "w") as f:
+            f.write(default_template)
+        os.replace(temp_path, default_template_path)
     
     def generate_report(self,
                       validation_results: Dict,
@@ -248,7 +271,7 @@ class ValidationReporter:
         template = self.env.get_template("validation_report.html")
         
         # Render HTML report
-        html_content = template.render(validation_results=validation_results)
+        html_content = template.render(validation_results=validation_results, output_dir=output_dir)
         
         # Save report
         report_path = os.path.join(output_dir, "validation_report.html")
@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from color_histograms import compare_histograms, compute_histograms, score_histograms, stack_histograms
+
+
+class TestColorHistograms(unittest.TestCase):
+    """
+    Tests for the color histogram engine
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.images = [rng.integers(0, 256, size=(48, 64, 3), dtype=np.uint8) for _ in range(4)]
+        # Dark, low-contrast image and a flat image with a constant (zero-variance) histogram
+        self.images.append((self.images[0] // 4).astype(np.uint8))
+        self.images.append(np.full((48, 64, 3), 90, dtype=np.uint8))
+
+    def test_score_histograms_matches_compare_histograms(self):
+        """
+        Scoring against a stacked reference matrix gives the pairwise scores
+        """
+        for color_space in ("bgr", "hsv", "lab"):
+            histograms = [compute_histograms(image, color_space, bins=32) for image in self.images]
+            reference_matrix = stack_histograms(histograms)
+
+            for candidate in histograms:
+                expected = [compare_histograms(candidate, reference) for reference in histograms]
+                np.testing.assert_allclose(score_histograms(candidate, reference_matrix), expected, atol=1e-12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from feature_cache import FeatureCache
+
+
+class TestFeatureCache(unittest.TestCase):
+    """
+    Tests for the on-disk feature cache
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = FeatureCache(os.path.join(self.temp_dir, "cache"))
+        self.image_path = os.path.join(self.temp_dir, "reference.png")
+        with open(self.image_path, "wb") as f:
+            f.write(b"image bytes")
+        self.arrays = {"gray": np.arange(12, dtype=np.uint8).reshape(3, 4), "histograms": np.ones((3, 8), np.float32)}
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_store_and_load(self):
+        """
+        Stored arrays are read back memory-mapped and unchanged
+        """
+        self.assertIsNone(self.cache.load(self.image_path, "variant"))
+
+        self.cache.store(self.image_path, "variant", self.arrays)
+        loaded = self.cache.load(self.image_path, "variant")
+
+        self.assertEqual(sorted(loaded), ["gray", "histograms"])
+        for name, array in self.arrays.items():
+            self.assertIsInstance(loaded[name], np.memmap)
+            np.testing.assert_array_equal(loaded[name], array)
+        self.assertIsNone(self.cache.load(self.image_path, "other_variant"))
+
+    def test_entry_is_invalidated_when_size_changes(self):
+        """
+        An entry is discarded when the source file's size changes
+        """
+        self.cache.store(self.image_path, "variant", self.arrays)
+        stat = os.stat(self.image_path)
+
+        with open(self.image_path, "ab") as f:
+            f.write(b" more")
+        os.utime(self.image_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        self.assertIsNone(self.cache.load(self.image_path, "variant"))
+        self.assertFalse(os.path.exists(self.cache._entry_dir(self.image_path)))
+
+    def test_entry_is_invalidated_when_mtime_changes(self):
+        """
+        An entry is discarded when the source file's mtime changes, even with the same size
+        """
+        self.cache.store(self.image_path, "variant", self.arrays)
+        stat = os.stat(self.image_path)
+
+        os.utime(self.image_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        self.assertIsNone(self.cache.load(self.image_path, "variant"))
+        self.assertFalse(os.path.exists(self.cache._entry_dir(self.image_path)))
+
+    def test_unreadable_metadata_keeps_entry(self):
+        """
+        An entry whose metadata cannot be read is a miss but is not deleted
+        """
+        self.cache.store(self.image_path, "variant", self.arrays)
+        entry_dir = self.cache._entry_dir(self.image_path)
+        with open(os.path.join(entry_dir, "meta.json"), "w") as f:
+            f.write('{"mtime_ns": ')
+
+        self.assertIsNone(self.cache.load(self.image_path, "variant"))
+        self.assertTrue(os.path.isdir(entry_dir))
+        self.assertEqual(self.cache.prune(), 0)
+
+        # Storing again rewrites the metadata
+        self.cache.store(self.image_path, "variant", self.arrays)
+        self.assertIsNotNone(self.cache.load(self.image_path, "variant"))
+        self.assertEqual([name for name in os.listdir(entry_dir) if ".tmp" in name], [])
+
+    def test_prune_removes_entries_of_deleted_images(self):
+        """
+        prune removes entries whose source image was deleted and keeps the others
+        """
+        other_path = os.path.join(self.temp_dir, "other.png")
+        with open(other_path, "wb") as f:
+            f.write(b"other bytes")
+        self.cache.store(self.image_path, "variant", self.arrays)
+        self.cache.store(other_path, "variant", self.arrays)
+
+        os.remove(other_path)
+
+        self.assertEqual(self.cache.prune(), 1)
+        self.assertIsNotNone(self.cache.load(self.image_path, "variant"))
+        self.assertFalse(os.path.exists(self.cache._entry_dir(other_path)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import cv2
+import numpy as np
+from skimage.metrics import structural_similarity
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import config
+from image_comparison import ImageComparison, METRIC_EVALUATION_ORDER
+
+
+def _baseline_metrics(generated: np.ndarray, reference: np.ndarray) -> dict:
+    """
+    Metrics as computed before preprocessing was shared: skimage SSIM, a calcHist loop and Canny IoU
+    """
+    if generated.shape != reference.shape:
+        reference = cv2.resize(reference, (generated.shape[1], generated.shape[0]), interpolation=cv2.INTER_AREA)
+
+    gray1 = cv2.cvtColor(generated, cv2.COLOR_BGR2GRAY)
+    gray2 = cv2.cvtColor(reference, cv2.COLOR_BGR2GRAY)
+
+    color_match = 0.0
+    for channel in range(3):
+        hist1 = cv2.calcHist([generated], [channel], None, [256], [0, 256])
+        hist2 = cv2.calcHist([reference], [channel], None, [256], [0, 256])
+        cv2.normalize(hist1, hist1, 0, 1, cv2.NORM_MINMAX)
+        cv2.normalize(hist2, hist2, 0, 1, cv2.NORM_MINMAX)
+        color_match += cv2.compareHist(hist1, hist2, cv2.HISTCMP_CORREL)
+
+    edges1 = cv2.Canny(gray1, 100, 200)
+    edges2 = cv2.Canny(gray2, 100, 200)
+    union = np.count_nonzero(np.logical_or(edges1, edges2))
+    edge_accuracy = np.count_nonzero(np.logical_and(edges1, edges2)) / union if union else 1.0
+
+    return {
+        "ssim": structural_similarity(gray1, gray2),
+        "color_match": color_match / 3.0,
+        "edge_accuracy": edge_accuracy
+    }
+
+
+class TestImageComparison(unittest.TestCase):
+    """
+    Tests for the image comparison metrics
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(0)
+
+        # Smooth gradient with shapes, a noisy copy and a differently sized reference
+        gradient = np.tile(np.linspace(0, 255, 120, dtype=np.float64), (90, 1))
+        base = np.dstack([gradient, gradient[::-1, ::-1], np.full_like(gradient, 128)]).astype(np.uint8)
+        cv2.rectangle(base, (20, 15), (70, 60), (30, 200, 90), -1)
+        cv2.circle(base, (90, 45), 20, (250, 40, 40), -1)
+        noisy = np.clip(base + rng.normal(0, 12, base.shape), 0, 255).astype(np.uint8)
+
+        self.generated_path = self._write("generated.png", noisy)
+        self.reference_path = self._write("reference.png", cv2.resize(base, (150, 110)))
+
+        self.comparison = ImageComparison(
+            ssim_fast_path={"enabled": False},
+            histogram_settings={"color_space": "bgr", "bins": 256},
+            alpha_settings={"enabled": False}
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, file_name: str, image: np.ndarray) -> str:
+        path = os.path.join(self.temp_dir, file_name)
+        cv2.imwrite(path, image)
+        return path
+
+    def test_metrics_match_baseline(self):
+        """
+        Shared preprocessing and the OpenCV SSIM give the same metrics as the baseline implementation
+        """
+        metrics = self.comparison.compare_images(self.generated_path, self.reference_path)
+        expected = _baseline_metrics(cv2.imread(self.generated_path), cv2.imread(self.reference_path))
+
+        for name, value in expected.items():
+            self.assertAlmostEqual(metrics[name], value, places=6, msg=name)
+
+    def test_early_exit_stops_at_first_rejecting_metric(self):
+        """
+        With early exit, metrics are computed cheapest first and scoring stops at the first reject
+        """
+        self.assertEqual(METRIC_EVALUATION_ORDER, ("color_match", "edge_accuracy", "ssim"))
+        reject = {name: thresholds["reject"] for name, thresholds in config.VALIDATION_THRESHOLDS.items()}
+
+        with mock.patch.object(self.comparison, "_compare_color_histograms", return_value=1.0), \
+                mock.patch.object(self.comparison, "_compare_edges", return_value=reject["edge_accuracy"] - 0.01), \
+                mock.patch.object(self.comparison, "_calculate_ssim") as calculate_ssim:
+            metrics = self.comparison.compare_images(self.generated_path, self.reference_path, early_exit=True)
+
+        calculate_ssim.assert_not_called()
+        self.assertEqual(sorted(metrics), ["color_match", "edge_accuracy"])
+
+        with mock.patch.object(self.comparison, "_compare_color_histograms", return_value=reject["color_match"] - 0.01), \
+                mock.patch.object(self.comparison, "_compare_edges") as compare_edges:
+            metrics = self.comparison.compare_images(self.generated_path, self.reference_path, early_exit=True)
+
+        compare_edges.assert_not_called()
+        self.assertEqual(list(metrics), ["color_match"])
+
+        # Without early exit every metric is computed, even after a reject
+        with mock.patch.object(self.comparison, "_compare_color_histograms", return_value=0.0):
+            metrics = self.comparison.compare_images(self.generated_path, self.reference_path)
+        self.assertEqual(sorted(metrics), ["color_match", "edge_accuracy", "ssim"])
+
+    def test_transparent_pair_is_cropped_to_foreground(self):
+        """
+        Transparent images are cropped to their combined foreground and scored over it only
+        """
+        canvas = np.zeros((200, 240, 4), dtype=np.uint8)
+        canvas[..., :3] = np.random.default_rng(1).integers(0, 256, size=(200, 240, 3), dtype=np.uint8)
+        cv2.circle(canvas, (60, 80), 25, (40, 160, 220, 255), -1)
+        reference_path = self._write("sprite_reference.png", canvas)
+
+        # Same sprite moved a few pixels, other colors under the transparent background
+        moved = np.zeros_like(canvas)
+        moved[..., :3] = np.random.default_rng(2).integers(0, 256, size=(200, 240, 3), dtype=np.uint8)
+        cv2.circle(moved, (64, 80), 25, (40, 160, 220, 255), -1)
+        generated_path = self._write("sprite_generated.png", moved)
+
+        comparison = ImageComparison(ssim_fast_path={"enabled": False}, alpha_settings=dict(config.ALPHA_COMPARISON))
+        generated, reference, foreground = comparison._prepare_pair(
+            generated_path, comparison.load_reference(reference_path)
+        )
+
+        # Combined foreground spans x 35-89 and y 55-105, plus the padding on each side
+        padding = config.ALPHA_COMPARISON["crop_padding"]
+        expected_shape = (51 + 2 * padding, 55 + 2 * padding)
+        self.assertEqual(generated.gray.shape, expected_shape)
+        self.assertEqual(reference.gray.shape, expected_shape)
+        self.assertEqual(foreground.shape, expected_shape)
+
+        metrics = comparison.compare_images(generated_path, reference_path)
+        self.assertAlmostEqual(metrics["color_match"], 1.0, places=6)
+        self.assertGreater(metrics["ssim"], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import random
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from perceptual_hash import BKTree, hamming_distance
+
+
+class TestBKTree(unittest.TestCase):
+    """
+    Tests for the BK-tree over Hamming distance
+    """
+
+    def setUp(self):
+        rng = random.Random(0)
+
+        # Clusters of near-identical hashes, some exact duplicates, and unrelated hashes
+        self.entries = []
+        for cluster in range(20):
+            center = rng.getrandbits(64)
+            for member in range(8):
+                flipped = center
+                for _ in range(rng.randint(0, 5)):
+                    flipped ^= 1 << rng.randrange(64)
+                self.entries.append((flipped, f"cluster{cluster:02d}_{member}"))
+        self.entries.extend((rng.getrandbits(64), f"random_{index:03d}") for index in range(100))
+        self.entries.append((self.entries[0][0], "duplicate_of_first"))
+
+        self.tree = BKTree()
+        for hash_value, item in self.entries:
+            self.tree.add(hash_value, item)
+
+        self.queries = [hash_value for hash_value, _ in self.entries[::15]]
+        self.queries.extend(rng.getrandbits(64) for _ in range(10))
+
+    def _brute_force(self, hash_value: int):
+        return sorted((hamming_distance(hash_value, other), item) for other, item in self.entries)
+
+    def test_search_matches_brute_force(self):
+        """
+        search returns exactly the items within the distance, as a linear Hamming scan does
+        """
+        self.assertEqual(self.tree.size, len(self.entries))
+        for hash_value in self.queries:
+            for max_distance in (0, 3, 6, 12, 32):
+                expected = [match for match in self._brute_force(hash_value) if match[0] <= max_distance]
+                self.assertEqual(self.tree.search(hash_value, max_distance), expected)
+
+    def test_nearest_matches_brute_force(self):
+        """
+        nearest returns the k closest items, as a linear Hamming scan does
+        """
+        for hash_value in self.queries:
+            for k in (1, 3, 10):
+                self.assertEqual(self.tree.nearest(hash_value, k), self._brute_force(hash_value)[:k])
+
+        self.assertEqual(BKTree().nearest(self.queries[0]), [])
+        self.assertEqual(len(self.tree.nearest(self.queries[0], len(self.entries) + 5)), len(self.entries))
+
+
+if __name__ == "__main__":
+    unittest.main()
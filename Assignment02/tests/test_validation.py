@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import config
+from validation import AssetValidator
+
+
+def _write_sprite(path: str, seed: int) -> None:
+    """
+    Write a BGRA sprite: an opaque disc on a transparent background of random colors
+    """
+    rng = np.random.default_rng(seed)
+    sprite = rng.integers(0, 256, size=(96, 96, 4), dtype=np.uint8)
+    sprite[..., 3] = 0
+    cv2.circle(sprite, (48, 48), 30, (40, 160, 220, 255), -1)
+    cv2.circle(sprite, (40, 40), 8, (250, 250, 250, 255), -1)
+    cv2.imwrite(path, sprite)
+
+
+class TestValidateBatch(unittest.TestCase):
+    """
+    Tests for batch validation
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        patches = [
+            mock.patch.object(config, "VALIDATION_DIR", os.path.join(self.temp_dir, "validation")),
+            mock.patch.object(config, "FEATURE_CACHE_ENABLED", False),
+            mock.patch.object(config, "VISUALIZATION_MODE", "on_demand")
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        # Same foreground, different colors under the transparent pixels
+        self.reference_path = os.path.join(self.temp_dir, "reference.png")
+        _write_sprite(self.reference_path, seed=1)
+        self.generated_paths = []
+        for index in range(2):
+            path = os.path.join(self.temp_dir, f"generated_{index}.png")
+            _write_sprite(path, seed=index + 2)
+            self.generated_paths.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_workers_share_reference_alpha(self):
+        """
+        Parallel workers compare transparent assets with the reference alpha channel
+        """
+        validator = AssetValidator()
+        serial = validator.validate_batch(self.generated_paths, self.reference_path, "serial", workers=1)
+        parallel = validator.validate_batch(self.generated_paths, self.reference_path, "parallel", workers=2)
+
+        for serial_result, parallel_result in zip(serial["results"], parallel["results"]):
+            self.assertEqual(serial_result["metrics"], parallel_result["metrics"])
+            self.assertEqual(serial_result["pass_fail"]["overall"], "excellent")
+            self.assertEqual(parallel_result["pass_fail"], serial_result["pass_fail"])
+
+    def test_corrupt_asset_does_not_abort_batch(self):
+        """
+        An asset that cannot be decoded is recorded as an error and the rest of the batch still reports
+        """
+        corrupt_path = os.path.join(self.temp_dir, "corrupt.png")
+        with open(corrupt_path, "wb") as f:
+            f.write(b"not a png")
+        paths = [self.generated_paths[0], corrupt_path, self.generated_paths[1]]
+
+        validator = AssetValidator()
+        for workers in (1, 2):
+            batch = validator.validate_batch(paths, self.reference_path, f"corrupt_{workers}", workers=workers)
+
+            statuses = [result["pass_fail"]["overall"] for result in batch["results"]]
+            self.assertEqual(statuses, ["excellent", "error", "excellent"])
+            self.assertIn("corrupt.png", batch["results"][1]["error"])
+            self.assertIsNone(batch["results"][1]["report_path"])
+
+
+if __name__ == "__main__":
+    unittest.main()
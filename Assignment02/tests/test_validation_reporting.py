@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from validation_reporting import ValidationReporter
+
+
+class TestValidationReporter(unittest.TestCase):
+    """
+    Tests for the validation report template
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.template_path = os.path.join(self.temp_dir, "validation_report.html")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_outdated_template_is_replaced(self):
+        """
+        A template written by an older version is replaced by the built-in one
+        """
+        with open(self.template_path, "w") as f:
+            f.write('{{ "%.3f"|format(validation_results.metrics.ssim) }}')
+
+        reporter = ValidationReporter(self.temp_dir)
+        output_dir = os.path.join(self.temp_dir, "asset")
+        os.makedirs(output_dir)
+
+        # Early-exit result: rejected on color before SSIM was computed, no visualizations
+        report_path = reporter.generate_report({
+            "metadata": {"validation_id": "asset", "generated_asset": "gen.png",
+                         "reference_asset": "ref.png", "timestamp": "2024-01-01T00:00:00"},
+            "metrics": {"color_match": 0.2},
+            "pass_fail": {"overall": "reject", "color_match": {"status": "reject"}},
+            "visualizations": False
+        }, "gen.png", "ref.png", output_dir)
+
+        with open(report_path) as f:
+            html = f.read()
+        self.assertNotIn("SSIM", html)
+        self.assertNotIn("<img", html)
+        self.assertIn("--visualize", html)
+
+    def test_current_template_is_not_rewritten(self):
+        """
+        An up-to-date template is left untouched
+        """
+        ValidationReporter(self.temp_dir)
+        os.utime(self.template_path, ns=(0, 0))
+
+        ValidationReporter(self.temp_dir)
+
+        self.assertEqual(os.stat(self.template_path).st_mtime_ns, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()